@@ -0,0 +1,36 @@
+import argparse
+import sys
+from typing import List
+
+from .aot import compile_wiring
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m antidote')
+    commands = parser.add_subparsers(dest='command')
+    compile_parser = commands.add_parser(
+        'compile',
+        help="Compile the wiring of an application ahead of time, "
+             "see antidote.aot.")
+    compile_parser.add_argument('module',
+                                help="Module wiring the application.")
+    compile_parser.add_argument('-o', '--output',
+                                help="File to which the compiled module is "
+                                     "written. Defaults to the standard output.")
+    args = parser.parse_args(argv)
+
+    if args.command != 'compile':
+        parser.print_help()
+        return 2
+
+    source = compile_wiring(args.module)
+    if args.output is None:
+        sys.stdout.write(source)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(source)
+    return 0
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,18 @@
+# cython: language_level=3
+# cython: boundscheck=False, wraparound=False
+# @formatter:off
+from antidote._internal.stack cimport DependencyStack
+# @formatter:on
+
+cdef class InstantiationLock:
+    cdef:
+        object _lock
+        dict _instantiations
+        dict _waiting
+        object _local
+        public object metrics
+
+    cdef DependencyStack stack(self)
+    cdef acquire(self, object dependency)
+    cdef release(self, object dependency)
+    cdef check_deadlock(self, DependencyStack stack, object dependency, object owner)
@@ -0,0 +1,141 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Hashable
+
+from .stack import DependencyStack
+from .utils import SlotsReprMixin
+from ..exceptions import DependencyCycleError
+
+
+class InstantiationLock:
+    """
+    Single-flight lock per dependency. Threads instantiating the same
+    dependency wait on each other, while independent dependencies are
+    instantiated in parallel.
+
+    Cycles within a thread are detected with a DependencyStack per thread.
+    Before waiting on a dependency held by another thread, the chain of
+    waiting threads is followed to raise a DependencyCycleError instead of
+    dead-locking when it leads back to the current thread.
+
+    When metrics is set, the time spent waiting for and holding the lock of
+    each dependency is reported to it. See ContentionRecorder.
+
+    Used in the DependencyContainer.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._instantiations = dict()  # type: Dict[Hashable, Instantiation]
+        self._waiting = dict()  # type: Dict[DependencyStack, Hashable]
+        self._local = threading.local()
+        self.metrics = None  # type: Any
+
+    @property
+    def stack(self) -> DependencyStack:
+        """ Returns the DependencyStack of the current thread. """
+        try:
+            return self._local.stack
+        except AttributeError:
+            stack = self._local.stack = DependencyStack()
+            return stack
+
+    @contextmanager
+    def instantiating(self, dependency):
+        """
+        Context Manager which has to be used when instantiating the
+        dependency. It is only entered once no other thread is instantiating
+        the same dependency.
+
+        When a cycle is detected, even across threads, a DependencyCycleError
+        is raised.
+        """
+        with self.stack.instantiating(dependency):
+            self._acquire(dependency)
+            try:
+                yield
+            finally:
+                self._release(dependency)
+
+    def _acquire(self, dependency):
+        stack = self.stack
+        metrics = self.metrics
+        with self._lock:
+            instantiation = self._instantiations.get(dependency)
+            if instantiation is None:
+                instantiation = self._instantiations[dependency] = Instantiation(stack)
+                if metrics is not None:
+                    instantiation.acquired = time.perf_counter()
+                return
+
+            self._check_deadlock(dependency, instantiation.owner)
+            instantiation.waiters += 1
+            self._waiting[stack] = dependency
+
+        if metrics is None:
+            instantiation.lock.acquire()
+            instantiation.acquired = 0.
+        else:
+            start = time.perf_counter()
+            instantiation.lock.acquire()
+            instantiation.acquired = time.perf_counter()
+            metrics.record_wait(dependency,
+                                stack._stack[-2] if len(stack._stack) > 1 else None,
+                                instantiation.acquired - start)
+
+        with self._lock:
+            del self._waiting[stack]
+            instantiation.waiters -= 1
+            instantiation.owner = stack
+
+    def _release(self, dependency):
+        metrics = self.metrics
+        with self._lock:
+            instantiation = self._instantiations[dependency]
+            acquired = instantiation.acquired
+            waiters = instantiation.waiters
+            instantiation.owner = None
+            if instantiation.waiters == 0:
+                del self._instantiations[dependency]
+            instantiation.lock.release()
+
+        # Not measured when metrics were enabled while holding the lock.
+        if metrics is not None and acquired:
+            metrics.record_hold(dependency, time.perf_counter() - acquired, waiters)
+
+    def _check_deadlock(self, dependency, owner):
+        """
+        Follows the threads waiting on each other, starting with the owner of
+        the dependency. If the current thread is reached, waiting would never
+        end.
+        """
+        stack = self.stack
+        path = []
+        while owner is not None:
+            if owner is stack:
+                raise DependencyCycleError(stack._stack + path)
+
+            waiting = self._waiting.get(owner)
+            if waiting is None:
+                return
+
+            path.extend(owner._stack[owner._stack.index(dependency) + 1:])
+            dependency = waiting
+            owner = self._instantiations[dependency].owner
+
+
+class Instantiation(SlotsReprMixin):
+    """
+    Internal API
+
+    Lock held by the thread instantiating a dependency.
+    """
+    __slots__ = ('lock', 'owner', 'waiters', 'acquired')
+
+    def __init__(self, owner: DependencyStack):
+        self.lock = threading.Lock()
+        self.lock.acquire()
+        self.owner = owner
+        self.waiters = 0
+        self.acquired = 0.  # only measured with metrics
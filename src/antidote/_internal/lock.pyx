@@ -0,0 +1,184 @@
+# cython: language_level=3
+# cython: boundscheck=False, wraparound=False, annotation_typing=False
+import threading
+import time
+from contextlib import contextmanager
+from typing import Hashable
+
+# @formatter:off
+cimport cython
+from cpython.dict cimport PyDict_DelItem, PyDict_GetItem, PyDict_SetItem
+from cpython.ref cimport PyObject
+from fastrlock.rlock cimport create_fastrlock, lock_fastrlock, unlock_fastrlock
+
+from antidote._internal.stack cimport DependencyStack
+from ..exceptions import DependencyCycleError
+# @formatter:on
+
+# Final class as its behavior can only be changed through a Cython class. The
+# DependencyContainer calls directly acquire() and release()
+@cython.final
+cdef class InstantiationLock:
+    """
+    Single-flight lock per dependency. Threads instantiating the same
+    dependency wait on each other, while independent dependencies are
+    instantiated in parallel.
+
+    Cycles within a thread are detected with a DependencyStack per thread.
+    Before waiting on a dependency held by another thread, the chain of
+    waiting threads is followed to raise a DependencyCycleError instead of
+    dead-locking when it leads back to the current thread.
+
+    When metrics is set, the time spent waiting for and holding the lock of
+    each dependency is reported to it. See ContentionRecorder.
+    """
+    def __init__(self):
+        self._lock = create_fastrlock()
+        self._instantiations = dict()  # type: Dict[Hashable, Instantiation]
+        self._waiting = dict()  # type: Dict[DependencyStack, Hashable]
+        self._local = threading.local()
+        self.metrics = None
+
+    @contextmanager
+    def instantiating(self, dependency: Hashable):
+        self.acquire(dependency)
+        try:
+            yield
+        finally:
+            self.release(dependency)
+
+    cdef DependencyStack stack(self):
+        """
+        Returns the DependencyStack of the current thread.
+        """
+        cdef:
+            DependencyStack stack
+
+        try:
+            return self._local.stack
+        except AttributeError:
+            stack = DependencyStack()
+            self._local.stack = stack
+            return stack
+
+    cdef acquire(self, object dependency):
+        cdef:
+            DependencyStack stack = self.stack()
+            Instantiation instantiation
+            PyObject*ptr
+            object metrics = self.metrics
+            double start
+
+        if 1 != stack.push(dependency):
+            raise DependencyCycleError(stack._stack.copy() + [dependency])
+
+        lock_fastrlock(self._lock, -1, True)
+        try:
+            ptr = PyDict_GetItem(self._instantiations, dependency)
+            if ptr == NULL:
+                instantiation = Instantiation(stack)
+                if metrics is not None:
+                    instantiation.acquired = time.perf_counter()
+                PyDict_SetItem(self._instantiations, dependency, instantiation)
+                return
+
+            instantiation = <Instantiation> ptr
+            self.check_deadlock(stack, dependency, instantiation.owner)
+            instantiation.waiters += 1
+            PyDict_SetItem(self._waiting, stack, dependency)
+        except:
+            stack.pop()
+            raise
+        finally:
+            unlock_fastrlock(self._lock)
+
+        if metrics is None:
+            lock_fastrlock(instantiation.lock, -1, True)
+            instantiation.acquired = 0
+        else:
+            start = time.perf_counter()
+            lock_fastrlock(instantiation.lock, -1, True)
+            instantiation.acquired = time.perf_counter()
+            metrics.record_wait(dependency,
+                                stack._stack[len(stack._stack) - 2]
+                                if len(stack._stack) > 1 else None,
+                                instantiation.acquired - start)
+
+        lock_fastrlock(self._lock, -1, True)
+        PyDict_DelItem(self._waiting, stack)
+        instantiation.waiters -= 1
+        instantiation.owner = stack
+        unlock_fastrlock(self._lock)
+
+    cdef release(self, object dependency):
+        cdef:
+            Instantiation instantiation
+            object metrics = self.metrics
+            double acquired
+            int waiters
+
+        self.stack().pop()
+
+        lock_fastrlock(self._lock, -1, True)
+        instantiation = <Instantiation> PyDict_GetItem(self._instantiations,
+                                                       dependency)
+        acquired = instantiation.acquired
+        waiters = instantiation.waiters
+        instantiation.owner = None
+        if instantiation.waiters == 0:
+            PyDict_DelItem(self._instantiations, dependency)
+        unlock_fastrlock(instantiation.lock)
+        unlock_fastrlock(self._lock)
+
+        # Not measured when metrics were enabled while holding the lock.
+        if metrics is not None and acquired:
+            metrics.record_hold(dependency, time.perf_counter() - acquired, waiters)
+
+    cdef check_deadlock(self, DependencyStack stack, object dependency, object owner):
+        """
+        Follows the threads waiting on each other, starting with the owner of
+        the dependency. If the current thread is reached, waiting would never
+        end.
+        """
+        cdef:
+            list path = []
+            PyObject*ptr
+
+        while owner is not None:
+            if owner is stack:
+                raise DependencyCycleError(stack._stack.copy() + path)
+
+            ptr = PyDict_GetItem(self._waiting, owner)
+            if ptr == NULL:
+                return
+
+            path.extend((<DependencyStack> owner)._stack[
+                        (<DependencyStack> owner)._stack.index(dependency) + 1:])
+            dependency = <object> ptr
+            owner = (<Instantiation> PyDict_GetItem(self._instantiations,
+                                                    dependency)).owner
+
+@cython.freelist(32)
+cdef class Instantiation:
+    """
+    Internal API
+
+    Lock held by the thread instantiating a dependency.
+    """
+    cdef:
+        object lock
+        object owner
+        int waiters
+        double acquired
+
+    def __init__(self, DependencyStack owner):
+        self.lock = create_fastrlock()
+        lock_fastrlock(self.lock, -1, True)
+        self.owner = owner
+        self.waiters = 0
+        self.acquired = 0  # only measured with metrics
+
+    def __repr__(self):
+        return "{}(owner={!r}, waiters={!r})".format(type(self).__name__,
+                                                     self.owner,
+                                                     self.waiters)
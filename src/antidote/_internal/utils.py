@@ -1,3 +1,5 @@
+import asyncio
+import inspect
 from itertools import chain
 
 
@@ -18,3 +20,78 @@ class SlotsReprMixin:
                 for name in slots
             ))
         )
+
+
+def is_coroutine_factory(factory) -> bool:
+    """
+    Whether the factory returns a coroutine when called. Wrapped functions,
+    such as injected ones, and instances with an asynchronous __call__() are
+    supported.
+    """
+    if inspect.isclass(factory):
+        return False
+
+    factory = inspect.unwrap(factory)
+    if not inspect.isroutine(factory):
+        factory = inspect.unwrap(type(factory).__call__)
+
+    return asyncio.iscoroutinefunction(factory)
+
+
+def dependency_label(dependency) -> str:
+    """
+    Readable name of a dependency used in exports, the full name of classes
+    and the representation of anything else.
+    """
+    if isinstance(dependency, type):
+        return "{}.{}".format(dependency.__module__, dependency.__qualname__)
+    return repr(dependency)
+
+
+# Markers distinguishing converted values from tuples, which cannot contain them.
+_LIST = object()
+_DICT = object()
+
+
+class _Unhashable:
+    """
+    Wraps any other unhashable value, compared and hashed by identity as its
+    content cannot be relied upon. Keeping a reference to the value ensures
+    its id is not reused meanwhile.
+    """
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __hash__(self):
+        return id(self.value)
+
+    def __eq__(self, other):
+        return isinstance(other, _Unhashable) and self.value is other.value
+
+
+def frozen_key(value):
+    """
+    Hashable equivalent of a value, equal to the one of another value only if
+    both values are equal. Lists, tuples, dicts and sets are converted
+    recursively, hashing their content instead of failing. Any other
+    unhashable value is only equal to itself.
+    """
+    try:
+        hash(value)
+    except TypeError:
+        pass
+    else:
+        return value
+
+    if isinstance(value, list):
+        return (_LIST,) + tuple(frozen_key(v) for v in value)
+    if isinstance(value, tuple):
+        return tuple(frozen_key(v) for v in value)
+    if isinstance(value, dict):
+        return _DICT, frozenset((k, frozen_key(v)) for k, v in value.items())
+    if isinstance(value, (set, frozenset)):
+        # Elements of a set are always hashable.
+        return frozenset(value)
+    return _Unhashable(value)
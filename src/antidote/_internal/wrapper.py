@@ -1,8 +1,10 @@
+import asyncio
 import functools
-from typing import Callable, Sequence
+import threading
+from typing import Callable, Container, Dict, List, Optional, Sequence, Tuple
 
 from .._internal.utils import SlotsReprMixin
-from ..core import DependencyContainer
+from ..core import DependencyContainer, DependencyInstance
 from ..exceptions import DependencyNotFoundError
 
 compiled = False
@@ -23,12 +25,52 @@ class Injection(SlotsReprMixin):
 
 class InjectionBlueprint(SlotsReprMixin):
     """
-    Stores all the injections for a function.
+    Stores all the injections for a function, and the injectors specialized
+    for each offset of the first argument to inject, generated on first use.
+
+    When all injected arguments are singletons, they are cached as
+    (container generation, offset, kwargs). It is shared by the bound
+    wrappers, created on each attribute access.
+
+    Injections may also be built lazily on first use, once, by the given
+    function.
     """
-    __slots__ = ('injections',)
+    __slots__ = ('_injections', '_build', '_lock', 'injectors', 'cache')
+
+    def __init__(self,
+                 injections: Sequence[Injection] = None,
+                 build: Callable[[], Sequence[Injection]] = None):
+        self._injections = injections  # type: Optional[Sequence[Injection]]
+        self._build = build  # type: Optional[Callable[[], Sequence[Injection]]]
+        self._lock = None  # type: Optional[threading.Lock]
+        if injections is None:
+            self._lock = threading.Lock()
+        self.injectors = dict()  # type: Dict[int, Callable[..., dict]]
+        self.cache = (-1, -1, None)  # type: Tuple[int, int, Optional[dict]]
+
+    @property
+    def injections(self) -> Sequence[Injection]:
+        injections = self._injections
+        if injections is None:
+            assert self._lock is not None
+            with self._lock:
+                injections = self._injections
+                if injections is None:
+                    assert self._build is not None
+                    injections = self._injections = self._build()
+                    self._build = None
+        return injections
 
-    def __init__(self, injections: Sequence[Injection]):
-        self.injections = injections
+    def injector(self, offset: int) -> Callable[..., dict]:
+        """
+        Returns the injector of the arguments starting at offset, with the
+        signature :code:`(container, kwargs) -> kwargs`. kwargs may be updated
+        in-place.
+        """
+        try:
+            return self.injectors[offset]
+        except KeyError:
+            return self.injectors.setdefault(offset, _compile_injector(self, offset))
 
 
 class InjectedWrapper:
@@ -36,36 +78,70 @@ class InjectedWrapper:
     Wrapper which injects all the dependencies not supplied in the passed
     arguments. An InjectionBlueprint is used to store the mapping of the
     arguments to their dependency if any and if the injection is required.
+
+    Coroutine functions are wrapped by a coroutine function retrieving their
+    dependencies asynchronously.
     """
 
     def __init__(self,
                  container: DependencyContainer,
                  blueprint: InjectionBlueprint,
                  wrapped: Callable,
-                 skip_first: bool = False):
+                 skip_first: bool = False,
+                 is_async: bool = None):
         self.__wrapped__ = wrapped
         self.__container = container
         self.__blueprint = blueprint
         self.__injection_offset = 1 if skip_first else 0
+        self.__is_async = is_async if is_async is not None \
+            else asyncio.iscoroutinefunction(getattr(wrapped, '__func__', wrapped))
         functools.wraps(wrapped, updated=())(self)
 
     def __call__(self, *args, **kwargs):
-        kwargs = _inject_kwargs(
-            self.__container,
-            self.__blueprint,
-            self.__injection_offset + len(args),
-            kwargs
-        )
+        if self.__is_async:
+            return _async_call(self.__wrapped__,
+                               self.__container,
+                               self.__blueprint,
+                               self.__injection_offset + len(args),
+                               args,
+                               kwargs)
+
+        offset = self.__injection_offset + len(args)
+        if not kwargs:
+            cache = self.__blueprint.cache
+            if cache[0] == self.__container._generation and cache[1] == offset:
+                if cache[2] is not None:
+                    return self.__wrapped__(*args, **cache[2])
+            else:
+                return self.__call_and_cache(offset, args)
+
+        # kwargs is always a new dictionary which can be updated in-place.
+        kwargs = self.__blueprint.injector(offset)(self.__container, kwargs)
+        return self.__wrapped__(*args, **kwargs)
+
+    def __call_and_cache(self, offset: int, args: tuple):
+        container = self.__container
+        # Retrieved first, any change meanwhile invalidates the cache.
+        generation = container._generation
+        kwargs = self.__blueprint.injector(offset)(container, dict())
+        self.__blueprint.cache = (generation,
+                                  offset,
+                                  _cacheable_kwargs(container,
+                                                    self.__blueprint,
+                                                    offset,
+                                                    kwargs))
         return self.__wrapped__(*args, **kwargs)
 
     def __get__(self, instance, owner):
         wrapped = self.__wrapped__.__get__(instance, owner)
+        skip_first = isinstance(self.__wrapped__, classmethod) \
+            or (not isinstance(self.__wrapped__, staticmethod) and instance is not None)
         return functools.wraps(wrapped, updated=())(InjectedBoundWrapper(
             self.__container,
             self.__blueprint,
             wrapped,
-            isinstance(self.__wrapped__, classmethod)
-            or (not isinstance(self.__wrapped__, staticmethod) and instance is not None)
+            skip_first,
+            self.__is_async
         ))
 
     @property
@@ -89,23 +165,166 @@ class InjectedBoundWrapper(InjectedWrapper):
         return self  # pragma: no cover
 
 
+def get_injected_dependencies(wrapper,
+                              offset: int = 0,
+                              provided: Container[str] = ()) -> List:
+    """
+    Returns the dependencies which would be injected by an InjectedWrapper,
+    skipping the first offset positional arguments and the provided ones. Any
+    other callable has none.
+    """
+    if not isinstance(wrapper, InjectedWrapper):
+        return []
+
+    blueprint = wrapper._InjectedWrapper__blueprint  # type: ignore
+    offset += wrapper._InjectedWrapper__injection_offset  # type: ignore
+    return [
+        injection.dependency
+        for injection in blueprint.injections[offset:]
+        if injection.dependency is not None and injection.arg_name not in provided
+    ]
+
+
 def _inject_kwargs(container: DependencyContainer,
                    blueprint: InjectionBlueprint,
                    offset: int,
                    kwargs: dict) -> dict:
     """
     Does the actual injection of the dependencies. Used by InjectedCallableWrapper.
+
+    When several arguments are missing, their dependencies are retrieved
+    all at once with DependencyContainer.provide_many().
     """
-    dirty_kwargs = False
+    injections = [
+        injection
+        for injection in blueprint.injections[offset:]
+        if injection.dependency is not None and injection.arg_name not in kwargs
+    ]
+    if not injections:
+        return kwargs
+
+    if len(injections) == 1:
+        dependency_instances = [container.provide(injections[0].dependency)]
+    else:
+        dependency_instances = container.provide_many([
+            injection.dependency
+            for injection in injections
+        ])
+
+    return _merge_kwargs(injections, dependency_instances, kwargs)
+
+
+def _cacheable_kwargs(container: DependencyContainer,
+                      blueprint: InjectionBlueprint,
+                      offset: int,
+                      kwargs: dict) -> Optional[dict]:
+    """
+    Returns the injected kwargs if they can be cached: all of them are
+    singletons of a container which does not customize their retrieval.
+    """
+    if type(container) is not DependencyContainer \
+            or container._override is not None \
+            or container._listeners is not None:
+        return None
+
     for injection in blueprint.injections[offset:]:
-        if injection.dependency is not None and injection.arg_name not in kwargs:
-            dependency_instance = container.provide(injection.dependency)
-            if dependency_instance is not None:
-                if not dirty_kwargs:
-                    kwargs = kwargs.copy()
-                    dirty_kwargs = True
-                kwargs[injection.arg_name] = dependency_instance.instance
-            elif injection.required:
-                raise DependencyNotFoundError(injection.dependency)
+        if injection.dependency is not None:
+            dependency_instance = container.peek(injection.dependency)
+            if dependency_instance is None \
+                    or kwargs.get(injection.arg_name) \
+                    is not dependency_instance.instance:
+                return None
+
+    return kwargs
+
+
+def _compile_injector(blueprint: InjectionBlueprint,
+                      offset: int) -> Callable[..., dict]:
+    """
+    Generates the source of a function injecting the arguments of the
+    blueprint starting at offset, with hard-coded argument names and without
+    those which are never injected. When all of them are missing, which is
+    the common case, their dependencies are retrieved directly. Otherwise the
+    generic _inject_kwargs() is used.
+
+    Used by InjectionBlueprint.
+    """
+    injections = [injection
+                  for injection in blueprint.injections[offset:]
+                  if injection.dependency is not None]
+    namespace = dict(
+        blueprint=blueprint,
+        DependencyNotFoundError=DependencyNotFoundError,
+        inject_kwargs=_inject_kwargs
+    )  # type: Dict[str, object]
+    lines = ['def injector(container, kwargs):']
+    if not injections:
+        lines.append('    return kwargs')
+    else:
+        lines.append('    if {}:'.format(' and '.join(
+            '{!r} not in kwargs'.format(injection.arg_name)
+            for injection in injections
+        )))
+        for i, injection in enumerate(injections):
+            namespace['d{}'.format(i)] = injection.dependency
+        if len(injections) == 1:
+            lines.append('        i0 = container.provide(d0)')
+        else:
+            lines.append('        {}, = container.provide_many(({},))'.format(
+                ', '.join('i{}'.format(i) for i in range(len(injections))),
+                ', '.join('d{}'.format(i) for i in range(len(injections)))
+            ))
+        for i, injection in enumerate(injections):
+            lines.append('        if i{} is not None:'.format(i))
+            lines.append('            kwargs[{!r}] = i{}.instance'.format(
+                injection.arg_name, i))
+            if injection.required:
+                lines.append('        else:')
+                lines.append('            raise DependencyNotFoundError(d{})'.format(i))
+        lines.append('        return kwargs')
+        lines.append(
+            '    return inject_kwargs(container, blueprint, {}, kwargs)'.format(offset))
+
+    exec(compile('\n'.join(lines), '<injector>', 'exec'), namespace)
+    return namespace['injector']  # type: ignore
+
+
+async def _async_call(wrapped: Callable,
+                      container: DependencyContainer,
+                      blueprint: InjectionBlueprint,
+                      offset: int,
+                      args: tuple,
+                      kwargs: dict):
+    """
+    Injects the dependencies of a coroutine function asynchronously before
+    awaiting it. Used by InjectedCallableWrapper.
+    """
+    injections = [
+        injection
+        for injection in blueprint.injections[offset:]
+        if injection.dependency is not None and injection.arg_name not in kwargs
+    ]
+    if injections:
+        dependency_instances = await container.aprovide_many([
+            injection.dependency
+            for injection in injections
+        ])
+        kwargs = _merge_kwargs(injections, dependency_instances, kwargs)
+
+    return await wrapped(*args, **kwargs)
+
+
+def _merge_kwargs(injections: List[Injection],
+                  dependency_instances: List[Optional[DependencyInstance]],
+                  kwargs: dict) -> dict:
+    dirty_kwargs = False
+    for injection, dependency_instance in zip(injections, dependency_instances):
+        if dependency_instance is not None:
+            if not dirty_kwargs:
+                kwargs = kwargs.copy()
+                dirty_kwargs = True
+            kwargs[injection.arg_name] = dependency_instance.instance
+        elif injection.required:
+            raise DependencyNotFoundError(injection.dependency)
 
     return kwargs
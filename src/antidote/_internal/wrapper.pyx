@@ -1,11 +1,16 @@
 # cython: language_level=3
 # cython: boundscheck=False, wraparound=False, annotation_typing=False
 
+import asyncio
+import threading
+
 # @formatter:off
 cimport cython
 from cpython.dict cimport PyDict_Contains, PyDict_Copy, PyDict_SetItem
+from cpython.list cimport PyList_GET_ITEM, PyList_GET_SIZE
 from cpython.object cimport PyObject_Call
-from cpython.tuple cimport PyTuple_GET_ITEM,  PyTuple_Size
+from cpython.ref cimport PyObject
+from cpython.tuple cimport PyTuple_GET_ITEM, PyTuple_GET_SIZE, PyTuple_Size
 
 from antidote.core.container cimport DependencyContainer, DependencyInstance
 from ..exceptions import DependencyNotFoundError
@@ -13,6 +18,61 @@ from ..exceptions import DependencyNotFoundError
 
 compiled = True
 
+cdef extern from *:
+    """
+    #if PY_VERSION_HEX >= 0x03090000
+    #define antidote_Vectorcall PyObject_Vectorcall
+    #elif PY_VERSION_HEX >= 0x03080000
+    #define antidote_Vectorcall _PyObject_Vectorcall
+    #else
+    /* PEP 590 is not available, the arguments and keyword arguments are
+       converted back to a tuple and a dict. */
+    static PyObject *antidote_Vectorcall(PyObject *callable,
+                                         PyObject *const *args,
+                                         size_t nargsf,
+                                         PyObject *kwnames) {
+        Py_ssize_t nargs = (Py_ssize_t) nargsf, i;
+        PyObject *tuple, *kwargs = NULL, *result;
+
+        tuple = PyTuple_New(nargs);
+        if (tuple == NULL)
+            return NULL;
+        for (i = 0; i < nargs; i++) {
+            Py_INCREF(args[i]);
+            PyTuple_SET_ITEM(tuple, i, args[i]);
+        }
+        if (kwnames != NULL) {
+            kwargs = PyDict_New();
+            if (kwargs == NULL) {
+                Py_DECREF(tuple);
+                return NULL;
+            }
+            for (i = 0; i < PyTuple_GET_SIZE(kwnames); i++) {
+                if (PyDict_SetItem(kwargs, PyTuple_GET_ITEM(kwnames, i),
+                                   args[nargs + i]) < 0) {
+                    Py_DECREF(tuple);
+                    Py_DECREF(kwargs);
+                    return NULL;
+                }
+            }
+        }
+        result = PyObject_Call(callable, tuple, kwargs);
+        Py_DECREF(tuple);
+        Py_XDECREF(kwargs);
+        return result;
+    }
+    #endif
+    """
+    object antidote_Vectorcall(object callable,
+                               PyObject** args,
+                               size_t nargsf,
+                               PyObject*kwnames)
+
+# Maximum number of arguments, positional and injected, passed through the
+# vectorcall protocol. Calls with more of them use a tuple and a dict.
+cdef enum:
+    MAX_VECTOR = 16
+
 @cython.freelist(128)
 cdef class Injection:
     cdef:
@@ -34,13 +94,74 @@ cdef class Injection:
         self.dependency = dependency
 
 cdef class InjectionBlueprint:
+    """
+    Stores all the injections for a function. They may also be built lazily
+    on first use, once, by the given function.
+    """
     cdef:
         readonly tuple injections
+        object build
+        object lock
+        # For each offset of the first argument to inject, the injections of
+        # the arguments which can be injected, their names and dependencies.
+        tuple injectables
+        tuple kwnames
+        tuple dependencies
+        # Injected instances when all of them are singletons, for the
+        # generation of the container and offset. Shared by bound wrappers.
+        unsigned long long cache_generation
+        int cache_offset
+        tuple cache
 
-    def __init__(self, tuple injections):
+    def __init__(self, tuple injections = None, build = None):
+        self.cache_generation = 0
+        self.cache_offset = -1  # No offset is negative
+        self.cache = None
+        self.build = build
+        if injections is None:
+            self.lock = threading.Lock()
+        else:
+            self.set_injections(injections)
+
+    cdef int ensure(self) except -1:
+        """
+        Builds the injections if not done yet.
+        """
+        if self.injections is None:
+            with self.lock:
+                if self.injections is None:
+                    self.set_injections(tuple(self.build()))
+                    self.build = None
+        return 0
+
+    cdef set_injections(self, tuple injections):
+        injectables = [
+            tuple([injection
+                   for injection in injections[offset:]
+                   if injection.dependency is not None])
+            for offset in range(len(injections) + 1)
+        ]
+        self.injectables = tuple(injectables)
+        self.kwnames = tuple([
+            tuple([injection.arg_name for injection in i])
+            for i in injectables
+        ])
+        self.dependencies = tuple([
+            tuple([injection.dependency for injection in i])
+            for i in injectables
+        ])
+        # Set last, as it marks the blueprint as built.
         self.injections = injections
 
 cdef class InjectedWrapper:
+    """
+    Wrapper which injects all the dependencies not supplied in the passed
+    arguments. An InjectionBlueprint is used to store the mapping of the
+    arguments to their dependency if any and if the injection is required.
+
+    Coroutine functions are wrapped by a coroutine function retrieving their
+    dependencies asynchronously.
+    """
     cdef:
         # public attributes as those are going to be overwritten by
         # functools.wraps()
@@ -48,18 +169,58 @@ cdef class InjectedWrapper:
         DependencyContainer __container
         InjectionBlueprint __blueprint
         int __injection_offset
+        bint __is_async
 
     def __cinit__(self,
                   DependencyContainer container,
                   InjectionBlueprint blueprint,
                   object wrapped,
-                  bint skip_first = False):
+                  bint skip_first = False,
+                  is_async = None):
         self.__wrapped__ = wrapped
         self.__container = container
         self.__blueprint = blueprint
         self.__injection_offset = 1 if skip_first else 0
+        self.__is_async = is_async if is_async is not None \
+            else asyncio.iscoroutinefunction(getattr(wrapped, '__func__', wrapped))
 
     def __call__(self, *args, **kwargs):
+        cdef:
+            int offset
+            InjectionBlueprint blueprint = self.__blueprint
+
+        if self.__is_async:
+            blueprint.ensure()
+            return _async_call(self.__wrapped__,
+                               self.__container,
+                               blueprint,
+                               self.__injection_offset + len(args),
+                               args,
+                               kwargs)
+
+        # Without any keyword argument, all injectable arguments are missing.
+        # They are passed with the vectorcall protocol, without any dict.
+        if not kwargs:
+            offset = self.__injection_offset + PyTuple_GET_SIZE(args)
+            if blueprint.cache_generation == self.__container._generation \
+                    and blueprint.cache_offset == offset:
+                if blueprint.cache is not None:
+                    return _cached_vectorcall(self.__wrapped__, blueprint, offset, args)
+                return _vectorcall(self.__wrapped__,
+                                   self.__container,
+                                   blueprint,
+                                   offset,
+                                   args,
+                                   False)
+            blueprint.ensure()
+            return _vectorcall(self.__wrapped__,
+                               self.__container,
+                               blueprint,
+                               offset,
+                               args,
+                               True)
+
+        blueprint.ensure()
         kwargs = _inject_kwargs(
             self.__container,
             self.__blueprint,
@@ -75,7 +236,8 @@ cdef class InjectedWrapper:
             self.__blueprint,
             self.__wrapped__.__get__(instance, owner),
             isinstance(self.__wrapped__, classmethod)
-            or (not isinstance(self.__wrapped__, staticmethod) and instance is not None)
+            or (not isinstance(self.__wrapped__, staticmethod) and instance is not None),
+            self.__is_async
         )
 
     @property
@@ -110,27 +272,216 @@ cdef class InjectedBoundWrapper(InjectedWrapper):
     def __get__(self, instance, owner):
         return self
 
+def get_injected_dependencies(wrapper, int offset = 0, provided = ()) -> list:
+    """
+    Returns the dependencies which would be injected by an InjectedWrapper,
+    skipping the first offset positional arguments and the provided ones. Any
+    other callable has none.
+    """
+    cdef:
+        InjectedWrapper injected_wrapper
+        Injection injection
+
+    if not isinstance(wrapper, InjectedWrapper):
+        return []
+
+    injected_wrapper = <InjectedWrapper> wrapper
+    injected_wrapper.__blueprint.ensure()
+    offset += injected_wrapper.__injection_offset
+    return [
+        injection.dependency
+        for injection in injected_wrapper.__blueprint.injections[offset:]
+        if injection.dependency is not None and injection.arg_name not in provided
+    ]
+
+cdef object _vectorcall(object wrapped,
+                        DependencyContainer container,
+                        InjectionBlueprint blueprint,
+                        int offset,
+                        tuple args,
+                        bint fill_cache):
+    cdef:
+        PyObject*stack[MAX_VECTOR]
+        Py_ssize_t nargs = PyTuple_GET_SIZE(args)
+        Py_ssize_t n, i
+        int call_offset = offset
+        tuple kwnames
+        tuple injections
+        list dependency_instances
+        DependencyInstance dependency_instance
+        object instance
+        # Retrieved first, any change meanwhile invalidates the cache.
+        unsigned long long generation = container._generation
+        bint cacheable
+
+    if offset >= PyTuple_GET_SIZE(blueprint.kwnames):
+        offset = PyTuple_GET_SIZE(blueprint.kwnames) - 1
+    kwnames = <tuple> PyTuple_GET_ITEM(blueprint.kwnames, offset)
+    n = PyTuple_GET_SIZE(kwnames)
+    if nargs + n > MAX_VECTOR:
+        return PyObject_Call(wrapped, args, _inject_kwargs(container,
+                                                           blueprint,
+                                                           offset,
+                                                           dict()))
+
+    for i in range(nargs):
+        stack[i] = PyTuple_GET_ITEM(args, i)
+
+    if n == 0:
+        return antidote_Vectorcall(wrapped, stack, nargs, NULL)
+
+    injections = <tuple> PyTuple_GET_ITEM(blueprint.injectables, offset)
+    if n == 1:
+        dependency_instances = [container.provide(
+            (<Injection> PyTuple_GET_ITEM(injections, 0)).dependency)]
+    else:
+        dependency_instances = container.provide_many(
+            <tuple> PyTuple_GET_ITEM(blueprint.dependencies, offset))
+
+    for i in range(n):
+        dependency_instance = <DependencyInstance> PyList_GET_ITEM(
+            dependency_instances, i)
+        if dependency_instance is None:
+            break
+        # Kept alive by dependency_instances during the call.
+        instance = dependency_instance.instance
+        stack[nargs + i] = <PyObject*> instance
+    else:
+        if fill_cache:
+            # Only a container which does not customize the retrieval of the
+            # singletons can be bypassed.
+            cacheable = type(container) is DependencyContainer \
+                and container._override is None \
+                and container._listeners is None
+            if cacheable:
+                for i in range(n):
+                    if not (<DependencyInstance> PyList_GET_ITEM(dependency_instances,
+                                                                 i)).singleton:
+                        cacheable = False
+                        break
+            # Replacing the cache may run arbitrary code, so it is
+            # invalidated first and only validated once set.
+            blueprint.cache_offset = -1
+            blueprint.cache = tuple([
+                (<DependencyInstance> dependency_instance).instance
+                for dependency_instance in dependency_instances
+            ]) if cacheable else None
+            blueprint.cache_generation = generation
+            blueprint.cache_offset = call_offset
+        return antidote_Vectorcall(wrapped, stack, nargs, <PyObject*> kwnames)
+
+    # Missing dependencies are only supported through keyword arguments.
+    return PyObject_Call(wrapped, args, _merge_kwargs(list(injections),
+                                                      dependency_instances,
+                                                      dict()))
+
+cdef object _cached_vectorcall(object wrapped,
+                               InjectionBlueprint blueprint,
+                               int offset,
+                               tuple args):
+    cdef:
+        PyObject*stack[MAX_VECTOR]
+        Py_ssize_t nargs = PyTuple_GET_SIZE(args)
+        Py_ssize_t i
+        tuple cache = blueprint.cache
+
+    if offset >= PyTuple_GET_SIZE(blueprint.kwnames):
+        offset = PyTuple_GET_SIZE(blueprint.kwnames) - 1
+    # Bound and unbound wrappers share the cache with a different number of
+    # positional arguments for the same offset, so it may not fit anymore.
+    if nargs + PyTuple_GET_SIZE(cache) > MAX_VECTOR:
+        return PyObject_Call(wrapped, args, dict(zip(
+            <tuple> PyTuple_GET_ITEM(blueprint.kwnames, offset), cache)))
+
+    for i in range(nargs):
+        stack[i] = PyTuple_GET_ITEM(args, i)
+    for i in range(PyTuple_GET_SIZE(cache)):
+        stack[nargs + i] = PyTuple_GET_ITEM(cache, i)
+
+    return antidote_Vectorcall(wrapped,
+                               stack,
+                               nargs,
+                               PyTuple_GET_ITEM(blueprint.kwnames, offset))
+
 cdef inline dict _inject_kwargs(DependencyContainer container,
                                 InjectionBlueprint blueprint,
                                 int offset,
                                 dict kwargs):
     cdef:
         Injection injection
-        DependencyInstance dependency_instance
-        bint dirty_kwargs = False
+        list injections = []
+        list dependency_instances
+        int i
+
+    for i in range(offset, PyTuple_Size(blueprint.injections)):
+        injection = <Injection> PyTuple_GET_ITEM(blueprint.injections, i)
+        if injection.dependency is not None \
+                and PyDict_Contains(kwargs, injection.arg_name) == 0:
+            injections.append(injection)
+
+    if PyList_GET_SIZE(injections) == 0:
+        return kwargs
+
+    # Several missing arguments are retrieved all at once.
+    if PyList_GET_SIZE(injections) == 1:
+        injection = <Injection> PyList_GET_ITEM(injections, 0)
+        dependency_instances = [container.provide(injection.dependency)]
+    else:
+        dependency_instances = container.provide_many([
+            (<Injection> injection).dependency
+            for injection in injections
+        ])
+
+    return _merge_kwargs(injections, dependency_instances, kwargs)
+
+async def _async_call(object wrapped,
+                      DependencyContainer container,
+                      InjectionBlueprint blueprint,
+                      int offset,
+                      tuple args,
+                      dict kwargs):
+    """
+    Injects the dependencies of a coroutine function asynchronously before
+    awaiting it.
+    """
+    cdef:
+        Injection injection
+        list injections = []
         int i
 
     for i in range(offset, PyTuple_Size(blueprint.injections)):
         injection = <Injection> PyTuple_GET_ITEM(blueprint.injections, i)
         if injection.dependency is not None \
                 and PyDict_Contains(kwargs, injection.arg_name) == 0:
-            dependency_instance = container.provide(injection.dependency)
-            if dependency_instance is not None:
-                if not dirty_kwargs:
-                    kwargs = PyDict_Copy(kwargs)
-                    dirty_kwargs = True
-                PyDict_SetItem(kwargs, injection.arg_name, dependency_instance.instance)
-            elif injection.required:
-                raise DependencyNotFoundError(injection.dependency)
+            injections.append(injection)
+
+    if PyList_GET_SIZE(injections) > 0:
+        dependency_instances = await container.aprovide_many([
+            (<Injection> injection).dependency
+            for injection in injections
+        ])
+        kwargs = _merge_kwargs(injections, dependency_instances, kwargs)
+
+    return await PyObject_Call(wrapped, args, kwargs)
+
+cdef inline dict _merge_kwargs(list injections,
+                               list dependency_instances,
+                               dict kwargs):
+    cdef:
+        Injection injection
+        DependencyInstance dependency_instance
+        bint dirty_kwargs = False
+        int i
+
+    for i in range(PyList_GET_SIZE(injections)):
+        injection = <Injection> PyList_GET_ITEM(injections, i)
+        dependency_instance = <DependencyInstance> PyList_GET_ITEM(dependency_instances, i)
+        if dependency_instance is not None:
+            if not dirty_kwargs:
+                kwargs = PyDict_Copy(kwargs)
+                dirty_kwargs = True
+            PyDict_SetItem(kwargs, injection.arg_name, dependency_instance.instance)
+        elif injection.required:
+            raise DependencyNotFoundError(injection.dependency)
 
     return kwargs
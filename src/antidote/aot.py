@@ -0,0 +1,465 @@
+"""
+Ahead-of-time compilation of the wiring of an application. Importing it once
+with :py:func:`~.compile_wiring`, or :code:`python -m antidote compile`,
+generates a plain Python module with the injections of all functions and the
+registrations of the container. Loaded with :py:func:`~.load_wiring` before
+the application, injected functions are wrapped without analyzing their
+signature nor their type hints.
+
+.. code-block:: bash
+
+    python -m antidote compile myapp.wiring -o myapp/_wiring.py
+
+.. code-block:: python
+
+    from antidote.aot import load_wiring
+    load_wiring('myapp._wiring')
+    import myapp.wiring
+
+The hash of the source of each module is kept, functions of modules which
+changed since are analyzed as usual. Only functions which can be imported and
+dependencies which can be expressed in Python, such as classes, enums or
+builtin constants, are compiled.
+"""
+import functools
+import hashlib
+import importlib
+import inspect
+import sys
+import threading
+from enum import Enum
+from types import ModuleType
+from typing import Callable, cast, Dict, List, Optional, Set, Tuple, Union
+
+from ._internal.default_container import get_default_container
+from ._internal.utils import dependency_label
+from ._internal.wrapper import InjectedWrapper, Injection, InjectionBlueprint
+from .core import DependencyContainer, injection
+from .exceptions import StaleWiringError
+from .providers import FactoryProvider, IndirectProvider, TagProvider
+from .providers.factory import Build
+from .providers.tag import Tag, Tagged
+
+FORMAT = 1
+
+
+def compile_wiring(module: str, container: DependencyContainer = None) -> str:
+    """
+    Imports the module, recording the injections of all functions wired
+    meanwhile, and returns the source of the module to be loaded with
+    :py:func:`~.load_wiring`. Modules which were already imported are not
+    recorded, hence it should be done in a new interpreter.
+
+    Args:
+        module: Name of the module wiring the application.
+        container: :py:class:`~.core.container.DependencyContainer` whose
+            registrations are compiled. Defaults to the global container,
+            :code:`antidote.world`.
+
+    Returns:
+        Source of the compiled module.
+    """
+    container = container or get_default_container()
+    recorder = _Recorder()
+    _install(recorder)
+    try:
+        importlib.import_module(module)
+    finally:
+        unload_wiring()
+    return _Writer().source(module, recorder, container)
+
+
+def load_wiring(artifact: Union[str, ModuleType],
+                strict: bool = False) -> 'CompiledWiring':
+    """
+    Uses the injections compiled by :py:func:`~.compile_wiring` for all
+    functions injected afterwards. It must be loaded before the application.
+
+    Args:
+        artifact: Compiled module or its name.
+        strict: Raise a :py:exc:`~.exceptions.StaleWiringError` when a module
+            changed since its compilation instead of analyzing its functions.
+
+    Returns:
+        The loaded :py:class:`~.CompiledWiring`.
+    """
+    if isinstance(artifact, str):
+        artifact = importlib.import_module(artifact)
+    if getattr(artifact, 'FORMAT', None) != FORMAT:
+        raise StaleWiringError("{} was compiled by another version "
+                               "of antidote.".format(artifact.__name__))
+
+    wiring = CompiledWiring(artifact, strict)
+    _install(wiring)
+    return wiring
+
+
+def unload_wiring():
+    """
+    Stops using the wiring loaded with :py:func:`~.load_wiring`.
+    """
+    injection._aot = None
+
+
+class CompiledWiring:
+    """
+    Wiring compiled ahead of time, returned by :py:func:`~.load_wiring`.
+
+    Attributes:
+        artifact: The compiled module.
+        stale: Names of the modules which changed since the compilation. Only
+            those with injected functions are checked, when the first one is.
+    """
+
+    def __init__(self, artifact: ModuleType, strict: bool):
+        self.artifact = artifact
+        self.stale = set()  # type: Set[str]
+        self._strict = strict
+        self._lock = threading.Lock()
+        self._fresh = dict()  # type: Dict[str, bool]
+        self._injections = dict()  # type: Dict[str, Dict[str, tuple]]
+
+    def __repr__(self):
+        return "{}(artifact={!r}, stale={!r})".format(type(self).__name__,
+                                                      self.artifact.__name__,
+                                                      self.stale)
+
+    def wrap(self, wrapped, container: Optional[DependencyContainer], lazy: bool):
+        """
+        Internal API
+
+        Returns the function injected with its compiled injections, the
+        function itself if nothing is injected or None if it was not compiled.
+        """
+        key = _function_key(wrapped)
+        if key is None:
+            return None
+        module, qualname = key
+        compiled = self.artifact.MODULES.get(module)
+        if compiled is None or not self._is_fresh(module, compiled['source']):
+            return None
+
+        if qualname in compiled['injected']:
+            return InjectedWrapper(
+                container=container or get_default_container(),
+                blueprint=InjectionBlueprint(
+                    build=functools.partial(self._build_injections, module, qualname)
+                ),
+                wrapped=wrapped)
+        if qualname in compiled['not_injected'] and not lazy:
+            return wrapped
+        return None
+
+    def record(self, wrapped, build: Callable[[], tuple]):
+        pass
+
+    def verify(self, container: DependencyContainer = None) -> List[str]:
+        """
+        Compares the compiled registrations with those of the container, which
+        should be done once the application is wired. Registrations which
+        could not be compiled are ignored.
+
+        Args:
+            container: :py:class:`~.core.container.DependencyContainer` to
+                compare with. Defaults to the global container,
+                :code:`antidote.world`.
+
+        Returns:
+            Description of the differences, empty if there are none.
+        """
+        container = container or get_default_container()
+        differences = []
+        for kind in ('factories', 'tags', 'links'):
+            compiled = getattr(self.artifact, kind)()
+            current = [r for r in _registrations(container, kind)
+                       if _Writer.can_express(r)]
+            for registration in current:
+                if registration not in compiled:
+                    differences.append("{} {} is not compiled.".format(
+                        _KIND_NAMES[kind], _describe(registration)))
+            for registration in compiled:
+                if registration not in current:
+                    differences.append("{} {} is not registered anymore.".format(
+                        _KIND_NAMES[kind], _describe(registration)))
+        return differences
+
+    def _is_fresh(self, module: str, source: str) -> bool:
+        try:
+            return self._fresh[module]
+        except KeyError:
+            pass
+
+        fresh = _source_hash(sys.modules.get(module)) == source
+        self._fresh[module] = fresh
+        if not fresh:
+            self.stale.add(module)
+            if self._strict:
+                raise StaleWiringError("{} changed since it was compiled "
+                                       "in {}.".format(module, self.artifact.__name__))
+        return fresh
+
+    def _build_injections(self, module: str, qualname: str) -> tuple:
+        with self._lock:
+            try:
+                injections = self._injections[module]
+            except KeyError:
+                injections = self.artifact.MODULES[module]['injections']()
+                self._injections[module] = injections
+        return tuple(Injection(arg_name=arg_name, required=required,
+                               dependency=dependency)
+                     for arg_name, required, dependency in injections[qualname])
+
+
+def _install(aot):
+    """
+    Sets the hook of inject() and wire(), see antidote.core.injection
+    """
+    if injection._aot is not None:
+        raise RuntimeError("A wiring is already being compiled or loaded.")
+    injection._aot = aot
+
+
+class _Recorder:
+    """
+    Records the injections of all functions while compiling.
+    """
+
+    def __init__(self):
+        self.builds = dict()  # type: Dict[Tuple[str, str], List[Callable[[], tuple]]]
+
+    def wrap(self, wrapped, container: Optional[DependencyContainer], lazy: bool):
+        return None
+
+    def record(self, wrapped, build: Callable[[], tuple]):
+        key = _function_key(wrapped)
+        if key is not None:
+            self.builds.setdefault(key, []).append(build)
+
+    def injections(self) -> Dict[str, Dict[str, Optional[tuple]]]:
+        """
+        Returns the injections, as (arg_name, required, dependency), of each
+        function by module. None if nothing is injected. Functions injected
+        multiple times differently are ignored.
+        """
+        modules = dict()  # type: Dict[str, Dict[str, Optional[tuple]]]
+        for (module, qualname), builds in sorted(self.builds.items()):
+            variants = {
+                tuple((i.arg_name, i.required, i.dependency) for i in build())
+                for build in builds
+            }
+            if len(variants) == 1:
+                injections = variants.pop()
+                modules.setdefault(module, dict())[qualname] = None if all(
+                    dependency is None for _, _, dependency in injections
+                ) else injections
+        return modules
+
+
+class _Unsupported(Exception):
+    pass
+
+
+class _Writer:
+    """
+    Generates the source of the compiled module. Objects are expressed in
+    Python with the imports of their module, done within the function using
+    them as it is only called once the application is imported.
+    """
+
+    def __init__(self):
+        self.skipped = []  # type: List[str]
+        self._imports = dict()  # type: Dict[str, str]
+
+    @classmethod
+    def can_express(cls, obj) -> bool:
+        try:
+            cls().expression(obj)
+        except _Unsupported:
+            return False
+        return True
+
+    def source(self, target: str, recorder: _Recorder,
+               container: DependencyContainer) -> str:
+        functions = []  # type: List[str]
+        modules = []  # type: List[str]
+        for i, (module, injections) in enumerate(recorder.injections().items()):
+            source = _source_hash(sys.modules.get(module))
+            if source is None:
+                continue
+
+            entries = []  # type: List[str]
+            injected = []  # type: List[str]
+            for qualname, arguments in injections.items():
+                if arguments is None:
+                    continue
+                try:
+                    entries.append("{!r}: {},".format(qualname,
+                                                      self.expression(arguments)))
+                except _Unsupported:
+                    self.skipped.append("{}.{}".format(module, qualname))
+                else:
+                    injected.append(qualname)
+
+            name = '_injections_{}'.format(i)
+            functions.append(self.function(name, '{', entries, '}'))
+            modules.extend([
+                "    {!r}: {{".format(module),
+                "        'source': {!r},".format(source),
+                "        'injected': {},".format(self.names(injected)),
+                "        'not_injected': {},".format(self.names(
+                    q for q, a in injections.items() if a is None)),
+                "        'injections': {},".format(name),
+                "    },",
+            ])
+
+        for kind in ('factories', 'tags', 'links'):
+            entries = []
+            for registration in _registrations(container, kind):
+                try:
+                    entries.append(self.expression(registration) + ',')
+                except _Unsupported:
+                    self.skipped.append("{} {}".format(_KIND_NAMES[kind].lower(),
+                                                       _describe(registration)))
+            functions.append(self.function(kind, '[', entries, ']'))
+
+        lines = [
+            '"""',
+            "Wiring of {} compiled ahead of time by antidote, to be loaded".format(
+                target),
+            "with antidote.aot.load_wiring(). Generated with:",
+            "",
+            "    python -m antidote compile {}".format(target),
+            '"""',
+            "from antidote import Build, Tag, Tagged  # noqa: F401",
+            "",
+            "FORMAT = {!r}".format(FORMAT),
+            "TARGET = {!r}".format(target),
+        ]
+        if self.skipped:
+            lines.append("# Not compiled, as they cannot be expressed in Python:")
+            lines.extend("# - {}".format(skipped) for skipped in self.skipped)
+        for function in functions:
+            lines.extend(["", "", function])
+        lines.extend(["", "", "MODULES = {"] + modules + ["}", ""])
+        return "\n".join(lines)
+
+    def function(self, name: str, start: str, entries: List[str], end: str) -> str:
+        lines = ["def {}():".format(name)]
+        lines.extend("    import {} as {}".format(module, alias)
+                     for module, alias in self._imports.items())
+        lines.append("    return {}".format(start))
+        lines.extend("        {}".format(entry) for entry in entries)
+        lines.append("    {}".format(end))
+        self._imports = dict()
+        return "\n".join(lines)
+
+    @staticmethod
+    def names(names) -> str:
+        names = sorted(names)
+        if not names:
+            return "frozenset()"
+        return "frozenset({{{}}})".format(", ".join(repr(name) for name in names))
+
+    def expression(self, obj) -> str:
+        if obj is None or type(obj) in (bool, int, str, bytes):
+            return repr(obj)
+        if type(obj) is float and obj == obj \
+                and obj not in (float('inf'), float('-inf')):
+            return repr(obj)
+        if type(obj) is tuple:
+            items = [self.expression(e) for e in obj]
+            return "({}{})".format(", ".join(items), "," if len(items) == 1 else "")
+        if type(obj) is frozenset:
+            return "frozenset({{{}}})".format(
+                ", ".join(sorted(self.expression(e) for e in obj)))
+        if type(obj) is dict and all(isinstance(key, str) for key in obj):
+            return "{{{}}}".format(", ".join(
+                "{!r}: {}".format(key, self.expression(value))
+                for key, value in obj.items()
+            ))
+        if isinstance(obj, Enum):
+            return "{}.{}".format(self.reference(type(obj)), obj.name)
+        if type(obj) is Build:
+            return "Build({}, **{})".format(self.expression(obj.dependency),
+                                            self.expression(obj.kwargs))
+        if type(obj) is Tagged:
+            if obj.where is None and obj.order_by is None:
+                return "Tagged({!r})".format(obj.name)
+            return "Tagged({!r}, where={}, order_by={!r})".format(
+                obj.name, self.expression(obj.where), obj.order_by)
+        if type(obj) is Tag:
+            return "Tag({!r}, **{})".format(obj.name, self.expression(obj._attrs))
+        if inspect.ismethod(obj) and inspect.isclass(obj.__self__):
+            if getattr(obj.__self__, obj.__func__.__name__, None) != obj:
+                raise _Unsupported()
+            return "{}.{}".format(self.reference(obj.__self__), obj.__func__.__name__)
+        return self.reference(obj)
+
+    def reference(self, obj) -> str:
+        module = getattr(obj, '__module__', None)
+        qualname = getattr(obj, '__qualname__', None)
+        if not isinstance(module, str) or not isinstance(qualname, str) \
+                or '<locals>' in qualname or module == '__main__':
+            raise _Unsupported()
+
+        target = sys.modules.get(module)
+        for name in qualname.split('.'):
+            target = getattr(target, name, None)
+        if target is not obj:
+            raise _Unsupported()
+
+        try:
+            alias = self._imports[module]
+        except KeyError:
+            alias = self._imports[module] = '_m{}'.format(len(self._imports))
+        return "{}.{}".format(alias, qualname)
+
+
+_KIND_NAMES = {'factories': 'Factory of', 'tags': 'Tag of', 'links': 'Link of'}
+_KIND_PROVIDERS = {'factories': FactoryProvider, 'tags': TagProvider,
+                   'links': IndirectProvider}
+
+
+def _registrations(container: DependencyContainer, kind: str) -> List[tuple]:
+    """
+    Returns the registrations of the providers of the container, with the
+    tags as their name and attributes.
+    """
+    provider_class = _KIND_PROVIDERS[kind]
+    if provider_class not in container.providers:
+        return []
+    provider = container.providers[provider_class]
+    if kind == 'tags':
+        return [(dependency, tag.name, dict(tag._attrs))
+                for dependency, tag in cast(TagProvider, provider).registrations()]
+    return list(cast(Union[FactoryProvider, IndirectProvider],
+                     provider).registrations())
+
+
+def _describe(registration: tuple) -> str:
+    return dependency_label(registration[0])
+
+
+def _function_key(func) -> Optional[Tuple[str, str]]:
+    """
+    Returns the module and the qualified name identifying the function, if it
+    can be imported.
+    """
+    func = getattr(func, '__func__', func)  # staticmethod and classmethod
+    module = getattr(func, '__module__', None)
+    qualname = getattr(func, '__qualname__', None)
+    if not isinstance(module, str) or not isinstance(qualname, str) \
+            or '<locals>' in qualname:
+        return None
+    return module, qualname
+
+
+def _source_hash(module: Optional[ModuleType]) -> Optional[str]:
+    path = getattr(module, '__file__', None)
+    if path is None:
+        return None
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
@@ -1,3 +1,6 @@
 from .container import DependencyContainer, DependencyInstance, DependencyProvider
+from .graph import DependencyDescription, DependencyGraph
+from .listener import DependencyListener
 from .injection import DEPENDENCIES_TYPE, inject
 from .proxy import ProxyContainer
+from .scope import Scope
@@ -1,26 +1,49 @@
 # cython: language_level=3
 # cython: boundscheck=False, wraparound=False
 # @formatter:off
-from antidote._internal.stack cimport DependencyStack
+from antidote._internal.lock cimport InstantiationLock
 # @formatter:on
 
+cdef class DependencyProvider
+
 cdef class DependencyInstance:
     cdef:
         readonly object instance
         readonly bint singleton
+        readonly bint scoped
 
 cdef class DependencyContainer:
     cdef:
         object __weakref__
         list _providers
         dict _type_to_provider
+        dict _dependency_to_provider
+        unsigned long _provider_scans
+        dict _resolution_table
+        bint _frozen
         dict _singletons
-        DependencyStack _dependency_stack
-        object _instantiation_lock
+        set _not_found
+        InstantiationLock _instantiation_lock
+        object _scope_var
+        dict _async_instantiations
+        DependencyContainer _override
+        object _graph
+        tuple _listeners
+        object _stats
+        object _tracer
+        unsigned long long _generation
 
     cpdef object get(self, object dependency)
+    cpdef list get_many(self, object dependencies)
     cpdef DependencyInstance safe_provide(self, object dependency)
     cpdef DependencyInstance provide(self, object dependency)
+    cdef DependencyInstance _provide(self, object dependency)
+    cdef DependencyInstance _listened_provide(self, object dependency)
+    cdef DependencyInstance _listened_instantiation(self,
+                                                    DependencyProvider provider,
+                                                    object dependency)
+    cpdef DependencyInstance peek(self, object dependency)
+    cpdef list provide_many(self, object dependencies)
 
 cdef class DependencyProvider:
     cdef:
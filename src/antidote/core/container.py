@@ -1,26 +1,86 @@
-import threading
-from typing import (Any, cast, Dict, Generic, Hashable, List, Mapping, Optional, Tuple,
-                    TypeVar)
+import asyncio
+import itertools
+import time
+import weakref
+from contextlib import contextmanager
+from typing import (Any, cast, Dict, Generic, Hashable, Iterable, Iterator, List,
+                    Mapping, Optional, Sequence, Set, Tuple, TypeVar)
 
 from .exceptions import (DependencyCycleError, DependencyInstantiationError,
-                         DependencyNotFoundError)
-from .._internal.stack import DependencyStack
+                         DependencyNotFoundError, FrozenContainerError)
+from .._internal.lock import InstantiationLock
+from .graph import DependencyDescription, DependencyGraph, warmup
+from .scope import new_scope_var, Scope
 from .._internal.utils import SlotsReprMixin
 
+try:
+    from contextvars import ContextVar
+except ImportError:  # pragma: no cover, Python < 3.7
+    ContextVar = None  # type: ignore
+
 T = TypeVar('T')
 
+# Generations of the containers, unique across all of them. A new one is
+# assigned to a container whenever a previously retrieved singleton may not be
+# returned anymore by DependencyContainer.provide().
+_generations = itertools.count()
+
+# Event loop running the current coroutine.
+_get_running_loop = getattr(asyncio, 'get_running_loop',  # Python < 3.7
+                            asyncio.get_event_loop)
+
+# Task currently run by the event loop.
+_current_task = getattr(asyncio, 'current_task', None)
+if _current_task is None:  # pragma: no cover, Python < 3.7
+    _current_task = asyncio.Task.current_task  # type: ignore
+
+
+class _TaskStackVar:
+    """
+    Internal API
+
+    Task-local fallback with the same API as ContextVar, used to store the
+    stack of asynchronous instantiations when contextvars is not available.
+    The stack is explicitly given to the tasks instantiating dependencies, so
+    cycles are detected across them all the same.
+    """
+
+    def __init__(self):
+        self._stacks = weakref.WeakKeyDictionary()  # type: Dict[Any, Tuple]
+
+    def get(self):
+        task = _current_task()
+        return self._stacks.get(task, ()) if task is not None else ()
+
+    def set(self, stack):
+        token = self.get()
+        self._stacks[_current_task()] = stack
+        return token
+
+    def reset(self, token):
+        self._stacks[_current_task()] = token
+
+
+# Dependencies being instantiated asynchronously by the current task and the
+# ones awaiting it, with their container, to detect cycles.
+_async_stack = _TaskStackVar()  # type: Any
+if ContextVar is not None:
+    _async_stack = ContextVar('antidote_async_stack', default=())
+
 
 class DependencyInstance(SlotsReprMixin, Generic[T]):
     """
     Simple wrapper used by a :py:class:`~.core.Provider` when returning an
     instance of a dependency so it can specify in which scope the instance
-    belongs to.
+    belongs to. Scoped instances are shared within the current
+    :py:class:`~.core.Scope`, if any.
     """
-    __slots__ = ('instance', 'singleton')
+    __slots__ = ('instance', 'singleton', 'scoped')
 
-    def __init__(self, instance: T, singleton: bool = False):
+    def __init__(self, instance: T, singleton: bool = False, scoped: bool = False):
         self.instance = instance
         self.singleton = singleton
+        self.scoped = scoped
 
 
 class DependencyContainer:
@@ -32,10 +92,22 @@ class DependencyContainer:
     def __init__(self):
         self._providers = list()  # type: List[DependencyProvider]
         self._type_to_provider = dict()  # type: Dict[type, DependencyProvider]
+        self._dependency_to_provider = dict()  # type: Dict[Any, DependencyProvider]
+        self._provider_scans = 0
+        self._resolution_table = dict()  # type: Dict[Any, DependencyProvider]
+        self._frozen = False
         self._singletons = dict()  # type: Dict[Any, DependencyInstance]
         self._singletons[DependencyContainer] = DependencyInstance(self, singleton=True)
-        self._dependency_stack = DependencyStack()
-        self._instantiation_lock = threading.RLock()
+        self._not_found = set()  # type: Set[Any]
+        self._instantiation_lock = InstantiationLock()
+        self._scope_var = new_scope_var()
+        self._async_instantiations = dict()  # type: Dict[Any, asyncio.Future]
+        self._override = None  # type: Optional[DependencyContainer]
+        self._graph = DependencyGraph(self)
+        self._listeners = None  # type: Optional[Tuple[Any, ...]]
+        self._stats = None  # type: Any
+        self._tracer = None  # type: Any
+        self._generation = next(_generations)
 
     def __str__(self):
         return "{}(providers=({}))".format(
@@ -57,11 +129,85 @@ class DependencyContainer:
         """ Returns a mapping of all the registered providers by their type. """
         return {type(p): p for p in self._providers}
 
+    @property
+    def dispatch_table(self) -> Mapping[Any, 'DependencyProvider']:
+        """
+        Returns the providers which were found for dependencies not bound to
+        any provider by their type, by scanning all of them, if those are not
+        singletons. Those are used directly afterwards.
+        """
+        return self._dependency_to_provider.copy()
+
+    @property
+    def provider_scans(self) -> int:
+        """
+        Returns how many times all providers had to be scanned to find one
+        for a dependency.
+        """
+        return self._provider_scans
+
+    @property
+    def frozen(self) -> bool:
+        """ Whether new dependencies can still be registered or not. """
+        return self._frozen
+
+    @property
+    def graph(self) -> DependencyGraph:
+        """
+        Returns the :py:class:`~.core.DependencyGraph` of all known
+        dependencies, updated with each registration.
+        """
+        return self._graph
+
     @property
     def singletons(self) -> dict:
         """ Returns all the defined singletons """
         return self._singletons.copy()
 
+    @property
+    def current_scope(self) -> Optional[Scope]:
+        """ Returns the current scope if one is opened, :py:obj:`None` otherwise. """
+        return self._scope_var.get()
+
+    @contextmanager
+    def scope(self) -> Iterator[Scope]:
+        """
+        Context manager opening a new :py:class:`~.core.Scope`, in which
+        scoped dependencies are instantiated only once. All of them are
+        discarded when leaving it. Scopes are specific to each thread and
+        asyncio task (with contextvars), and can be nested.
+
+        Without any scope, scoped dependencies are instantiated at each
+        request.
+        """
+        scope = Scope()
+        token = self._scope_var.set(scope)
+        try:
+            yield scope
+        finally:
+            self._scope_var.reset(token)
+
+    def _share_scopes(self, container: 'DependencyContainer'):
+        """
+        Internal API
+
+        Uses the scopes of another container, so that a scope opened on either
+        of them applies to both. Used by :py:class:`~.core.ProxyContainer`.
+        """
+        self._scope_var = container._scope_var
+
+    def _instantiating(self) -> bool:
+        """
+        Internal API
+
+        Whether the current thread is instantiating a dependency with this
+        container, or the one overriding it. Used by
+        :py:meth:`~.providers.tag.TaggedDependencies.materialize` which must
+        not wait on other threads meanwhile.
+        """
+        return bool(self._instantiation_lock.stack._stack) \
+            or (self._override is not None and self._override._instantiating())
+
     def register_provider(self, provider: 'DependencyProvider'):
         """
         Registers a provider, which can then be used to instantiate dependencies.
@@ -82,20 +228,295 @@ class DependencyContainer:
                         bound_type, self._type_to_provider[bound_type]
                     ))
 
-        for bound_type in provider.bound_dependency_types:
-            self._type_to_provider[bound_type] = provider
+        with self.registering():
+            for bound_type in provider.bound_dependency_types:
+                self._type_to_provider[bound_type] = provider
+
+            self._providers.append(provider)
+
+        self._graph._add_provider(provider)
+
+    @contextmanager
+    def registering(self, *dependencies: Hashable):
+        """
+        Context manager which has to be used by providers when registering
+        new dependencies. Dependencies which could not be found previously are
+        looked for again afterwards.
+
+        Raises :py:exc:`~.exceptions.FrozenContainerError` if the container
+        is frozen.
+
+        Args:
+            *dependencies: Dependencies which are registered or whose
+                :py:class:`~.core.DependencyDescription` changes, to be
+                updated in the :py:attr:`~.graph`.
+        """
+        if self._frozen:
+            raise FrozenContainerError()
+
+        try:
+            yield
+        finally:
+            self._not_found = set()
+            self._dependency_to_provider = dict()
+            self._generation = next(_generations)
+            self._graph._update(dependencies)
+
+    def freeze(self):
+        """
+        Seals the container: no provider nor dependency can be registered
+        afterwards. The provider of every registered dependency is retrieved
+        once, and dependencies which are not singletons are instantiated
+        without any lock. Freezing it again does nothing.
+        """
+        if self._frozen:
+            return
+
+        with self.registering():
+            resolution_table = dict()  # type: Dict[Any, DependencyProvider]
+            for provider in self._providers:
+                for dependency in provider.dependencies():
+                    if type(dependency) not in self._type_to_provider:
+                        # Same priority as when scanning providers.
+                        resolution_table.setdefault(dependency, provider)
 
-        self._providers.append(provider)
+            self._resolution_table = resolution_table
+            self._frozen = True
+
+    def warmup(self, max_workers: int = None) -> Dict[Hashable, float]:
+        """
+        Instantiates eagerly all singletons registered in the providers and,
+        transitively, those they require. A dependency is only instantiated
+        once all of its dependencies are, so independent ones are instantiated
+        concurrently in a pool of threads.
+
+        Args:
+            max_workers: Maximum number of threads used. Defaults to the one
+                of :py:class:`~concurrent.futures.ThreadPoolExecutor`.
+
+        Returns:
+            Time, in seconds, taken to instantiate each singleton.
+        """
+        return warmup(self, max_workers)
+
+    @contextmanager
+    def override(self, container: 'DependencyContainer'
+                 ) -> Iterator['DependencyContainer']:
+        """
+        Context manager within which all dependencies are retrieved from the
+        given container instead, typically a :py:class:`~.core.ProxyContainer`
+        of this one for testing. Injected functions are overridden too. Both
+        installing and removing the override are done in constant time.
+
+        Args:
+            container: Container used instead of this one.
+        """
+        previous = self._override
+        self._override = container
+        self._generation = next(_generations)
+        try:
+            yield container
+        finally:
+            self._override = previous
+            self._generation = next(_generations)
+
+    @property
+    def listeners(self) -> Tuple[Any, ...]:
+        """ Returns all registered :py:class:`~.core.DependencyListener`. """
+        return self._listeners or ()
+
+    def add_listener(self, listener):
+        """
+        Registers a :py:class:`~.core.DependencyListener` which will be notified
+        of all dependencies retrieved synchronously afterwards.
+
+        Args:
+            listener: Listener to be registered.
+        """
+        self._listeners = self.listeners + (listener,)
+        self._generation = next(_generations)
+        # Retrieval is only instrumented when needed, by overriding the methods
+        # on the instance.
+        self.provide = self._listened_provide  # type: ignore
+        self.provide_many = self._listened_provide_many  # type: ignore
+
+    def remove_listener(self, listener):
+        """
+        Removes a :py:class:`~.core.DependencyListener` previously registered.
+
+        Args:
+            listener: Listener to be removed.
+        """
+        listeners = list(self.listeners)
+        listeners.remove(listener)
+        self._listeners = tuple(listeners) or None
+        self._generation = next(_generations)
+        if self._listeners is None:
+            del self.provide
+            del self.provide_many
+
+    def enable_stats(self, buckets: Sequence[float] = None):
+        """
+        Starts collecting statistics on the retrieval of dependencies,
+        returned by :py:meth:`~.stats`. They are gathered by a
+        :py:class:`~.core.DependencyListener`, so retrieval is slower.
+
+        Args:
+            buckets: Upper bounds, in seconds, of the buckets of the latency
+                histograms.
+        """
+        # Imported here as the module depends on this one.
+        from .stats import DEFAULT_BUCKETS, StatisticsListener
+
+        if self._stats is None:
+            self._stats = StatisticsListener(buckets or DEFAULT_BUCKETS)
+            self.add_listener(self._stats)
+
+    def disable_stats(self):
+        """
+        Stops collecting statistics, discarding those already collected.
+        """
+        if self._stats is not None:
+            self.remove_listener(self._stats)
+            self._stats = None
+
+    def stats(self):
+        """
+        Returns a :py:class:`~.core.stats.ResolutionStats` snapshot of the
+        statistics collected since :py:meth:`~.enable_stats`: singleton hits
+        and misses, builds of other dependencies, missing dependencies and
+        latency histograms.
+        """
+        if self._stats is None:
+            raise RuntimeError("Statistics are not collected, "
+                               "call enable_stats() first.")
+        return self._stats.snapshot()
+
+    def enable_tracing(self):
+        """
+        Starts recording the tree of nested retrievals of dependencies, with
+        their timestamps, thread and provider, returned by :py:meth:`~.trace`.
+        They are recorded by a :py:class:`~.core.DependencyListener`, so
+        retrieval is slower and memory grows with each retrieval until
+        :py:meth:`~.disable_tracing`.
+        """
+        # Imported here as the module depends on this one.
+        from .trace import TracingListener
+
+        if self._tracer is None:
+            self._tracer = TracingListener()
+            self.add_listener(self._tracer)
+
+    def disable_tracing(self):
+        """
+        Stops recording retrievals, discarding those already recorded.
+        """
+        if self._tracer is not None:
+            self.remove_listener(self._tracer)
+            self._tracer = None
+
+    def trace(self):
+        """
+        Returns a :py:class:`~.core.trace.ResolutionTrace` snapshot of the
+        retrievals recorded since :py:meth:`~.enable_tracing`, which can be
+        exported as a Chrome trace or a speedscope profile.
+        """
+        if self._tracer is None:
+            raise RuntimeError("Retrievals are not traced, "
+                               "call enable_tracing() first.")
+        return self._tracer.snapshot()
+
+    def enable_lock_metrics(self):
+        """
+        Starts measuring how long threads wait for and hold the instantiation
+        lock of each dependency, returned by :py:meth:`~.lock_contention`.
+        Only dependencies instantiated while a lock is required are measured,
+        hence not those retrieved from a frozen container which are not
+        singletons.
+        """
+        # Imported here as the module depends on this one.
+        from .contention import ContentionRecorder
+
+        if self._instantiation_lock.metrics is None:
+            self._instantiation_lock.metrics = ContentionRecorder()
+
+    def disable_lock_metrics(self):
+        """
+        Stops measuring the instantiation locks, discarding the measurements.
+        """
+        self._instantiation_lock.metrics = None
+
+    def lock_contention(self):
+        """
+        Returns a :py:class:`~.core.contention.LockContention` snapshot of the
+        measurements made since :py:meth:`~.enable_lock_metrics`: wait and
+        hold times per dependency and which dependencies waited for them.
+        """
+        metrics = self._instantiation_lock.metrics
+        if metrics is None:
+            raise RuntimeError("Locks are not measured, "
+                               "call enable_lock_metrics() first.")
+        return metrics.snapshot()
+
+    def _listened_provide(self, dependency: Hashable) -> Optional[DependencyInstance]:
+        for listener in self.listeners:
+            listener.before_provide(dependency)
+
+        singleton = self._singletons.get(dependency)
+        try:
+            dependency_instance = type(self).provide(self, dependency)
+        except Exception as e:
+            for listener in self.listeners:
+                listener.on_error(dependency, e)
+            raise
+
+        for listener in self.listeners:
+            if dependency_instance is None:
+                listener.on_not_found(dependency)
+            elif dependency_instance is singleton:
+                listener.on_singleton_hit(dependency, dependency_instance)
+            listener.after_provide(dependency, dependency_instance)
+
+        return dependency_instance
+
+    def _listened_provide_many(self, dependencies: Sequence[Hashable]
+                               ) -> List[Optional[DependencyInstance]]:
+        return [self.provide(dependency) for dependency in dependencies]
+
+    def _listened_instantiation(self, provider: 'DependencyProvider',
+                                dependency: Hashable) -> Optional[DependencyInstance]:
+        start = time.perf_counter()
+        dependency_instance = provider.provide(dependency)
+        duration = time.perf_counter() - start
+
+        if dependency_instance is not None:
+            for listener in self.listeners:
+                listener.on_instantiation(dependency, dependency_instance, provider,
+                                          duration)
+
+        return dependency_instance
+
+    def peek(self, dependency: Hashable) -> Optional[DependencyInstance]:
+        """
+        Returns the singleton of the dependency if it was already instantiated
+        or defined, :py:obj:`None` otherwise. Nothing is instantiated and
+        overrides are ignored.
+
+        Args:
+            dependency: Dependency to look for.
+        """
+        return self._singletons.get(dependency)
 
     def update_singletons(self, dependencies: Mapping):
         """
         Update the singletons.
         """
-        with self._instantiation_lock:
-            self._singletons.update({
-                k: DependencyInstance(v, singleton=True)
-                for k, v in dependencies.items()
-            })
+        self._singletons.update({
+            k: DependencyInstance(v, singleton=True)
+            for k, v in dependencies.items()
+        })
+        self._not_found = set()
+        self._generation = next(_generations)
 
     def get(self, dependency: Hashable):
         """
@@ -111,6 +532,45 @@ class DependencyContainer:
         """
         return self.safe_provide(dependency).instance
 
+    async def aget(self, dependency: Hashable):
+        """
+        Asynchronous counterpart of
+        :py:meth:`~.core.core.DependencyContainer.get`, which also supports
+        dependencies built by coroutines.
+
+        Args:
+            dependency: Passed on to the registered providers.
+
+        Returns:
+            instance for the given dependency
+        """
+        dependency_instance = await self.aprovide(dependency)
+        if dependency_instance is None:
+            raise DependencyNotFoundError(dependency)
+        return dependency_instance.instance
+
+    def get_many(self, dependencies: Sequence[Hashable]) -> List[Any]:
+        """
+        Returns the instances of all the given dependencies, in the same order.
+        If one of them cannot be found,
+        :py:exc:`~.exceptions.DependencyNotFoundError` is raised.
+
+        Args:
+            dependencies: Sequence of dependencies passed on to the registered
+                providers.
+
+        Returns:
+            list of instances for the given dependencies
+        """
+        instances = []
+        for dependency, dependency_instance in zip(dependencies,
+                                                   self.provide_many(dependencies)):
+            if dependency_instance is None:
+                raise DependencyNotFoundError(dependency)
+            instances.append(dependency_instance.instance)
+
+        return instances
+
     def safe_provide(self, dependency: Hashable) -> DependencyInstance:
         dependency_instance = self.provide(dependency)
         if dependency_instance is None:
@@ -125,35 +585,103 @@ class DependencyContainer:
         instantiated.
 
         Used by the injection wrappers.
+
+        Only threads requesting the same dependency wait on each other, others
+        are instantiated in parallel. Dependencies which cannot be provided are
+        remembered until a new one is registered, as are the providers of
+        those which are not singletons. Scoped dependencies are stored in
+        the current scope.
         """
+        if self._override is not None:
+            return self._override.provide(dependency)
+
         try:
             return self._singletons[dependency]
         except KeyError:
             pass
 
+        scope = self._scope_var.get()
+        if scope is not None:
+            try:
+                return scope._instances[dependency]
+            except KeyError:
+                pass
+
+        # Retrieved before any provider is called, so a miss or a provider is
+        # never remembered once a registration happened meanwhile.
+        not_found = self._not_found
+        if dependency in not_found:
+            return None
+        dependency_to_provider = self._dependency_to_provider
+
         try:
-            # @formatter:off
-            with self._instantiation_lock, \
-                    self._dependency_stack.instantiating(dependency):
-                # @formatter:on
+            if self._frozen:
+                # Registrations cannot change anymore, so dependencies known
+                # not to be singletons do not need to be instantiated under a
+                # lock. Only cycles have to be checked.
+                provider = dependency_to_provider.get(dependency)
+                if provider is not None:
+                    with self._instantiation_lock.stack.instantiating(dependency):
+                        if self._listeners is None:
+                            dependency_instance = provider.provide(dependency)
+                        else:
+                            dependency_instance = self._listened_instantiation(
+                                provider, dependency)
+                    if dependency_instance is not None \
+                            and dependency_instance.scoped and scope is not None:
+                        return scope._instances.setdefault(dependency,
+                                                           dependency_instance)
+                    return dependency_instance
+
+            with self._instantiation_lock.instantiating(dependency):
                 try:
                     return self._singletons[dependency]
                 except KeyError:
                     pass
 
                 dependency_instance = None
+                listened = self._listeners is not None
                 provider = self._type_to_provider.get(type(dependency))
                 if provider is not None:
-                    dependency_instance = provider.provide(dependency)
-                else:
-                    for provider in self._providers:
+                    if listened:
+                        dependency_instance = self._listened_instantiation(
+                            provider, dependency)
+                    else:
                         dependency_instance = provider.provide(dependency)
-                        if dependency_instance is not None:
-                            break
+                else:
+                    provider = dependency_to_provider.get(dependency)
+                    if provider is None:
+                        provider = self._resolution_table.get(dependency)
+                    if provider is not None:
+                        if listened:
+                            dependency_instance = self._listened_instantiation(
+                                provider, dependency)
+                        else:
+                            dependency_instance = provider.provide(dependency)
+
+                    if dependency_instance is None:
+                        self._provider_scans += 1
+                        for provider in self._providers:
+                            if listened:
+                                dependency_instance = self._listened_instantiation(
+                                    provider, dependency)
+                            else:
+                                dependency_instance = provider.provide(dependency)
+                            if dependency_instance is not None:
+                                break
+
+                    # Singletons are not looked for again.
+                    if dependency_instance is not None \
+                            and not dependency_instance.singleton:
+                        dependency_to_provider[dependency] = cast(DependencyProvider,
+                                                                  provider)
 
                 if dependency_instance is not None:
                     if dependency_instance.singleton:
                         self._singletons[dependency] = dependency_instance
+                    elif dependency_instance.scoped and scope is not None:
+                        dependency_instance = scope._instances.setdefault(
+                            dependency, dependency_instance)
 
                     return dependency_instance
 
@@ -163,8 +691,222 @@ class DependencyContainer:
         except Exception as e:
             raise DependencyInstantiationError(dependency) from e
 
+        not_found.add(dependency)
         return None
 
+    async def aprovide(self, dependency: Hashable) -> Optional[DependencyInstance]:
+        """
+        Internal method which should not be directly called. Prefer
+        :py:meth:`~.core.core.DependencyContainer.aget`.
+        Asynchronous counterpart of
+        :py:meth:`~.core.core.DependencyContainer.provide` relying on
+        :py:meth:`~.core.DependencyProvider.aprovide`. It has to be
+        overridden alongside it in a subclass.
+
+        Coroutines concurrently requesting the same singleton, or the same
+        scoped dependency within a scope, share a single instantiation which
+        is not cancelled with them. Other dependencies are instantiated for
+        each of them. The event loop never waits on the instantiation lock
+        used by threads.
+        """
+        if self._override is not None:
+            return await self._override.aprovide(dependency)
+
+        try:
+            return self._singletons[dependency]
+        except KeyError:
+            pass
+
+        scope = self._scope_var.get()
+        if scope is not None:
+            try:
+                return scope._instances[dependency]
+            except KeyError:
+                pass
+
+        not_found = self._not_found
+        if dependency in not_found:
+            return None
+
+        stack = _async_stack.get()
+        if (self, dependency) in stack:
+            raise DependencyCycleError([d for c, d in stack if c is self]
+                                       + [dependency])
+
+        if dependency in self._dependency_to_provider:
+            # Known not to be a singleton, nothing to share.
+            return await self._aunshared_instantiate(dependency, stack, scope,
+                                                     not_found)
+
+        loop = _get_running_loop()
+        # Scoped dependencies are only shared within the same scope.
+        key = (loop, dependency, scope)
+        task = self._async_instantiations.get(key)
+        if task is None:
+            task = loop.create_task(self._ashared_instantiate(key, stack,
+                                                              not_found))
+            self._async_instantiations[key] = task
+            # The instantiation runs in its own task, shielded so that a
+            # cancelled coroutine does not cancel it for the others awaiting it.
+            return await asyncio.shield(task)
+
+        dependency_instance = await asyncio.shield(task)
+        if dependency_instance is not None \
+                and not dependency_instance.singleton \
+                and not (dependency_instance.scoped and scope is not None):
+            # Not shared, so it is instantiated again for this coroutine.
+            return await self._aunshared_instantiate(dependency, stack, scope,
+                                                     not_found)
+        return dependency_instance
+
+    async def _ashared_instantiate(self, key: Tuple[Any, Hashable, Optional[Scope]],
+                                   stack: Tuple[Tuple[Any, Any], ...],
+                                   not_found: Set) -> Optional[DependencyInstance]:
+        """
+        Instantiates the dependency in a task shared by all the coroutines
+        requesting it.
+        """
+        # The task has its own copy of the context.
+        _async_stack.set(stack + ((self, key[1]),))
+        try:
+            return await self._ainstantiate(key[1], key[2], not_found)
+        finally:
+            del self._async_instantiations[key]
+
+    async def _aunshared_instantiate(self, dependency: Hashable,
+                                     stack: Tuple[Tuple[Any, Any], ...],
+                                     scope: Optional[Scope],
+                                     not_found: Set
+                                     ) -> Optional[DependencyInstance]:
+        """
+        Instantiates the dependency in the current task, for the coroutine
+        requesting it only.
+        """
+        token = _async_stack.set(stack + ((self, dependency),))
+        try:
+            return await self._ainstantiate(dependency, scope, not_found)
+        finally:
+            _async_stack.reset(token)
+
+    async def _ainstantiate(self, dependency: Hashable, scope: Optional[Scope],
+                            not_found: Set) -> Optional[DependencyInstance]:
+        """
+        Finds the provider of the dependency the same way as
+        :py:meth:`~.core.core.DependencyContainer.provide`, but without any
+        lock.
+        """
+        dependency_to_provider = self._dependency_to_provider
+        try:
+            dependency_instance = None
+            provider = self._type_to_provider.get(type(dependency))
+            if provider is not None:
+                dependency_instance = await provider.aprovide(dependency)
+            else:
+                provider = dependency_to_provider.get(dependency)
+                if provider is None:
+                    provider = self._resolution_table.get(dependency)
+                if provider is not None:
+                    dependency_instance = await provider.aprovide(dependency)
+
+                if dependency_instance is None:
+                    self._provider_scans += 1
+                    for provider in self._providers:
+                        dependency_instance = await provider.aprovide(dependency)
+                        if dependency_instance is not None:
+                            break
+
+                if dependency_instance is not None \
+                        and not dependency_instance.singleton:
+                    dependency_to_provider[dependency] = cast(DependencyProvider,
+                                                              provider)
+
+        except DependencyCycleError:
+            raise
+
+        except Exception as e:
+            raise DependencyInstantiationError(dependency) from e
+
+        if dependency_instance is None:
+            not_found.add(dependency)
+        elif dependency_instance.singleton:
+            # A thread may have instantiated it meanwhile.
+            dependency_instance = self._singletons.setdefault(dependency,
+                                                              dependency_instance)
+        elif dependency_instance.scoped and scope is not None:
+            dependency_instance = scope._instances.setdefault(dependency,
+                                                              dependency_instance)
+
+        return dependency_instance
+
+    async def aprovide_many(self, dependencies: Sequence[Hashable]
+                            ) -> List[Optional[DependencyInstance]]:
+        """
+        Internal method which should not be directly called.
+        Asynchronous counterpart of
+        :py:meth:`~.core.core.DependencyContainer.provide_many`. It has to be
+        overridden alongside :py:meth:`~.core.core.DependencyContainer.aprovide`
+        in a subclass.
+
+        Used by the injection wrappers of coroutine functions. Singletons are
+        retrieved directly, all the others are instantiated concurrently.
+        """
+        if self._override is not None:
+            return await self._override.aprovide_many(dependencies)
+
+        singletons = self._singletons
+        results = []  # type: List[Optional[DependencyInstance]]
+        pending = []  # type: List[int]
+        for i, dependency in enumerate(dependencies):
+            try:
+                results.append(singletons[dependency])
+            except KeyError:
+                results.append(None)
+                pending.append(i)
+
+        if len(pending) == 1:
+            results[pending[0]] = await self.aprovide(dependencies[pending[0]])
+        elif pending:
+            dependency_instances = await asyncio.gather(*[
+                self.aprovide(dependencies[i])
+                for i in pending
+            ])
+            for i, dependency_instance in zip(pending, dependency_instances):
+                results[i] = dependency_instance
+
+        return results
+
+    def provide_many(self, dependencies: Sequence[Hashable]
+                     ) -> List[Optional[DependencyInstance]]:
+        """
+        Internal method which should not be directly called. Prefer
+        :py:meth:`~.core.core.DependencyContainer.get_many`.
+        Behaves like :py:meth:`~.core.core.DependencyContainer.provide` for
+        each dependency, results being returned in the same order. It has to
+        be overridden alongside it in a subclass.
+
+        Used by the injection wrappers when several arguments are missing.
+
+        Singletons and dependencies known to be missing are retrieved without
+        any lock, only the others go through
+        :py:meth:`~.core.core.DependencyContainer.provide`.
+        """
+        if self._override is not None:
+            return self._override.provide_many(dependencies)
+
+        singletons = self._singletons
+        not_found = self._not_found
+        results = []  # type: List[Optional[DependencyInstance]]
+        for dependency in dependencies:
+            try:
+                results.append(singletons[dependency])
+            except KeyError:
+                if dependency in not_found:
+                    results.append(None)
+                else:
+                    results.append(self.provide(dependency))
+
+        return results
+
 
 class DependencyProvider:
     """
@@ -177,6 +919,10 @@ class DependencyProvider:
 
     This should be used whenever one needs to introduce a new kind of dependency,
     or control how certain dependencies are instantiated.
+
+    Dependencies which could not be provided are remembered by the
+    :py:class:`~.core.DependencyContainer`, so new registrations must be done
+    within :py:meth:`~.core.DependencyContainer.registering`.
     """
     bound_dependency_types = cast(Tuple[type], ())  # type: Tuple[type, ...]
 
@@ -201,3 +947,46 @@ class DependencyProvider:
             if available or :py:obj:`None`.
         """
         raise NotImplementedError()  # pragma: no cover
+
+    async def aprovide(self, dependency: Hashable) -> Optional[DependencyInstance]:
+        """
+        Asynchronous counterpart of
+        :py:meth:`~.core.DependencyProvider.provide` used by
+        :py:meth:`~.core.DependencyContainer.aprovide`. Providers supporting
+        dependencies built by coroutines must override it, by default
+        :py:meth:`~.core.DependencyProvider.provide` is used.
+
+        Args:
+            dependency: The dependency to be provided by the provider.
+
+        Returns:
+            The requested instance wrapped in a :py:class:`~.core.Instance`
+            if available or :py:obj:`None`.
+        """
+        return self.provide(dependency)
+
+    def dependencies(self) -> Iterable[Hashable]:
+        """
+        Used by the :py:class:`~.core.DependencyContainer` to know all the
+        dependencies which were explicitly registered, when frozen. Those which
+        are bound by their type do not need to be returned.
+
+        Returns:
+            All dependencies registered in the provider.
+        """
+        return ()
+
+    def describe(self, dependency: Hashable) -> Optional[DependencyDescription]:
+        """
+        Used to build the graph of dependencies, for example by
+        :py:meth:`~.core.DependencyContainer.warmup`, without instantiating
+        anything.
+
+        Args:
+            dependency: The dependency to be described.
+
+        Returns:
+            A :py:class:`~.core.DependencyDescription` if the dependency can be
+            provided, :py:obj:`None` otherwise.
+        """
+        return None
@@ -0,0 +1,142 @@
+import threading
+from typing import Dict, Hashable, List, Optional
+
+from .._internal.utils import dependency_label, SlotsReprMixin
+
+
+class DependencyContention(SlotsReprMixin):
+    """
+    Contention on the instantiation lock of a single dependency. Times are in
+    seconds.
+
+    Attributes:
+        acquisitions: Number of times the lock was held.
+        hold_time: Total time the lock was held, mostly spent instantiating.
+        max_hold_time: Longest time the lock was held.
+        contended_hold_time: Time the lock was held while other threads
+            waited for it.
+        waits: Number of times a thread had to wait for the lock.
+        wait_time: Total time threads spent waiting for the lock.
+        max_wait_time: Longest time a thread waited for the lock.
+        waiters: Total wait time per dependency being instantiated by the
+            waiting threads, :py:obj:`None` for those retrieving it directly.
+    """
+    __slots__ = ('acquisitions', 'hold_time', 'max_hold_time', 'contended_hold_time',
+                 'waits', 'wait_time', 'max_wait_time', 'waiters')
+
+    def __init__(self):
+        self.acquisitions = 0
+        self.hold_time = 0.
+        self.max_hold_time = 0.
+        self.contended_hold_time = 0.
+        self.waits = 0
+        self.wait_time = 0.
+        self.max_wait_time = 0.
+        self.waiters = dict()  # type: Dict[Optional[Hashable], float]
+
+    def copy(self) -> 'DependencyContention':
+        contention = DependencyContention()
+        for name in self.__slots__:
+            setattr(contention, name, getattr(self, name))
+        contention.waiters = dict(self.waiters)
+        return contention
+
+
+class LockContention:
+    """
+    Snapshot of the contention on the instantiation locks of a
+    :py:class:`~.core.DependencyContainer`, returned by
+    :py:meth:`~.core.DependencyContainer.lock_contention`.
+
+    Attributes:
+        dependencies: :py:class:`~.DependencyContention` per dependency.
+    """
+
+    def __init__(self, dependencies: Dict[Hashable, DependencyContention]):
+        self.dependencies = dependencies
+
+    def __repr__(self):
+        return "{}(waits={!r}, wait_time={!r})".format(
+            type(self).__name__,
+            sum(c.waits for c in self.dependencies.values()),
+            sum(c.wait_time for c in self.dependencies.values())
+        )
+
+    def worst(self, n: int = 10) -> List[Hashable]:
+        """
+        Returns the dependencies which made threads wait the longest, worst
+        first. Those never waited for are ignored.
+
+        Args:
+            n: Maximum number of dependencies to return.
+        """
+        contended = [(c.wait_time, i, d)
+                     for i, (d, c) in enumerate(self.dependencies.items())
+                     if c.waits]
+        contended.sort(key=lambda x: (-x[0], x[1]))
+        return [d for _, _, d in contended[:n]]
+
+    def summary(self, n: int = 10) -> str:
+        """
+        Returns a readable table of the :py:meth:`~.worst` offenders, with the
+        dependencies whose instantiation waited the most for them.
+
+        Args:
+            n: Maximum number of dependencies to show.
+        """
+        lines = ['{:>10} {:>6} {:>10} {:>10} {:>10}  {}'.format(
+            'wait (ms)', 'waits', 'max (ms)', 'hold (ms)', 'held', 'dependency')]
+        for dependency in self.worst(n):
+            c = self.dependencies[dependency]
+            lines.append('{:10.3f} {:6} {:10.3f} {:10.3f} {:10}  {}'.format(
+                c.wait_time * 1e3, c.waits, c.max_wait_time * 1e3,
+                c.hold_time * 1e3, c.acquisitions, dependency_label(dependency)))
+            waiters = sorted(c.waiters.items(), key=lambda x: -x[1])
+            for waiter, wait_time in waiters[:3]:
+                lines.append('{:10.3f} {:>6} {:>10} {:>10} {:>10}    <- {}'.format(
+                    wait_time * 1e3, '', '', '', '',
+                    dependency_label(waiter) if waiter is not None else '(direct)'))
+        return '\n'.join(lines) + '\n'
+
+
+class ContentionRecorder:
+    """
+    Internal API
+
+    Set as the metrics of the instantiation lock by
+    :py:meth:`~.core.DependencyContainer.enable_lock_metrics`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._dependencies = dict()  # type: Dict[Hashable, DependencyContention]
+
+    def _contention(self, dependency: Hashable) -> DependencyContention:
+        try:
+            return self._dependencies[dependency]
+        except KeyError:
+            contention = self._dependencies[dependency] = DependencyContention()
+            return contention
+
+    def record_wait(self, dependency: Hashable, waiter: Optional[Hashable],
+                    duration: float):
+        with self._lock:
+            c = self._contention(dependency)
+            c.waits += 1
+            c.wait_time += duration
+            c.max_wait_time = max(c.max_wait_time, duration)
+            c.waiters[waiter] = c.waiters.get(waiter, 0.) + duration
+
+    def record_hold(self, dependency: Hashable, duration: float, waiters: int):
+        with self._lock:
+            c = self._contention(dependency)
+            c.acquisitions += 1
+            c.hold_time += duration
+            c.max_hold_time = max(c.max_hold_time, duration)
+            if waiters:
+                c.contended_hold_time += duration
+
+    def snapshot(self) -> LockContention:
+        with self._lock:
+            return LockContention({d: c.copy()
+                                   for d, c in self._dependencies.items()})
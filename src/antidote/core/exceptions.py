@@ -71,3 +71,13 @@ class DependencyNotFoundError(AntidoteError):
 
     def __str__(self):
         return repr(self.missing_dependency)
+
+
+class FrozenContainerError(AntidoteError):
+    """
+    A dependency or a provider was registered in a frozen container.
+    Raised by the core.
+    """
+
+    def __str__(self):
+        return "The container is frozen, nothing can be registered anymore."
@@ -0,0 +1,347 @@
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from .._internal.utils import dependency_label, SlotsReprMixin
+
+
+class DependencyDescription(SlotsReprMixin):
+    """
+    Static description of a dependency, as known by its
+    :py:class:`~.core.DependencyProvider` before any instantiation: whether
+    it is a singleton and which dependencies are required to build it.
+    """
+    __slots__ = ('singleton', 'dependencies')
+
+    def __init__(self, singleton: Optional[bool],
+                 dependencies: Iterable[Hashable] = ()):
+        """
+        Args:
+            singleton: Whether the dependency is a singleton. :py:obj:`None`
+                if it is one only when all of its dependencies are, like a
+                link to another dependency.
+            dependencies: Dependencies required to build it.
+        """
+        self.singleton = singleton
+        self.dependencies = tuple(dependencies)
+
+
+class DependencyGraph:
+    """
+    Static graph of the dependencies known by a
+    :py:class:`~.core.DependencyContainer`: those registered in its providers
+    and, transitively, all of those they require. It is built from the
+    :py:class:`~.core.DependencyDescription` returned by
+    :py:meth:`~.core.DependencyProvider.describe`, so nothing is ever
+    instantiated.
+
+    It is updated incrementally: only dependencies (re-)registered since the
+    last query are described again.
+
+    .. doctest::
+
+        >>> from antidote import register, world
+        >>> @register
+        ... class Database:
+        ...     pass
+        >>> @register
+        ... class Repository:
+        ...     def __init__(self, db: Database):
+        ...         self.db = db
+        >>> Database in world.graph.dependencies(Repository)
+        True
+        >>> Repository in world.graph.dependents(Database)
+        True
+
+    """
+
+    def __init__(self, container):
+        self._container = container
+        self._lock = threading.RLock()
+        self._pending = []  # type: List[Hashable]
+        # Providers added since the last query, whose dependencies are only
+        # enumerated then.
+        self._pending_providers = []  # type: List[Any]
+        self._rescan_unknown = False
+        self._nodes = dict()  # type: Dict[Hashable, Optional[DependencyDescription]]
+        self._providers = dict()  # type: Dict[Hashable, Any]
+        self._dependents = dict()  # type: Dict[Hashable, Dict[Hashable, None]]
+
+    def __repr__(self):
+        return "{}(nodes={!r})".format(type(self).__name__, len(self))
+
+    def __len__(self):
+        with self._lock:
+            self._refresh()
+            return len(self._nodes)
+
+    def __iter__(self):
+        with self._lock:
+            self._refresh()
+            return iter(list(self._nodes.keys()))
+
+    def __contains__(self, dependency):
+        with self._lock:
+            self._refresh()
+            return dependency in self._nodes
+
+    def describe(self, dependency: Hashable) -> Optional[DependencyDescription]:
+        """
+        Returns the :py:class:`~.core.DependencyDescription` of the dependency,
+        or :py:obj:`None` if unknown or if no provider can describe it, like
+        singletons defined directly in the container.
+        """
+        with self._lock:
+            self._refresh()
+            return self._nodes.get(dependency)
+
+    def provider(self, dependency: Hashable):
+        """
+        Returns the :py:class:`~.core.DependencyProvider` describing the
+        dependency, or :py:obj:`None`.
+        """
+        with self._lock:
+            self._refresh()
+            return self._providers.get(dependency)
+
+    def dependencies(self, dependency: Hashable) -> Tuple[Hashable, ...]:
+        """
+        Returns the dependencies directly required by the dependency.
+        """
+        description = self.describe(dependency)
+        return description.dependencies if description is not None else ()
+
+    def dependents(self, dependency: Hashable) -> Tuple[Hashable, ...]:
+        """
+        Returns the dependencies which directly require the dependency.
+        """
+        with self._lock:
+            self._refresh()
+            return tuple(self._dependents.get(dependency, ()))
+
+    def subtree(self, dependency: Hashable) -> Set[Hashable]:
+        """
+        Returns the dependency and all of those it requires transitively,
+        typically to find what its instantiation costs.
+        """
+        with self._lock:
+            self._refresh()
+            subtree = set()  # type: Set[Hashable]
+            pending = [dependency]
+            while pending:
+                d = pending.pop()
+                if d not in subtree:
+                    subtree.add(d)
+                    description = self._nodes.get(d)
+                    if description is not None:
+                        pending.extend(description.dependencies)
+            return subtree
+
+    def to_dict(self) -> Dict[str, list]:
+        """
+        Returns the graph as nodes and edges made of builtin types only,
+        identifying nodes by their index. Each node has a label, the name of
+        its provider and whether it is a singleton.
+        """
+        with self._lock:
+            self._refresh()
+            ids = {d: i for i, d in enumerate(self._nodes)}
+            nodes = []  # type: List[Dict[str, Any]]
+            edges = []  # type: List[Dict[str, int]]
+            for dependency, description in self._nodes.items():
+                provider = self._providers.get(dependency)
+                nodes.append({
+                    'id': ids[dependency],
+                    'label': dependency_label(dependency),
+                    'provider': type(provider).__name__ if provider else None,
+                    'singleton': description.singleton if description else None
+                })
+                if description is not None:
+                    edges.extend({'source': ids[dependency], 'target': ids[d]}
+                                 for d in description.dependencies)
+            return {'nodes': nodes, 'edges': edges}
+
+    def to_json(self, **kwargs) -> str:
+        """
+        Returns :py:meth:`~.to_dict` serialized as JSON.
+
+        Args:
+            **kwargs: Passed on to :py:func:`json.dumps`.
+        """
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_dot(self) -> str:
+        """
+        Returns the graph in the Graphviz DOT language. Dependencies which are
+        not singletons are dashed, those which could not be described are
+        plain text.
+        """
+        graph = self.to_dict()
+        lines = ['digraph antidote {']
+        for node in graph['nodes']:
+            if node['provider'] is None:
+                style = 'shape=plaintext'
+            elif node['singleton'] is False:
+                style = 'shape=box, style=dashed'
+            else:
+                style = 'shape=box'
+            label = node['label'].replace('\\', '\\\\').replace('"', '\\"')
+            lines.append('    {} [label="{}", {}];'.format(node['id'], label, style))
+        for edge in graph['edges']:
+            lines.append('    {} -> {};'.format(edge['source'], edge['target']))
+        lines.append('}')
+        return '\n'.join(lines) + '\n'
+
+    def _update(self, dependencies: Iterable[Hashable]):
+        """
+        Used by the container to mark (re-)registered dependencies. They are
+        only described at the next query.
+        """
+        with self._lock:
+            self._pending.extend(dependencies)
+
+    def _add_provider(self, provider):
+        """
+        Used by the container when a provider is added. Its dependencies are
+        only enumerated at the next query, and all dependencies which could
+        not be described are retried then.
+        """
+        with self._lock:
+            self._pending_providers.append(provider)
+            self._rescan_unknown = True
+
+    def _refresh(self):
+        if not self._pending and not self._rescan_unknown:
+            return
+
+        pending = self._pending
+        for provider in self._pending_providers:
+            pending.extend(provider.dependencies())
+        if self._rescan_unknown:
+            pending.extend(d for d, desc in self._nodes.items() if desc is None)
+        self._pending = []
+        self._pending_providers = []
+        self._rescan_unknown = False
+        providers = list(self._container.providers.values())
+        done = set()  # type: Set[Hashable]
+
+        while pending:
+            dependency = pending.pop()
+            if dependency in done:
+                continue
+            done.add(dependency)
+
+            previous = self._nodes.get(dependency)
+            if previous is not None:
+                for d in previous.dependencies:
+                    self._dependents[d].pop(dependency, None)
+
+            description = None
+            for provider in providers:
+                description = provider.describe(dependency)
+                if description is not None:
+                    self._providers[dependency] = provider
+                    break
+            else:
+                self._providers.pop(dependency, None)
+
+            self._nodes[dependency] = description
+            if description is not None:
+                for d in description.dependencies:
+                    self._dependents.setdefault(d, dict())[dependency] = None
+                    if d not in self._nodes:
+                        pending.append(d)
+
+
+def warmup(container, max_workers: int = None) -> Dict[Hashable, float]:
+    """
+    Internal API
+
+    Instantiates all the singletons of the graph of the container in a thread
+    pool.
+    A dependency is submitted only once all of those it requires are done, so
+    independent branches of the graph are instantiated concurrently. Those
+    left in a cycle are instantiated sequentially at the end, leaving the
+    detection of actual cycles to the container.
+
+    Returns:
+        Time, in seconds, taken to instantiate each singleton.
+    """
+    graph = container.graph  # type: DependencyGraph
+    descriptions = {dependency: graph.describe(dependency) for dependency in graph}
+    singletons = dict()  # type: Dict[Hashable, bool]
+
+    def is_singleton(dependency, visiting=frozenset()):
+        try:
+            return singletons[dependency]
+        except KeyError:
+            pass
+
+        description = descriptions.get(dependency)
+        if container.peek(dependency) is not None:
+            result = True
+        elif description is None or dependency in visiting:
+            result = False
+        elif description.singleton is None:
+            visiting = visiting | {dependency}
+            result = all(is_singleton(d, visiting)
+                         for d in description.dependencies)
+        else:
+            result = description.singleton
+        singletons[dependency] = result
+        return result
+
+    def instantiate(dependency):
+        if not is_singleton(dependency) or container.peek(dependency) is not None:
+            return None
+        start = time.perf_counter()
+        container.get(dependency)
+        return time.perf_counter() - start
+
+    requirements = dict()  # type: Dict[Hashable, Set[Hashable]]
+    dependents = dict()  # type: Dict[Hashable, List[Hashable]]
+    for dependency, description in descriptions.items():
+        if description is None:
+            continue
+        requirements[dependency] = {
+            d
+            for d in description.dependencies
+            if descriptions.get(d) is not None and d != dependency
+        }
+        for d in requirements[dependency]:
+            dependents.setdefault(d, []).append(dependency)
+
+    # Computed beforehand, as the dictionary is not thread-safe.
+    for dependency in requirements:
+        is_singleton(dependency)
+
+    timings = dict()  # type: Dict[Hashable, float]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(instantiate, dependency): dependency
+            for dependency, required in requirements.items()
+            if not required
+        }
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                dependency = futures.pop(future)
+                del requirements[dependency]
+                duration = future.result()
+                if duration is not None:
+                    timings[dependency] = duration
+
+                for dependent in dependents.get(dependency, ()):
+                    required = requirements[dependent]
+                    required.discard(dependency)
+                    if not required:
+                        futures[executor.submit(instantiate, dependent)] = dependent
+
+    for dependency in requirements:
+        duration = instantiate(dependency)
+        if duration is not None:
+            timings[dependency] = duration
+
+    return timings
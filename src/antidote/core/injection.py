@@ -18,6 +18,10 @@ DEPENDENCIES_TYPE = Union[
     str  # str.format(arg_name=arg_name) -> dependency
 ]
 
+# Set by antidote.aot, either to record the injections while compiling them
+# ahead of time or to provide those which were.
+_aot = None
+
 
 @overload
 def inject(func: F,  # noqa: E704
@@ -26,7 +30,8 @@ def inject(func: F,  # noqa: E704
            dependencies: DEPENDENCIES_TYPE = None,
            use_names: Union[bool, Iterable[str]] = None,
            use_type_hints: Union[bool, Iterable[str]] = None,
-           container: DependencyContainer = None
+           container: DependencyContainer = None,
+           lazy: bool = None
            ) -> F: ...
 
 
@@ -36,7 +41,8 @@ def inject(*,  # noqa: E704
            dependencies: DEPENDENCIES_TYPE = None,
            use_names: Union[bool, Iterable[str]] = None,
            use_type_hints: Union[bool, Iterable[str]] = None,
-           container: DependencyContainer = None
+           container: DependencyContainer = None,
+           lazy: bool = None
            ) -> Callable[[F], F]: ...
 
 
@@ -46,7 +52,8 @@ def inject(func=None,
            dependencies: DEPENDENCIES_TYPE = None,
            use_names: Union[bool, Iterable[str]] = None,
            use_type_hints: Union[bool, Iterable[str]] = None,
-           container: DependencyContainer = None
+           container: DependencyContainer = None,
+           lazy: bool = None
            ):
     """
     Inject the dependencies into the function lazily, they are only retrieved
@@ -79,6 +86,10 @@ def inject(func=None,
         container: :py:class:`~.core.container.DependencyContainer` from which
             the dependencies should be retrieved. Defaults to the global
             core if it is defined.
+        lazy: Whether the signature and the type hints should only be
+            analyzed on the first call, speeding up imports. The function is
+            then always wrapped and invalid arguments are only reported at
+            that time. Defaults to :code:`False`.
 
     Returns:
         The decorator to be applied or the injected function if the
@@ -93,6 +104,23 @@ def inject(func=None,
         if isinstance(wrapped, InjectedWrapper):
             return wrapped
 
+        injected = _compiled_injected_wrapper(wrapped, container, lazy)
+        if injected is not None:
+            return injected
+
+        if lazy:
+            return _lazy_injected_wrapper(
+                wrapped,
+                lambda arguments: _build_injection_blueprint(
+                    arguments=arguments,
+                    dependencies=dependencies,
+                    use_names=use_names,
+                    use_type_hints=use_type_hints
+                ),
+                container=container,
+                arguments=arguments
+            )
+
         if arguments is None:
             arguments = Arguments.from_method(wrapped)
 
@@ -102,6 +130,8 @@ def inject(func=None,
             use_names=use_names,
             use_type_hints=use_type_hints
         )
+        if _aot is not None:
+            _aot.record(wrapped, lambda: blueprint.injections)
 
         # If nothing can be injected, just return the existing function without
         # any overhead.
@@ -115,6 +145,45 @@ def inject(func=None,
     return func and _inject(func) or _inject
 
 
+def _compiled_injected_wrapper(wrapped,
+                               container: DependencyContainer = None,
+                               lazy: bool = None):
+    """
+    Returns the function wrapped with the injections compiled ahead of time by
+    antidote.aot, if any. None otherwise.
+
+    Used by inject() and wire()
+    """
+    if _aot is None or isinstance(wrapped, InjectedWrapper):
+        return None
+    return _aot.wrap(wrapped, container, lazy)
+
+
+def _lazy_injected_wrapper(wrapped,
+                           build: Callable[[Arguments], InjectionBlueprint],
+                           container: DependencyContainer = None,
+                           arguments: Arguments = None):
+    """
+    Wraps the function with an InjectedWrapper whose InjectionBlueprint is
+    only built on first use, with its arguments retrieved then if not given.
+
+    Used by inject() and wire()
+    """
+    if isinstance(wrapped, InjectedWrapper):
+        return wrapped
+
+    def build_injections():
+        return build(arguments if arguments is not None
+                     else Arguments.from_method(wrapped)).injections
+
+    if _aot is not None:
+        _aot.record(wrapped, build_injections)
+
+    return InjectedWrapper(container=container or get_default_container(),
+                           blueprint=InjectionBlueprint(build=build_injections),
+                           wrapped=wrapped)
+
+
 def _build_injection_blueprint(arguments: Arguments,
                                dependencies: DEPENDENCIES_TYPE = None,
                                use_names: Union[bool, Iterable[str]] = None,
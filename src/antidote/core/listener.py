@@ -0,0 +1,58 @@
+from typing import Hashable, Optional
+
+from .container import DependencyInstance, DependencyProvider
+
+
+class DependencyListener:
+    """
+    Base class of the listeners observing how a
+    :py:class:`~.core.DependencyContainer` retrieves dependencies. They are
+    registered with :py:meth:`~.core.DependencyContainer.add_listener`.
+
+    All methods do nothing by default, subclasses only need to override those
+    they are interested in. Listeners are called synchronously by the thread
+    retrieving the dependency, so they must be thread-safe and fast. Only the
+    synchronous retrieval of dependencies is observed.
+
+    Without any listener, the container does not pay for this feature.
+    """
+
+    def before_provide(self, dependency: Hashable):
+        """
+        Called before a dependency is retrieved.
+        """
+
+    def after_provide(self, dependency: Hashable,
+                      dependency_instance: Optional[DependencyInstance]):
+        """
+        Called once a dependency has been retrieved, with :py:obj:`None` if
+        it could not be found. Not called when an exception is raised,
+        :py:meth:`~.on_error` is instead.
+        """
+
+    def on_error(self, dependency: Hashable, error: Exception):
+        """
+        Called when the retrieval of a dependency raised an exception, before
+        it is propagated.
+        """
+
+    def on_singleton_hit(self, dependency: Hashable,
+                         dependency_instance: DependencyInstance):
+        """
+        Called when a singleton is retrieved from the cache of the container.
+        """
+
+    def on_instantiation(self, dependency: Hashable,
+                         dependency_instance: DependencyInstance,
+                         provider: DependencyProvider,
+                         duration: float):
+        """
+        Called when a provider instantiated a dependency, with the wall time
+        it took in seconds. It includes the time taken by its own dependencies
+        when they had to be instantiated too.
+        """
+
+    def on_not_found(self, dependency: Hashable):
+        """
+        Called when no provider can provide the dependency.
+        """
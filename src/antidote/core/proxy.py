@@ -1,13 +1,19 @@
 import collections.abc as c_abc
-from typing import Any, Iterable, Mapping, Set, Dict, Hashable
+from typing import Any, Hashable, Iterable, Mapping, Optional, Sequence, Set
 
-from .container import DependencyContainer, DependencyInstance
+from .container import DependencyContainer
 from .exceptions import DependencyNotFoundError
 
 
 class ProxyContainer(DependencyContainer):
     """
     Proxy core which should only be used for mocking an testing.
+
+    It is an overlay of the original container: singletons are read through
+    from it, only overrides, exclusions and the singletons instantiated by the
+    proxy itself are stored locally. Hence creating one does not depend on
+    the number of existing singletons. Scopes are shared with the original
+    container.
     """
 
     def __init__(self,
@@ -20,6 +26,9 @@ class ProxyContainer(DependencyContainer):
         for provider in container.providers.values():
             self.register_provider(provider)
 
+        self._container = container
+        self._share_scopes(container)
+
         if missing is None:
             self._missing = set()  # type: Set[Any]
         elif isinstance(missing, c_abc.Iterable):
@@ -27,36 +36,74 @@ class ProxyContainer(DependencyContainer):
         else:
             raise ValueError("missing must be either an iterable or None")
 
-        new_singletons = {}    # type: Dict[Any, DependencyInstance]
         if include is None:
-            new_singletons = container.singletons
+            self._include = None  # type: Optional[Set[Any]]
         elif isinstance(include, c_abc.Iterable):
-            existing_singletons = container.singletons
-            for dependency in include:
-                new_singletons[dependency] = existing_singletons[dependency]
+            self._include = set(include)
         else:
             raise ValueError("include must be either an iterable or None")
 
-        if isinstance(exclude, c_abc.Iterable):
-            for dependency in exclude:
-                try:
-                    del new_singletons[dependency]
-                except KeyError:
-                    pass
-        elif exclude is not None:
+        if exclude is None:
+            self._exclude = set()  # type: Set[Any]
+        elif isinstance(exclude, c_abc.Iterable):
+            self._exclude = set(exclude)
+        else:
             raise ValueError("exclude must be either an iterable or None")
-        self.update_singletons({
-            k: v.instance
-            for k, v in new_singletons.items()
-        })
 
         if isinstance(dependencies, c_abc.Mapping):
             self.update_singletons(dependencies)
         elif dependencies is not None:
             raise ValueError("dependencies must be either a mapping or None")
 
+    @property
+    def singletons(self) -> dict:
+        """ Returns all the defined singletons, including the original ones. """
+        singletons = {
+            k: v
+            for k, v in self._container.singletons.items()
+            if self._reads_through(k)
+        }
+        singletons.update(super().singletons)
+        return singletons
+
+    def _reads_through(self, dependency: Hashable) -> bool:
+        return (self._include is None or dependency in self._include) \
+            and dependency not in self._exclude
+
     def provide(self, dependency: Hashable):
         if dependency in self._missing:
             raise DependencyNotFoundError(dependency)
 
-        return super().provide(dependency)
+        dependency_instance = self.peek(dependency)
+        if dependency_instance is None and self._reads_through(dependency):
+            dependency_instance = self._container.peek(dependency)
+        if dependency_instance is None:
+            dependency_instance = super().provide(dependency)
+
+        return dependency_instance
+
+    async def aprovide(self, dependency: Hashable):
+        if dependency in self._missing:
+            raise DependencyNotFoundError(dependency)
+
+        dependency_instance = self.peek(dependency)
+        if dependency_instance is None and self._reads_through(dependency):
+            dependency_instance = self._container.peek(dependency)
+        if dependency_instance is None:
+            dependency_instance = await super().aprovide(dependency)
+
+        return dependency_instance
+
+    def provide_many(self, dependencies: Sequence[Hashable]):
+        for dependency in dependencies:
+            if dependency in self._missing:
+                raise DependencyNotFoundError(dependency)
+
+        return super().provide_many(dependencies)
+
+    async def aprovide_many(self, dependencies: Sequence[Hashable]):
+        for dependency in dependencies:
+            if dependency in self._missing:
+                raise DependencyNotFoundError(dependency)
+
+        return await super().aprovide_many(dependencies)
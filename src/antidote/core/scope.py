@@ -0,0 +1,64 @@
+import threading
+from typing import Any, Dict
+
+try:
+    from contextvars import ContextVar
+except ImportError:  # pragma: no cover, Python < 3.7
+    ContextVar = None  # type: ignore
+
+
+class Scope:
+    """
+    Holds the instances of the scoped dependencies, typically for the
+    lifetime of a HTTP request. Opened with
+    :py:meth:`~.core.DependencyContainer.scope`, all its instances are
+    discarded with it at once.
+    """
+    __slots__ = ('_instances',)
+
+    def __init__(self):
+        self._instances = dict()  # type: Dict[Any, Any]
+
+    def __repr__(self):
+        return "{}(instances={!r})".format(type(self).__name__, self._instances)
+
+    @property
+    def instances(self) -> dict:
+        """ Returns all the instances of the scoped dependencies. """
+        return {k: v.instance for k, v in self._instances.items()}
+
+
+class _LocalScopeVar:
+    """
+    Internal API
+
+    Thread-local fallback with the same API as ContextVar, used to store the
+    current Scope when contextvars is not available.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def get(self):
+        return getattr(self._local, 'scope', None)
+
+    def set(self, scope):
+        token = self.get()
+        self._local.scope = scope
+        return token
+
+    def reset(self, token):
+        self._local.scope = token
+
+
+def new_scope_var():
+    """
+    Internal API
+
+    Creates the variable storing the current Scope of a container. Each
+    asyncio task has its own one if contextvars is available, otherwise each
+    thread.
+    """
+    if ContextVar is None:  # pragma: no cover
+        return _LocalScopeVar()
+    return ContextVar('antidote_scope', default=None)
@@ -0,0 +1,217 @@
+import bisect
+import threading
+from typing import Dict, Hashable, Iterable, List, Sequence, Tuple
+
+from .container import DependencyInstance, DependencyProvider
+from .listener import DependencyListener
+from .._internal.utils import dependency_label
+
+# Upper bounds, in seconds, of the buckets of the latency histograms.
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class Histogram:
+    """
+    Latency histogram with fixed buckets, like the Prometheus ones: each
+    bucket counts the observations lower or equal to its upper bound.
+    """
+    __slots__ = ('buckets', 'counts', 'count', 'sum')
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(map(float, buckets))  # type: Tuple[float, ...]
+        self.counts = [0] * len(self.buckets)  # type: List[int]
+        self.count = 0
+        self.sum = 0.0
+
+    def __repr__(self):
+        return "{}(count={!r}, sum={!r})".format(type(self).__name__,
+                                                 self.count,
+                                                 self.sum)
+
+    def observe(self, value: float):
+        i = bisect.bisect_left(self.buckets, value)
+        if i < len(self.counts):
+            self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative_counts(self) -> List[Tuple[float, int]]:
+        """
+        Returns the upper bound of each bucket with the number of observations
+        lower or equal to it, ending with infinity.
+        """
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((bound, total))
+        result.append((float('inf'), self.count))
+        return result
+
+    def copy(self) -> 'Histogram':
+        histogram = Histogram(self.buckets)
+        histogram.counts = list(self.counts)
+        histogram.count = self.count
+        histogram.sum = self.sum
+        return histogram
+
+
+class ResolutionStats:
+    """
+    Snapshot of the statistics on the retrieval of dependencies, returned by
+    :py:meth:`~.core.DependencyContainer.stats`.
+
+    Attributes:
+        singleton_hits: Singletons retrieved from the cache, per dependency.
+        singleton_misses: Singletons instantiated, per dependency.
+        builds: Instantiations of dependencies which are not singletons, per
+            dependency. Those rebuilt on every request stand out here.
+        not_found: Retrievals of missing dependencies, per dependency.
+        latencies: :py:class:`~.Histogram` of the instantiation wall time per
+            dependency.
+        provider_latencies: :py:class:`~.Histogram` of the instantiation wall
+            time per type of provider.
+    """
+
+    def __init__(self,
+                 singleton_hits: Dict[Hashable, int],
+                 singleton_misses: Dict[Hashable, int],
+                 builds: Dict[Hashable, int],
+                 not_found: Dict[Hashable, int],
+                 latencies: Dict[Hashable, Histogram],
+                 provider_latencies: Dict[str, Histogram]):
+        self.singleton_hits = singleton_hits
+        self.singleton_misses = singleton_misses
+        self.builds = builds
+        self.not_found = not_found
+        self.latencies = latencies
+        self.provider_latencies = provider_latencies
+
+    def __repr__(self):
+        return ("{}(singleton_hits={!r}, singleton_misses={!r}, builds={!r}, "
+                "not_found={!r})").format(type(self).__name__,
+                                          sum(self.singleton_hits.values()),
+                                          sum(self.singleton_misses.values()),
+                                          sum(self.builds.values()),
+                                          sum(self.not_found.values()))
+
+    def to_prometheus(self, prefix: str = 'antidote') -> str:
+        """
+        Returns the statistics in the Prometheus text exposition format.
+        Dependencies are identified by the label :code:`dependency`, providers
+        by :code:`provider`.
+
+        Args:
+            prefix: Prefix of all metric names.
+        """
+        lines = []  # type: List[str]
+        for name, doc, counts in [
+            ('singleton_hits_total', 'Singletons retrieved from the cache.',
+             self.singleton_hits),
+            ('singleton_misses_total', 'Singletons instantiated.',
+             self.singleton_misses),
+            ('builds_total', 'Instantiations of non-singleton dependencies.',
+             self.builds),
+            ('not_found_total', 'Retrievals of missing dependencies.',
+             self.not_found),
+        ]:
+            metric = '{}_{}'.format(prefix, name)
+            lines.append('# HELP {} {}'.format(metric, doc))
+            lines.append('# TYPE {} counter'.format(metric))
+            lines.extend('{}{{dependency="{}"}} {}'.format(metric, _label(d), count)
+                         for d, count in counts.items())
+
+        metric = '{}_instantiation_seconds'.format(prefix)
+        lines.append('# HELP {} Wall time of the instantiation of '
+                     'dependencies.'.format(metric))
+        lines.append('# TYPE {} histogram'.format(metric))
+        for dependency, histogram in self.latencies.items():
+            lines.extend(_histogram_lines(
+                metric, 'dependency="{}"'.format(_label(dependency)), histogram))
+
+        metric = '{}_provider_instantiation_seconds'.format(prefix)
+        lines.append('# HELP {} Wall time of the instantiation of '
+                     'dependencies per provider.'.format(metric))
+        lines.append('# TYPE {} histogram'.format(metric))
+        for provider, histogram in self.provider_latencies.items():
+            lines.extend(_histogram_lines(
+                metric, 'provider="{}"'.format(_escape(provider)), histogram))
+
+        return '\n'.join(lines) + '\n'
+
+
+class StatisticsListener(DependencyListener):
+    """
+    Internal API
+
+    Listener aggregating the statistics of a container, registered with
+    :py:meth:`~.core.DependencyContainer.enable_stats`.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self._lock = threading.Lock()
+        self._buckets = tuple(sorted(buckets))
+        self._singleton_hits = dict()  # type: Dict[Hashable, int]
+        self._singleton_misses = dict()  # type: Dict[Hashable, int]
+        self._builds = dict()  # type: Dict[Hashable, int]
+        self._not_found = dict()  # type: Dict[Hashable, int]
+        self._latencies = dict()  # type: Dict[Hashable, Histogram]
+        self._provider_latencies = dict()  # type: Dict[str, Histogram]
+
+    def on_singleton_hit(self, dependency: Hashable,
+                         dependency_instance: DependencyInstance):
+        with self._lock:
+            self._singleton_hits[dependency] = \
+                self._singleton_hits.get(dependency, 0) + 1
+
+    def on_instantiation(self, dependency: Hashable,
+                         dependency_instance: DependencyInstance,
+                         provider: DependencyProvider,
+                         duration: float):
+        provider_name = type(provider).__name__
+        with self._lock:
+            counts = self._singleton_misses if dependency_instance.singleton \
+                else self._builds
+            counts[dependency] = counts.get(dependency, 0) + 1
+
+            self._histogram(self._latencies, dependency).observe(duration)
+            self._histogram(self._provider_latencies, provider_name).observe(duration)
+
+    def _histogram(self, histograms: dict, key) -> Histogram:
+        try:
+            return histograms[key]
+        except KeyError:
+            histogram = histograms[key] = Histogram(self._buckets)
+            return histogram
+
+    def on_not_found(self, dependency: Hashable):
+        with self._lock:
+            self._not_found[dependency] = self._not_found.get(dependency, 0) + 1
+
+    def snapshot(self) -> ResolutionStats:
+        with self._lock:
+            return ResolutionStats(
+                singleton_hits=dict(self._singleton_hits),
+                singleton_misses=dict(self._singleton_misses),
+                builds=dict(self._builds),
+                not_found=dict(self._not_found),
+                latencies={k: h.copy() for k, h in self._latencies.items()},
+                provider_latencies={k: h.copy()
+                                    for k, h in self._provider_latencies.items()}
+            )
+
+
+def _label(dependency: Hashable) -> str:
+    return _escape(dependency_label(dependency))
+
+
+def _escape(label: str) -> str:
+    return label.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _histogram_lines(metric: str, labels: str, histogram: Histogram) -> Iterable[str]:
+    for bound, count in histogram.cumulative_counts():
+        yield '{}_bucket{{{},le="{}"}} {}'.format(
+            metric, labels, '+Inf' if bound == float('inf') else repr(bound), count)
+    yield '{}_sum{{{}}} {!r}'.format(metric, labels, histogram.sum)
+    yield '{}_count{{{}}} {}'.format(metric, labels, histogram.count)
@@ -0,0 +1,240 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Hashable, Iterator, List, Optional
+
+from .container import DependencyInstance, DependencyProvider
+from .listener import DependencyListener
+from .._internal.utils import dependency_label, SlotsReprMixin
+
+SPEEDSCOPE_SCHEMA = 'https://www.speedscope.app/file-format-schema.json'
+
+
+class ResolutionSpan(SlotsReprMixin):
+    """
+    Retrieval of a dependency recorded by the tracing of a
+    :py:class:`~.core.DependencyContainer`, with the retrievals it triggered
+    as children. Timestamps are in seconds, relative to the start of the
+    tracing.
+
+    Attributes:
+        dependency: Dependency retrieved.
+        thread_id: Identifier of the thread which retrieved it.
+        start: When the retrieval started.
+        end: When the retrieval ended.
+        provider: Name of the provider's class which instantiated it, if any.
+        result: One of :code:`'instantiated'`, :code:`'singleton_hit'`,
+            :code:`'cached'` for instances stored elsewhere, like in a scope,
+            :code:`'not_found'` or :code:`'error'`.
+        children: Nested retrievals, in order.
+    """
+    __slots__ = ('dependency', 'thread_id', 'start', 'end', 'provider', 'result',
+                 'children')
+
+    def __init__(self, dependency: Hashable, thread_id: int, start: float):
+        self.dependency = dependency
+        self.thread_id = thread_id
+        self.start = start
+        self.end = start
+        self.provider = None  # type: Optional[str]
+        self.result = 'cached'
+        self.children = []  # type: List[ResolutionSpan]
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    def walk(self) -> Iterator['ResolutionSpan']:
+        """
+        Iterates over the span and all of its descendants, depth-first.
+        """
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+class ResolutionTrace:
+    """
+    Snapshot of the retrievals recorded since
+    :py:meth:`~.core.DependencyContainer.enable_tracing`, returned by
+    :py:meth:`~.core.DependencyContainer.trace`. Only the trees of finished
+    retrievals are present.
+
+    Attributes:
+        roots: :py:class:`~.ResolutionSpan` of the top-level retrievals, in the
+            order in which they finished.
+    """
+
+    def __init__(self, roots: List[ResolutionSpan]):
+        self.roots = roots
+
+    def __repr__(self):
+        return "{}(roots={!r})".format(type(self).__name__, len(self.roots))
+
+    def __iter__(self) -> Iterator[ResolutionSpan]:
+        """
+        Iterates over all spans, depth-first.
+        """
+        for root in self.roots:
+            yield from root.walk()
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Returns the trace in the Chrome trace-event format, made of builtin
+        types only. Once serialized as JSON, it can be opened by
+        :code:`chrome://tracing`, Perfetto or speedscope.
+        """
+        pid = os.getpid()
+        events = []  # type: List[Dict[str, Any]]
+        for span in self:
+            events.append({
+                'name': dependency_label(span.dependency),
+                'cat': 'antidote',
+                'ph': 'X',
+                'ts': span.start * 1e6,
+                'dur': span.duration * 1e6,
+                'pid': pid,
+                'tid': span.thread_id,
+                'args': {'provider': span.provider, 'result': span.result}
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def to_speedscope(self, name: str = 'antidote') -> Dict[str, Any]:
+        """
+        Returns the trace in the speedscope file format, made of builtin
+        types only, with one evented profile per thread.
+
+        Args:
+            name: Name of the profiles, suffixed by the thread identifier.
+        """
+        frames = []  # type: List[Dict[str, str]]
+        frame_ids = dict()  # type: Dict[str, int]
+        threads = dict()  # type: Dict[int, List[ResolutionSpan]]
+        for root in sorted(self.roots, key=lambda s: s.start):
+            threads.setdefault(root.thread_id, []).append(root)
+
+        def frame(span: ResolutionSpan) -> int:
+            label = dependency_label(span.dependency)
+            try:
+                return frame_ids[label]
+            except KeyError:
+                frame_ids[label] = len(frames)
+                frames.append({'name': label})
+                return frame_ids[label]
+
+        def events(span: ResolutionSpan) -> Iterator[Dict[str, Any]]:
+            f = frame(span)
+            yield {'type': 'O', 'frame': f, 'at': span.start}
+            for child in span.children:
+                yield from events(child)
+            yield {'type': 'C', 'frame': f, 'at': span.end}
+
+        profiles = []
+        for thread_id, roots in threads.items():
+            profiles.append({
+                'type': 'evented',
+                'name': '{} (thread {})'.format(name, thread_id),
+                'unit': 'seconds',
+                'startValue': roots[0].start,
+                'endValue': max(root.end for root in roots),
+                'events': [e for root in roots for e in events(root)]
+            })
+
+        return {
+            '$schema': SPEEDSCOPE_SCHEMA,
+            'name': name,
+            'shared': {'frames': frames},
+            'profiles': profiles
+        }
+
+    def to_json(self, format: str = 'chrome', **kwargs) -> str:
+        """
+        Returns the trace serialized as JSON.
+
+        Args:
+            format: Either :code:`'chrome'` for :py:meth:`~.to_chrome_trace`
+                or :code:`'speedscope'` for :py:meth:`~.to_speedscope`.
+            **kwargs: Passed on to :py:func:`json.dumps`.
+        """
+        if format == 'chrome':
+            data = self.to_chrome_trace()
+        elif format == 'speedscope':
+            data = self.to_speedscope()
+        else:
+            raise ValueError("Unknown format {!r}, expected 'chrome' "
+                             "or 'speedscope'.".format(format))
+        return json.dumps(data, **kwargs)
+
+
+class TracingListener(DependencyListener):
+    """
+    Internal API
+
+    Listener recording the nested retrievals of a container, registered with
+    :py:meth:`~.core.DependencyContainer.enable_tracing`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._origin = time.perf_counter()
+        self._roots = []  # type: List[ResolutionSpan]
+
+    def _stack(self) -> List[ResolutionSpan]:
+        try:
+            return self._local.stack
+        except AttributeError:
+            stack = self._local.stack = []
+            return stack
+
+    def before_provide(self, dependency: Hashable):
+        self._stack().append(ResolutionSpan(dependency,
+                                            threading.get_ident(),
+                                            time.perf_counter() - self._origin))
+
+    def on_singleton_hit(self, dependency: Hashable,
+                         dependency_instance: DependencyInstance):
+        self._set_result('singleton_hit')
+
+    def on_instantiation(self, dependency: Hashable,
+                         dependency_instance: DependencyInstance,
+                         provider: DependencyProvider,
+                         duration: float):
+        self._set_result('instantiated', type(provider).__name__)
+
+    def on_not_found(self, dependency: Hashable):
+        self._set_result('not_found')
+
+    def after_provide(self, dependency: Hashable,
+                      dependency_instance: Optional[DependencyInstance]):
+        self._finish()
+
+    def on_error(self, dependency: Hashable, error: Exception):
+        self._set_result('error')
+        self._finish()
+
+    def _set_result(self, result: str, provider: str = None):
+        stack = self._stack()
+        # Empty when the listener was added during a retrieval.
+        if stack:
+            stack[-1].result = result
+            if provider is not None:
+                stack[-1].provider = provider
+
+    def _finish(self):
+        stack = self._stack()
+        if not stack:
+            return
+        span = stack.pop()
+        span.end = time.perf_counter() - self._origin
+        if stack:
+            stack[-1].children.append(span)
+        else:
+            # Spans are not modified anymore once their root is finished.
+            with self._lock:
+                self._roots.append(span)
+
+    def snapshot(self) -> ResolutionTrace:
+        with self._lock:
+            return ResolutionTrace(list(self._roots))
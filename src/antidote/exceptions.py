@@ -1,6 +1,14 @@
 from .core.exceptions import (AntidoteError, DependencyCycleError,
                               DependencyInstantiationError, DependencyNotFoundError,
-                              DuplicateDependencyError)
+                              DuplicateDependencyError, FrozenContainerError)
+
+
+class AsyncDependencyError(AntidoteError):
+    """
+    A dependency built by a coroutine was requested synchronously, it can only
+    be retrieved with :py:meth:`~.core.DependencyContainer.aget`.
+    Raised by the :py:class:`~.providers.factory.FactoryProvider`.
+    """
 
 
 class DuplicateTagError(AntidoteError):
@@ -10,6 +18,13 @@ class DuplicateTagError(AntidoteError):
     """
 
 
+class StaleWiringError(AntidoteError):
+    """
+    The wiring compiled ahead of time does not match the application anymore.
+    Raised by :py:func:`~.aot.load_wiring`.
+    """
+
+
 class UndefinedContextError(AntidoteError):
     """
     A context does not have any target associated.
@@ -19,10 +34,13 @@ class UndefinedContextError(AntidoteError):
 
 __all__ = [
     'AntidoteError',
+    'AsyncDependencyError',
     'DependencyCycleError',
     'DependencyInstantiationError',
     'DependencyNotFoundError',
     'DuplicateDependencyError',
     'DuplicateTagError',
+    'FrozenContainerError',
+    'StaleWiringError',
     'UndefinedContextError'
 ]
@@ -1,4 +1,4 @@
-from .container import new_container
+from .container import new_container, override
 from .factory import factory
 from .provider import provider
 from .register import register
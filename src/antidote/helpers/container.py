@@ -1,4 +1,8 @@
-from ..core import DependencyContainer
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Mapping
+
+from .._internal.default_container import get_default_container
+from ..core import DependencyContainer, ProxyContainer
 from ..providers import LazyCallProvider, FactoryProvider, TagProvider, IndirectProvider
 
 
@@ -10,3 +14,51 @@ def new_container() -> DependencyContainer:
     container.register_provider(IndirectProvider(container))
 
     return container
+
+
+@contextmanager
+def override(dependencies: Mapping = None,
+             include: Iterable = None,
+             exclude: Iterable = None,
+             missing: Iterable = None,
+             container: DependencyContainer = None
+             ) -> Iterator[ProxyContainer]:
+    """
+    Context manager overriding the container with a
+    :py:class:`~.core.ProxyContainer`, for testing. All dependencies, including
+    those of already injected functions, are retrieved from it until the end
+    of the context manager. It can be used as a pytest fixture by yielding
+    within it.
+
+    .. doctest::
+
+        >>> from antidote import world
+        >>> from antidote.helpers import override
+        >>> world.update_singletons({'name': 'Antidote'})
+        >>> with override(dependencies={'name': 'mock'}):
+        ...     world.get('name')
+        'mock'
+        >>> world.get('name')
+        'Antidote'
+
+    Args:
+        dependencies: Singletons overridden in the proxy.
+        include: If specified, only those singletons are read from the
+            original container.
+        exclude: Singletons which are not read from the original container.
+        missing: Dependencies which cannot be found in the proxy.
+        container: :py:class:`~.core.container.DependencyContainer` to be
+            overridden. Defaults to the global container,
+            :code:`antidote.world`.
+
+    Returns:
+        The :py:class:`~.core.ProxyContainer` used instead.
+    """
+    container = container or get_default_container()
+    proxy_container = ProxyContainer(container,
+                                     dependencies=dependencies,
+                                     include=include,
+                                     exclude=exclude,
+                                     missing=missing)
+    with container.override(proxy_container):
+        yield proxy_container
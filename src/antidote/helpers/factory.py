@@ -7,6 +7,7 @@ from .._internal.default_container import get_default_container
 from ..core import DEPENDENCIES_TYPE, DependencyContainer, inject
 from ..exceptions import DuplicateDependencyError
 from ..providers.factory import FactoryProvider
+from ..providers.cache import BuildCache
 from ..providers.tag import Tag, TagProvider
 
 F = TypeVar('F', Callable, type)
@@ -17,12 +18,15 @@ def factory(func: F,  # noqa: E704
             *,
             auto_wire: Union[bool, Iterable[str]] = True,
             singleton: bool = True,
+            scoped: bool = False,
             dependencies: DEPENDENCIES_TYPE = None,
             use_names: Union[bool, Iterable[str]] = None,
             use_type_hints: Union[bool, Iterable[str]] = None,
             wire_super: Union[bool, Iterable[str]] = None,
             tags: Iterable[Union[str, Tag]] = None,
-            container: DependencyContainer = None
+            container: DependencyContainer = None,
+            lazy: bool = None,
+            build_cache: BuildCache = None
             ) -> F: ...
 
 
@@ -30,12 +34,15 @@ def factory(func: F,  # noqa: E704
 def factory(*,  # noqa: E704
             auto_wire: Union[bool, Iterable[str]] = True,
             singleton: bool = True,
+            scoped: bool = False,
             dependencies: DEPENDENCIES_TYPE = None,
             use_names: Union[bool, Iterable[str]] = None,
             use_type_hints: Union[bool, Iterable[str]] = None,
             wire_super: Union[bool, Iterable[str]] = None,
             tags: Iterable[Union[str, Tag]] = None,
-            container: DependencyContainer = None
+            container: DependencyContainer = None,
+            lazy: bool = None,
+            build_cache: BuildCache = None
             ) -> Callable[[F], F]: ...
 
 
@@ -43,12 +50,15 @@ def factory(func: Union[Callable, type] = None,
             *,
             auto_wire: Union[bool, Iterable[str]] = True,
             singleton: bool = True,
+            scoped: bool = False,
             dependencies: DEPENDENCIES_TYPE = None,
             use_names: Union[bool, Iterable[str]] = None,
             use_type_hints: Union[bool, Iterable[str]] = None,
             wire_super: Union[bool, Iterable[str]] = None,
             tags: Iterable[Union[str, Tag]] = None,
-            container: DependencyContainer = None
+            container: DependencyContainer = None,
+            lazy: bool = None,
+            build_cache: BuildCache = None
             ):
     """Register a dependency providers, a factory to build the dependency.
 
@@ -56,6 +66,9 @@ def factory(func: Union[Callable, type] = None,
         func: Callable which builds the dependency.
         singleton: If True, `func` will only be called once. If not it is
             called at each injection.
+        scoped: If True, `func` will only be called once per
+            :py:class:`~.core.Scope`, typically a HTTP request. Takes
+            precedence over :code:`singleton`.
         auto_wire: If :code:`func` is a function, its dependencies are
             injected if True. Should :code:`func` be a class with
             :py:func:`__call__`, dependencies of :code:`__init__()` and
@@ -87,6 +100,12 @@ def factory(func: Union[Callable, type] = None,
         container: :py:class:`~.core.container.DependencyContainer` to which the
             dependency should be attached. Defaults to the global container,
             :code:`antidote.world`.
+        lazy: Whether the signatures should only be analyzed on the first
+            call, speeding up imports. See :py:func:`~.core.injection.inject`.
+            Defaults to :code:`False`.
+        build_cache: :py:class:`~.providers.cache.BuildCache` bounding the
+            instances built with :py:class:`~.providers.factory.Build`, which
+            are otherwise kept forever. Requires a singleton.
 
     Returns:
         object: The dependency_provider
@@ -120,7 +139,8 @@ def factory(func: Union[Callable, type] = None,
                            dependencies=dependencies,
                            use_names=use_names,
                            use_type_hints=use_type_hints,
-                           container=container)
+                           container=container,
+                           lazy=lazy)
 
             obj = register(obj, auto_wire=False, singleton=True, container=container)
             dependency = get_type_hints(obj.__call__).get('return')
@@ -130,8 +150,10 @@ def factory(func: Union[Callable, type] = None,
             factory_provider.register_providable_factory(
                 dependency=dependency,
                 singleton=singleton,
+                scoped=scoped,
                 takes_dependency=False,
-                factory_dependency=obj
+                factory_dependency=obj,
+                build_cache=build_cache
             )
         elif callable(obj):
             if auto_wire:
@@ -139,7 +161,8 @@ def factory(func: Union[Callable, type] = None,
                              dependencies=dependencies,
                              use_names=use_names,
                              use_type_hints=use_type_hints,
-                             container=container)
+                             container=container,
+                             lazy=lazy)
 
             dependency = get_type_hints(obj).get('return')
             if dependency is None:
@@ -147,8 +170,10 @@ def factory(func: Union[Callable, type] = None,
                                  "It is used a the dependency.")
             factory_provider.register_factory(factory=obj,
                                               singleton=singleton,
+                                              scoped=scoped,
                                               dependency=dependency,
-                                              takes_dependency=False)
+                                              takes_dependency=False,
+                                              build_cache=build_cache)
         else:
             raise TypeError("Must be either a function "
                             "or a class implementing __call__(), "
@@ -15,7 +15,8 @@ def provider(class_: P,  # noqa: E704
              use_names: Union[bool, Iterable[str]] = None,
              use_type_hints: Union[bool, Iterable[str]] = None,
              wire_super: Union[bool, Iterable[str]] = None,
-             container: DependencyContainer = None
+             container: DependencyContainer = None,
+             lazy: bool = None
              ) -> P: ...
 
 
@@ -26,7 +27,8 @@ def provider(*,  # noqa: E704
              use_names: Union[bool, Iterable[str]] = None,
              use_type_hints: Union[bool, Iterable[str]] = None,
              wire_super: Union[bool, Iterable[str]] = None,
-             container: DependencyContainer = None
+             container: DependencyContainer = None,
+             lazy: bool = None
              ) -> Callable[[P], P]: ...
 
 
@@ -37,7 +39,8 @@ def provider(class_: Type[DependencyProvider] = None,
              use_names: Union[bool, Iterable[str]] = None,
              use_type_hints: Union[bool, Iterable[str]] = None,
              wire_super: Union[bool, Iterable[str]] = None,
-             container: DependencyContainer = None):
+             container: DependencyContainer = None,
+             lazy: bool = None):
     """Register a providers by its class.
 
     Args:
@@ -69,6 +72,9 @@ def provider(class_: Type[DependencyProvider] = None,
         container: :py:class:`~.core.container.DependencyContainer` to which the
             dependency should be attached. Defaults to the global container,
             :code:`antidote.world`.
+        lazy: Whether the signature of :code:`__init__()` should only be
+            analyzed on its first call. See :py:func:`~.core.injection.inject`.
+            Defaults to :code:`False`.
 
     Returns:
         the providers's class or the class decorator.
@@ -89,6 +95,7 @@ def provider(class_: Type[DependencyProvider] = None,
                        use_names=use_names,
                        use_type_hints=use_type_hints,
                        container=container,
+                       lazy=lazy,
                        raise_on_missing=auto_wire is not True)
 
         container.register_provider(cls(container=container))
@@ -5,6 +5,7 @@ from .wire import wire
 from .._internal.default_container import get_default_container
 from ..core import DEPENDENCIES_TYPE, DependencyContainer, inject
 from ..providers.factory import FactoryProvider
+from ..providers.cache import BuildCache
 from ..providers.tag import Tag, TagProvider
 
 C = TypeVar('C', bound=type)
@@ -14,6 +15,7 @@ C = TypeVar('C', bound=type)
 def register(class_: C,  # noqa: E704
              *,
              singleton: bool = True,
+             scoped: bool = False,
              factory: Union[Callable, str] = None,
              factory_dependency: Any = None,
              auto_wire: Union[bool, Iterable[str]] = None,
@@ -22,13 +24,16 @@ def register(class_: C,  # noqa: E704
              use_type_hints: Union[bool, Iterable[str]] = None,
              wire_super: Union[bool, Iterable[str]] = None,
              tags: Iterable[Union[str, Tag]] = None,
-             container: DependencyContainer = None
+             container: DependencyContainer = None,
+             lazy: bool = None,
+             build_cache: BuildCache = None
              ) -> C: ...
 
 
 @overload
 def register(*,  # noqa: E704
              singleton: bool = True,
+             scoped: bool = False,
              factory: Union[Callable, str] = None,
              factory_dependency: Any = None,
              auto_wire: Union[bool, Iterable[str]] = None,
@@ -37,13 +42,16 @@ def register(*,  # noqa: E704
              use_type_hints: Union[bool, Iterable[str]] = None,
              wire_super: Union[bool, Iterable[str]] = None,
              tags: Iterable[Union[str, Tag]] = None,
-             container: DependencyContainer = None
+             container: DependencyContainer = None,
+             lazy: bool = None,
+             build_cache: BuildCache = None
              ) -> Callable[[C], C]: ...
 
 
 def register(class_=None,
              *,
              singleton: bool = True,
+             scoped: bool = False,
              factory: Union[Callable, str] = None,
              factory_dependency: Any = None,
              auto_wire: Union[bool, Iterable[str]] = None,
@@ -52,7 +60,9 @@ def register(class_=None,
              use_type_hints: Union[bool, Iterable[str]] = None,
              wire_super: Union[bool, Iterable[str]] = None,
              tags: Iterable[Union[str, Tag]] = None,
-             container: DependencyContainer = None):
+             container: DependencyContainer = None,
+             lazy: bool = None,
+             build_cache: BuildCache = None):
     """Register a dependency by its class.
 
     Args:
@@ -60,6 +70,9 @@ def register(class_=None,
             only when requested.
         singleton: If True, the class will be instantiated only once,
             further will receive the same instance.
+        scoped: If True, the class will be instantiated only once per
+            :py:class:`~.core.Scope`, typically a HTTP request. Takes
+            precedence over :code:`singleton`.
         factory: Callable to be used when building the class, this allows to
             re-use the same factory for subclasses for example. The dependency
             is given as first argument. If a string is specified, it is
@@ -97,6 +110,12 @@ def register(class_=None,
         container: :py:class:`~.core.container.DependencyContainer` to which the
             dependency should be attached. Defaults to the global container,
             :code:`antidote.world`.
+        lazy: Whether the signatures should only be analyzed on the first
+            call, speeding up imports. See :py:func:`~.core.injection.inject`.
+            Defaults to :code:`False`.
+        build_cache: :py:class:`~.providers.cache.BuildCache` bounding the
+            instances built with :py:class:`~.providers.factory.Build`, which
+            are otherwise kept forever. Requires a singleton.
 
     Returns:
         The class or the class decorator.
@@ -143,6 +162,7 @@ def register(class_=None,
                        use_names=use_names,
                        use_type_hints=use_type_hints,
                        container=container,
+                       lazy=lazy,
                        raise_on_missing=wire_raise_on_missing)
 
         if isinstance(factory, str):
@@ -157,7 +177,8 @@ def register(class_=None,
                                  dependencies=dependencies,
                                  use_names=use_names,
                                  use_type_hints=use_type_hints,
-                                 container=container)
+                                 container=container,
+                                 lazy=lazy)
         elif factory is not None:
             raise TypeError("factory must be either a method name, a function, or a "
                             "lazy dependency, not {!r}".format(type(factory)))
@@ -168,15 +189,20 @@ def register(class_=None,
                 dependency=cls,
                 factory=factory,
                 singleton=singleton,
-                takes_dependency=takes_dependency)
+                takes_dependency=takes_dependency,
+                scoped=scoped,
+                build_cache=build_cache)
         elif factory_dependency is not None:
             factory_provider.register_providable_factory(
                 dependency=cls,
                 factory_dependency=factory_dependency,
                 singleton=singleton,
-                takes_dependency=True)
+                takes_dependency=True,
+                scoped=scoped,
+                build_cache=build_cache)
         else:
-            factory_provider.register_class(cls, singleton=singleton)
+            factory_provider.register_class(cls, singleton=singleton, scoped=scoped,
+                                            build_cache=build_cache)
 
         if tags is not None:
             tag_provider = cast(TagProvider, container.providers[TagProvider])
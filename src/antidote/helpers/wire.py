@@ -1,9 +1,11 @@
 import collections.abc as c_abc
 import inspect
-from typing import Callable, Iterable, Optional, overload, Set, TypeVar, Union
+from typing import Callable, Iterable, Optional, overload, Set, Tuple, TypeVar, Union
 
 from .._internal.argspec import Arguments
 from ..core import DEPENDENCIES_TYPE, DependencyContainer, inject
+from ..core.injection import (_build_injection_blueprint, _compiled_injected_wrapper,
+                              _lazy_injected_wrapper)
 
 C = TypeVar('C', bound=type)
 
@@ -17,7 +19,8 @@ def wire(class_: C,  # noqa: E704
          use_type_hints: Union[bool, Iterable[str]] = None,
          wire_super: Union[bool, Iterable[str]] = None,
          container: DependencyContainer = None,
-         raise_on_missing: bool = True
+         raise_on_missing: bool = True,
+         lazy: bool = None
          ) -> C: ...
 
 
@@ -29,7 +32,8 @@ def wire(*,  # noqa: E704
          use_type_hints: Union[bool, Iterable[str]] = None,
          wire_super: Union[bool, Iterable[str]] = None,
          container: DependencyContainer = None,
-         raise_on_missing: bool = True
+         raise_on_missing: bool = True,
+         lazy: bool = None
          ) -> Callable[[C], C]: ...
 
 
@@ -41,7 +45,8 @@ def wire(class_: type = None,
          use_type_hints: Union[bool, Iterable[str]] = None,
          wire_super: Union[bool, Iterable[str]] = None,
          container: DependencyContainer = None,
-         raise_on_missing: bool = True
+         raise_on_missing: bool = True,
+         lazy: bool = None
          ) -> Union[Callable, type]:
     """Wire a class by injecting the dependencies in all specified methods.
 
@@ -72,6 +77,9 @@ def wire(class_: type = None,
             core if it is defined.
         raise_on_missing: Raise an error if a method does exist.
             Defaults to :code:`True`.
+        lazy: Whether the signature and the type hints of the methods should
+            only be analyzed on their first call, speeding up imports. See
+            :py:func:`~.core.injection.inject`. Defaults to :code:`False`.
 
     Returns:
         Wired class or a decorator.
@@ -108,34 +116,29 @@ def wire(class_: type = None,
                 else:
                     continue  # pragma: no cover
 
-            arguments = Arguments.from_method(method)
-            _dependencies = dependencies
-            _use_names = use_names
-            _use_type_hints = use_type_hints
-
-            if isinstance(dependencies, c_abc.Mapping):
-                _dependencies = {
-                    arg_name: dependency
-                    for arg_name, dependency in dependencies.items()
-                    if arg_name in arguments
-                }
-
-            if isinstance(use_names, c_abc.Iterable):
-                _use_names = [name
-                              for name in use_names
-                              if name in arguments]
-
-            if isinstance(use_type_hints, c_abc.Iterable):
-                _use_type_hints = [name
-                                   for name in use_type_hints
-                                   if name in arguments]
-
-            injected_method = inject(method,
-                                     arguments=arguments,
-                                     dependencies=_dependencies,
-                                     use_names=_use_names,
-                                     use_type_hints=_use_type_hints,
-                                     container=container)
+            injected_method = _compiled_injected_wrapper(method, container, lazy)
+            if injected_method is not None:
+                pass  # Compiled ahead of time, see antidote.aot
+            elif lazy:
+                injected_method = _lazy_injected_wrapper(
+                    method,
+                    lambda arguments: _build_injection_blueprint(
+                        arguments,
+                        *_restrict_options(arguments, dependencies, use_names,
+                                           use_type_hints)
+                    ),
+                    container=container
+                )
+            else:
+                arguments = Arguments.from_method(method)
+                _dependencies, _use_names, _use_type_hints = _restrict_options(
+                    arguments, dependencies, use_names, use_type_hints)
+                injected_method = inject(method,
+                                         arguments=arguments,
+                                         dependencies=_dependencies,
+                                         use_names=_use_names,
+                                         use_type_hints=_use_type_hints,
+                                         container=container)
 
             if injected_method is not method:  # If something has changed
                 setattr(cls, method_name, injected_method)
@@ -145,6 +148,36 @@ def wire(class_: type = None,
     return class_ and wire_methods(class_) or wire_methods
 
 
+def _restrict_options(arguments: Arguments,
+                      dependencies: DEPENDENCIES_TYPE,
+                      use_names: Union[bool, Iterable[str]],
+                      use_type_hints: Union[bool, Iterable[str]]
+                      ) -> Tuple[DEPENDENCIES_TYPE,
+                                 Union[bool, Iterable[str]],
+                                 Union[bool, Iterable[str]]]:
+    """
+    Restricts the options given for all methods to the arguments of one.
+    """
+    if isinstance(dependencies, c_abc.Mapping):
+        dependencies = {
+            arg_name: dependency
+            for arg_name, dependency in dependencies.items()
+            if arg_name in arguments
+        }
+
+    if isinstance(use_names, c_abc.Iterable):
+        use_names = [name
+                     for name in use_names
+                     if name in arguments]
+
+    if isinstance(use_type_hints, c_abc.Iterable):
+        use_type_hints = [name
+                          for name in use_type_hints
+                          if name in arguments]
+
+    return dependencies, use_names, use_type_hints
+
+
 def _validate_wire_super(wire_super: Optional[Union[bool, Iterable[str]]],
                          methods: Set[str]) -> Set[str]:
     if wire_super is None:
@@ -0,0 +1,101 @@
+from contextlib import ExitStack
+from typing import Callable, Iterable
+
+from ._internal.default_container import get_default_container
+from .core import DependencyContainer
+
+
+class WSGIScopeMiddleware:
+    """
+    WSGI middleware opening a new :py:class:`~.core.Scope` for each request,
+    so scoped dependencies are instantiated only once per request. The scope
+    is closed once the response has been sent.
+
+    .. doctest::
+
+        >>> from antidote import register, world
+        >>> from antidote.middleware import WSGIScopeMiddleware
+        >>> @register(scoped=True)
+        ... class UnitOfWork:
+        ...     pass
+        >>> def app(environ, start_response):
+        ...     assert world.get(UnitOfWork) is world.get(UnitOfWork)
+        ...     start_response('200 OK', [])
+        ...     return [b'']
+        >>> app = WSGIScopeMiddleware(app)
+
+    """
+
+    def __init__(self, app: Callable, container: DependencyContainer = None):
+        """
+        Args:
+            app: WSGI application to be wrapped.
+            container: :py:class:`~.core.container.DependencyContainer` in
+                which the scope is opened. Defaults to the global container,
+                :code:`antidote.world`.
+        """
+        self.app = app
+        self.container = container or get_default_container()
+
+    def __call__(self, environ, start_response):
+        exit_stack = ExitStack()
+        exit_stack.enter_context(self.container.scope())
+        try:
+            response = self.app(environ, start_response)
+        except BaseException:
+            exit_stack.close()
+            raise
+
+        return _ScopedResponse(response, exit_stack)
+
+
+class _ScopedResponse:
+    """
+    Internal API
+
+    Iterable returned to the WSGI server, closing the scope when the server
+    closes the response.
+    """
+
+    def __init__(self, response: Iterable, exit_stack: ExitStack):
+        self._response = response
+        self._exit_stack = exit_stack
+
+    def __iter__(self):
+        return iter(self._response)
+
+    def close(self):
+        try:
+            if hasattr(self._response, 'close'):
+                self._response.close()
+        finally:
+            self._exit_stack.close()
+
+
+class ASGIScopeMiddleware:
+    """
+    ASGI middleware opening a new :py:class:`~.core.Scope` for each HTTP
+    request or websocket connection, so scoped dependencies are instantiated
+    only once for each of them. Lifespan events are passed through.
+
+    It relies on :py:mod:`contextvars` to isolate concurrent requests.
+    """
+
+    def __init__(self, app: Callable, container: DependencyContainer = None):
+        """
+        Args:
+            app: ASGI application to be wrapped.
+            container: :py:class:`~.core.container.DependencyContainer` in
+                which the scope is opened. Defaults to the global container,
+                :code:`antidote.world`.
+        """
+        self.app = app
+        self.container = container or get_default_container()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] not in {'http', 'websocket'}:
+            await self.app(scope, receive, send)
+            return
+
+        with self.container.scope():
+            await self.app(scope, receive, send)
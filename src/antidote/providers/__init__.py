@@ -1,3 +1,4 @@
+from .cache import BuildCache
 from .indirect import IndirectProvider
 from .lazy import LazyCallProvider
 from .factory import FactoryProvider
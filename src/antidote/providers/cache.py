@@ -0,0 +1,118 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class BuildCache:
+    """
+    Bounded cache of the instances built with :py:class:`~.factory.Build` for
+    a singleton registered in the :py:class:`~.factory.FactoryProvider`.
+    Without it, each distinct combination of arguments is kept forever by the
+    :py:class:`~..core.DependencyContainer`. Once full, the least recently
+    used instances are evicted, and will be built again when requested.
+
+    .. doctest::
+
+        >>> from antidote import Build, register, world
+        >>> from antidote.providers import BuildCache
+        >>> cache = BuildCache(max_size=2)
+        >>> @register(build_cache=cache)
+        ... class Tenant:
+        ...     def __init__(self, name=None):
+        ...         self.name = name
+        >>> world.get(Build(Tenant, name='a')) is world.get(Build(Tenant, name='a'))
+        True
+        >>> cache.hits, cache.misses
+        (1, 1)
+
+    Attributes:
+        max_size: Maximum total cost of the cached instances.
+        size: Current total cost of the cached instances.
+        hits: Number of instances retrieved from the cache.
+        misses: Number of instances which had to be built.
+        evictions: Number of instances evicted to respect :code:`max_size`.
+    """
+    __slots__ = ('max_size', 'size', 'hits', 'misses', 'evictions', '_cost',
+                 '_instances', '_lock')
+
+    def __init__(self, max_size: float, cost: Callable[[Any], float] = None):
+        """
+        Args:
+            max_size: Maximum total cost of the cached instances.
+            cost: Function returning the cost of an instance, typically an
+                estimation of its memory. Defaults to 1 for each one, in which
+                case :code:`max_size` is the maximum number of instances.
+        """
+        if max_size <= 0:
+            raise ValueError("max_size must be strictly positive.")
+        if cost is not None and not callable(cost):
+            raise TypeError("cost must be callable, not {!r}".format(type(cost)))
+
+        self.max_size = max_size
+        self.size = 0  # type: float
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._cost = cost
+        # Instances and their cost, from the least to the most recently used.
+        self._instances = OrderedDict()  # type: OrderedDict
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "{}(max_size={!r}, size={!r}, hits={!r}, misses={!r}, " \
+               "evictions={!r})".format(type(self).__name__, self.max_size, self.size,
+                                        self.hits, self.misses, self.evictions)
+
+    def __len__(self):
+        return len(self._instances)
+
+    def __contains__(self, build: Hashable):
+        return build in self._instances
+
+    def __getitem__(self, build: Hashable):
+        """
+        Returns the instance built for :code:`build`, raising a
+        :py:exc:`KeyError` if it is not cached.
+        """
+        with self._lock:
+            try:
+                instance, _ = self._instances[build]
+            except KeyError:
+                self.misses += 1
+                raise
+            self._instances.move_to_end(build)
+            self.hits += 1
+            return instance
+
+    def __setitem__(self, build: Hashable, instance):
+        cost = self._cost(instance) if self._cost is not None else 1
+        with self._lock:
+            previous = self._instances.pop(build, None)
+            if previous is not None:
+                self.size -= previous[1]
+            # Too costly instances are never cached.
+            if cost > self.max_size:
+                return
+            while self._instances and self.size + cost > self.max_size:
+                _, (_, evicted_cost) = self._instances.popitem(last=False)
+                self.size -= evicted_cost
+                self.evictions += 1
+            self._instances[build] = (instance, cost)
+            self.size += cost
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Ratio of the instances retrieved from the cache, 0 if none was
+        requested yet.
+        """
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.
+
+    def clear(self):
+        """
+        Evicts all instances. Statistics are kept.
+        """
+        with self._lock:
+            self._instances.clear()
+            self.size = 0
@@ -12,4 +12,6 @@ cdef class Build:
     cdef:
         readonly object dependency
         readonly dict kwargs
-        int _hash
+        tuple _key
+        Py_ssize_t _hash  # Same size as Py_hash_t
+        object __weakref__
@@ -1,8 +1,15 @@
-from typing import Callable, Dict, Hashable, Optional
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
 
-from .._internal.utils import SlotsReprMixin
-from ..core import DependencyContainer, DependencyInstance, DependencyProvider
-from ..exceptions import DuplicateDependencyError
+import inspect
+import weakref
+
+from .cache import BuildCache
+from .._internal.utils import frozen_key, is_coroutine_factory, SlotsReprMixin
+from .._internal.wrapper import get_injected_dependencies
+from ..core import (DependencyContainer, DependencyDescription, DependencyInstance,
+                    DependencyProvider)
+from ..exceptions import (AsyncDependencyError, DependencyNotFoundError,
+                          DuplicateDependencyError)
 
 
 class Build(SlotsReprMixin):
@@ -23,10 +30,13 @@ class Build(SlotsReprMixin):
 
     With no arguments, that is to say :code:`Build(x)`, it is equivalent to
     :code:`x` for the :py:class:`~.core.DependencyContainer`.
-    """
-    __slots__ = ('dependency', 'kwargs', '_hash')
 
-    __str__ = SlotsReprMixin.__repr__
+    Two of them are equal if they have the same dependency and arguments.
+    Lists, tuples, dicts and sets are compared on their content, while any
+    other unhashable argument, a :code:`bytearray` for example, is compared by
+    identity: equal but distinct objects give different dependencies.
+    """
+    __slots__ = ('dependency', 'kwargs', '_key', '_hash', '__weakref__')
 
     def __init__(self, dependency: Hashable, **kwargs):
         """
@@ -41,26 +51,57 @@ class Build(SlotsReprMixin):
         if not self.kwargs:
             raise TypeError("Without additional arguments, Build must not be used.")
 
-        try:
-            # Try most precise hash first
-            self._hash = hash((self.dependency, tuple(self.kwargs.items())))
-        except TypeError:
-            # If type error, return the best error-free hash possible
-            self._hash = hash((self.dependency, tuple(self.kwargs.keys())))
+        # Unhashable arguments, such as lists or dicts, are hashed on their
+        # content so that different values do not collide.
+        self._key = (dependency, frozenset((name, frozen_key(value))
+                                           for name, value in kwargs.items()))
+        self._hash = hash(self._key)
+
+    @classmethod
+    def interned(cls, dependency: Hashable, **kwargs) -> 'Build':
+        """
+        Returns the same instance for equal arguments, as long as it is
+        referenced somewhere. Retrieving it from the
+        :py:class:`~.core.DependencyContainer` only requires an identity check
+        instead of comparing all arguments.
+
+        .. doctest::
+
+            >>> from antidote import Build
+            >>> Build.interned(list, x=[1]) is Build.interned(list, x=[1])
+            True
+
+        """
+        build = cls(dependency, **kwargs)
+        return _interned.setdefault(build, build)
 
     def __hash__(self):
         return self._hash
 
+    def __repr__(self):
+        return "{}(dependency={!r}, kwargs={!r})".format(type(self).__name__,
+                                                         self.dependency,
+                                                         self.kwargs)
+
+    __str__ = __repr__
+
     def __eq__(self, other):
-        return isinstance(other, Build) \
-               and (self.dependency is other.dependency
-                    or self.dependency == other.dependency) \
-               and self.kwargs == self.kwargs  # noqa
+        return (self is other
+                or (isinstance(other, Build)
+                    and self._hash == other._hash
+                    and self._key == other._key))
+
+
+# Interned builds, see Build.interned()
+_interned = weakref.WeakValueDictionary()  # type: weakref.WeakValueDictionary
 
 
 class FactoryProvider(DependencyProvider):
     """
     Provider managing factories. Also used to register classes directly.
+
+    Factories may be coroutine functions, in which case their dependency can
+    only be retrieved with :py:meth:`~.core.DependencyContainer.aget`.
     """
     bound_dependency_types = (Build,)
 
@@ -81,12 +122,78 @@ class FactoryProvider(DependencyProvider):
         except KeyError:
             return None
 
-        if builder.factory_dependency is not None:
-            f = self._container.safe_provide(builder.factory_dependency)
+        build_cache = builder.build_cache
+        if build_cache is not None and isinstance(dependency, Build):
+            try:
+                return DependencyInstance(build_cache[dependency], singleton=False)
+            except KeyError:
+                pass
+
+        # Read once, as other threads may rewrite the builder meanwhile.
+        factory_dependency = builder.factory_dependency
+        if factory_dependency is not None:
+            f = self._container.safe_provide(factory_dependency)
+            factory = f.instance
+            is_async = is_coroutine_factory(factory)
+            if f.singleton:
+                # factory_dependency is cleared last, so that other threads
+                # never use the factory before it is fully set.
+                builder.factory = factory
+                builder.is_async = is_async
+                builder.factory_dependency = None
+        else:
+            factory = builder.factory
+            is_async = builder.is_async
+
+        if is_async:
+            raise AsyncDependencyError(
+                "{!r} is built by a coroutine, use aget() instead.".format(dependency))
+
+        if isinstance(dependency, Build):
+            if builder.takes_dependency:
+                instance = factory(dependency.dependency, **dependency.kwargs)
+            else:
+                instance = factory(**dependency.kwargs)
+            if build_cache is not None:
+                # Kept by the cache instead of the container.
+                build_cache[dependency] = instance
+                return DependencyInstance(instance, singleton=False)
+        else:
+            if builder.takes_dependency:
+                instance = factory(dependency)
+            else:
+                instance = factory()
+
+        return DependencyInstance(instance,
+                                  singleton=builder.singleton,
+                                  scoped=builder.scoped)
+
+    async def aprovide(self, dependency: Hashable) -> Optional[DependencyInstance]:
+        try:
+            if isinstance(dependency, Build):
+                builder = self._builders[dependency.dependency]  # type: Builder
+            else:
+                builder = self._builders[dependency]
+        except KeyError:
+            return None
+
+        build_cache = builder.build_cache
+        if build_cache is not None and isinstance(dependency, Build):
+            try:
+                return DependencyInstance(build_cache[dependency], singleton=False)
+            except KeyError:
+                pass
+
+        factory_dependency = builder.factory_dependency
+        if factory_dependency is not None:
+            f = await self._container.aprovide(factory_dependency)
+            if f is None:
+                raise DependencyNotFoundError(factory_dependency)
             factory = f.instance
             if f.singleton:
+                builder.factory = factory
+                builder.is_async = is_coroutine_factory(factory)
                 builder.factory_dependency = None
-                builder.factory = f.instance
         else:
             factory = builder.factory
 
@@ -101,10 +208,67 @@ class FactoryProvider(DependencyProvider):
             else:
                 instance = factory()
 
+        if inspect.isawaitable(instance):
+            instance = await instance
+
+        if build_cache is not None and isinstance(dependency, Build):
+            build_cache[dependency] = instance
+            return DependencyInstance(instance, singleton=False)
+
         return DependencyInstance(instance,
-                                  singleton=builder.singleton)
+                                  singleton=builder.singleton,
+                                  scoped=builder.scoped)
 
-    def register_class(self, class_: type, singleton: bool = True):
+    def dependencies(self) -> Iterable[Hashable]:
+        return tuple(self._builders.keys())
+
+    def registrations(self) -> List[Tuple[Hashable, Hashable, bool, bool, bool]]:
+        """
+        Returns how each dependency is built, as tuples of the dependency, its
+        factory or the dependency of the latter, singleton, scoped and
+        takes_dependency. Used by :py:mod:`~antidote.aot`.
+        """
+        return [
+            (dependency,
+             builder.factory_dependency if builder.factory_dependency is not None
+             else builder.factory,
+             builder.singleton,
+             builder.scoped,
+             builder.takes_dependency)
+            for dependency, builder in self._builders.items()
+        ]
+
+    def describe(self, dependency: Hashable) -> Optional[DependencyDescription]:
+        if isinstance(dependency, Build):
+            builder = self._builders.get(dependency.dependency)
+            provided = dependency.kwargs
+        else:
+            builder = self._builders.get(dependency)
+            provided = {}
+        if builder is None:
+            return None
+
+        offset = 1 if builder.takes_dependency else 0
+        dependencies = []  # type: List[Hashable]
+        if builder.factory_dependency is not None:
+            dependencies.append(builder.factory_dependency)
+            if inspect.isclass(builder.factory_dependency):
+                dependencies.extend(get_injected_dependencies(
+                    builder.factory_dependency.__call__, offset + 1, provided))
+        elif inspect.isclass(builder.factory):
+            dependencies.extend(get_injected_dependencies(
+                builder.factory.__init__, offset + 1, provided))
+        else:
+            dependencies.extend(
+                get_injected_dependencies(builder.factory, offset, provided)
+                or get_injected_dependencies(getattr(builder.factory, '__call__', None),
+                                             offset, provided))
+
+        return DependencyDescription(singleton=builder.singleton,
+                                     dependencies=dependencies)
+
+    def register_class(self, class_: type, singleton: bool = True,
+                       scoped: bool = False, build_cache: BuildCache = None):
         """
         Register a class which is both dependency and factory.
 
@@ -112,16 +276,25 @@ class FactoryProvider(DependencyProvider):
             class_: dependency to register.
             singleton: Whether the dependency should be mark as singleton or
                 not for the :py:class:`~..core.DependencyContainer`.
+            scoped: Whether the dependency should be instantiated only once
+                per :py:class:`~..core.Scope`. Takes precedence over
+                :code:`singleton`.
+            build_cache: :py:class:`~.cache.BuildCache` keeping the instances
+                built with :py:class:`~.Build` instead of the
+                :py:class:`~..core.DependencyContainer`. Requires a singleton.
         """
         self.register_factory(dependency=class_, factory=class_,
-                              singleton=singleton, takes_dependency=False)
+                              singleton=singleton, scoped=scoped,
+                              takes_dependency=False, build_cache=build_cache)
         return class_
 
     def register_factory(self,
                          dependency: Hashable,
                          factory: Callable,
                          singleton: bool = True,
-                         takes_dependency: bool = False):
+                         takes_dependency: bool = False,
+                         scoped: bool = False,
+                         build_cache: BuildCache = None):
         """
         Registers a factory for a dependency.
 
@@ -133,15 +306,24 @@ class FactoryProvider(DependencyProvider):
             takes_dependency: If True, the factory will be given the requested
                 dependency as its first arguments. This allows re-using the
                 same factory for different dependencies.
+            scoped: Whether the dependency should be instantiated only once
+                per :py:class:`~..core.Scope`. Takes precedence over
+                :code:`singleton`.
+            build_cache: :py:class:`~.cache.BuildCache` keeping the instances
+                built with :py:class:`~.Build` instead of the
+                :py:class:`~..core.DependencyContainer`. Requires a singleton.
         """
         if dependency in self._builders:
             raise DuplicateDependencyError(dependency,
                                            self._builders[dependency])
 
         if callable(factory):
-            self._builders[dependency] = Builder(singleton=singleton,
-                                                 takes_dependency=takes_dependency,
-                                                 factory=factory)
+            with self._container.registering(dependency):
+                self._builders[dependency] = Builder(singleton=singleton,
+                                                     takes_dependency=takes_dependency,
+                                                     factory=factory,
+                                                     scoped=scoped,
+                                                     build_cache=build_cache)
         else:
             raise TypeError("factory must be callable, not {!r}.".format(type(factory)))
 
@@ -149,7 +331,9 @@ class FactoryProvider(DependencyProvider):
                                     dependency: Hashable,
                                     factory_dependency: Hashable,
                                     singleton: bool = True,
-                                    takes_dependency: bool = False):
+                                    takes_dependency: bool = False,
+                                    scoped: bool = False,
+                                    build_cache: BuildCache = None):
         """
         Registers a lazy factory (retrieved only at the first instantiation) for
         a dependency.
@@ -162,14 +346,23 @@ class FactoryProvider(DependencyProvider):
             takes_dependency: If True, the factory will be given the requested
                 dependency as its first arguments. This allows re-using the
                 same factory for different dependencies.
+            scoped: Whether the dependency should be instantiated only once
+                per :py:class:`~..core.Scope`. Takes precedence over
+                :code:`singleton`.
+            build_cache: :py:class:`~.cache.BuildCache` keeping the instances
+                built with :py:class:`~.Build` instead of the
+                :py:class:`~..core.DependencyContainer`. Requires a singleton.
         """
         if dependency in self._builders:
             raise DuplicateDependencyError(dependency,
                                            self._builders[dependency])
 
-        self._builders[dependency] = Builder(singleton=singleton,
-                                             takes_dependency=takes_dependency,
-                                             factory_dependency=factory_dependency)
+        with self._container.registering(dependency):
+            self._builders[dependency] = Builder(singleton=singleton,
+                                                 takes_dependency=takes_dependency,
+                                                 factory_dependency=factory_dependency,
+                                                 scoped=scoped,
+                                                 build_cache=build_cache)
 
 
 # TODO: define better __str__()
@@ -180,15 +373,24 @@ class Builder(SlotsReprMixin):
     Only used by the FactoryProvider to store information on how the factory
     has to be used.
     """
-    __slots__ = ('singleton', 'factory', 'takes_dependency', 'factory_dependency')
+    __slots__ = ('singleton', 'scoped', 'factory', 'takes_dependency',
+                 'factory_dependency', 'is_async', 'build_cache')
 
     def __init__(self,
                  singleton: bool,
                  takes_dependency: bool,
                  factory: Optional[Callable] = None,
-                 factory_dependency: Optional[Hashable] = None):
+                 factory_dependency: Optional[Hashable] = None,
+                 scoped: bool = False,
+                 build_cache: Optional[BuildCache] = None):
         assert factory is not None or factory_dependency is not None
-        self.singleton = singleton
+        # A scoped dependency is never a singleton.
+        self.singleton = singleton and not scoped
+        self.scoped = scoped
         self.takes_dependency = takes_dependency
         self.factory = factory
         self.factory_dependency = factory_dependency
+        self.is_async = factory is not None and is_coroutine_factory(factory)
+        if build_cache is not None and not self.singleton:
+            raise ValueError("A build_cache can only be used with a singleton.")
+        self.build_cache = build_cache
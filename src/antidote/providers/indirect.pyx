@@ -1,13 +1,14 @@
 # cython: language_level=3
 # cython: boundscheck=False, wraparound=False, annotation_typing=False
 from enum import Enum
-from typing import Hashable, Dict
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
 
 # @formatter:off
 from cpython.dict cimport PyDict_GetItem
 from cpython.object cimport PyObject
 
 from antidote.core.container cimport DependencyInstance, DependencyProvider
+from ..core import DependencyDescription
 from ..exceptions import DuplicateDependencyError, UndefinedContextError
 # @formatter:on
 
@@ -50,6 +51,45 @@ cdef class IndirectProvider(DependencyProvider):
 
         return None
 
+    def dependencies(self) -> Iterable[Hashable]:
+        return tuple(self._links.keys()) + tuple(self._stateful_links.keys())
+
+    def registrations(self) -> List[Tuple[Hashable, Hashable, Optional[Enum]]]:
+        """
+        Returns all links, as tuples of the dependency, its target and the
+        state for which it is used, if any. Used by :py:mod:`~antidote.aot`.
+        """
+        cdef:
+            StatefulLink stateful_link
+            list registrations = [
+                (dependency, target, None)
+                for dependency, target in self._links.items()
+            ]
+
+        for dependency, stateful_link in self._stateful_links.items():
+            for state, target in stateful_link.targets.items():
+                registrations.append((dependency, target, state))
+        return registrations
+
+    def describe(self, dependency: Hashable) -> Optional[DependencyDescription]:
+        cdef:
+            StatefulLink stateful_link
+
+        try:
+            target = self._links[dependency]
+        except KeyError:
+            try:
+                stateful_link = self._stateful_links[dependency]
+            except KeyError:
+                return None
+            return DependencyDescription(
+                singleton=None,
+                dependencies=(stateful_link.state_dependency,)
+                + tuple(stateful_link.targets.values())
+            )
+        else:
+            return DependencyDescription(singleton=None, dependencies=(target,))
+
     def register(self, dependency: Hashable, target_dependency: Hashable, state: Enum = None):
         cdef:
             StatefulLink stateful_link
@@ -62,19 +102,21 @@ cdef class IndirectProvider(DependencyProvider):
             if dependency in self._stateful_links:
                 raise DuplicateDependencyError(dependency,
                                                self._stateful_links[dependency])
-            self._links[dependency] = target_dependency
+            with self._container.registering(dependency):
+                self._links[dependency] = target_dependency
         elif isinstance(state, Enum):
             try:
                 stateful_link = self._stateful_links[dependency]
             except KeyError:
                 stateful_link = StatefulLink(type(state))
-                self._stateful_links[dependency] = stateful_link
 
             if state in stateful_link.targets:
                 raise DuplicateDependencyError((dependency, state),
                                                stateful_link.targets[state])
 
-            stateful_link.targets[state] = target_dependency
+            with self._container.registering(dependency):
+                stateful_link.targets[state] = target_dependency
+                self._stateful_links[dependency] = stateful_link
         else:
             raise TypeError("profile must be an instance of Flag or be None, "
                             "not a {!r}".format(type(state)))
@@ -1,7 +1,8 @@
 from typing import Callable, Dict, Hashable, Optional, Tuple, Union
 
 from .._internal.utils import SlotsReprMixin
-from ..core import DependencyInstance, DependencyProvider
+from .._internal.wrapper import get_injected_dependencies
+from ..core import DependencyDescription, DependencyInstance, DependencyProvider
 
 
 class LazyCall(SlotsReprMixin):
@@ -145,3 +146,24 @@ class LazyCallProvider(DependencyProvider):
                 singleton=dependency._singleton
             )
         return None
+
+    def describe(self, dependency: Hashable) -> Optional[DependencyDescription]:
+        if isinstance(dependency, LazyMethodCallDependency):
+            lazy_method_call = dependency.lazy_method_call
+            method = getattr(dependency.owner, lazy_method_call._method_name, None)
+            return DependencyDescription(
+                singleton=lazy_method_call._singleton,
+                dependencies=[dependency.owner] + get_injected_dependencies(
+                    method,
+                    1 + len(lazy_method_call._args),
+                    lazy_method_call._kwargs
+                )
+            )
+        elif isinstance(dependency, LazyCall):
+            return DependencyDescription(
+                singleton=dependency._singleton,
+                dependencies=get_injected_dependencies(dependency._func,
+                                                       len(dependency._args),
+                                                       dependency._kwargs)
+            )
+        return None
@@ -1,11 +1,13 @@
 # cython: language_level=3
 # cython: boundscheck=False, wraparound=False, annotation_typing=False
-from typing import Callable, Dict, Tuple, Union
+from typing import Callable, Dict, Hashable, Optional, Tuple, Union
 
 # @formatter:off
 from cpython.object cimport PyObject, PyObject_Call, PyObject_GetAttr
 
 from antidote.core.container cimport DependencyInstance, DependencyProvider
+from .._internal.wrapper import get_injected_dependencies
+from ..core import DependencyDescription
 # @formatter:on
 
 
@@ -155,3 +157,33 @@ cdef class LazyCallProvider(DependencyProvider):
                 PyObject_Call(lazy_call._func, lazy_call._args, lazy_call._kwargs),
                 lazy_call._singleton
             )
+
+    def describe(self, dependency: Hashable) -> Optional[DependencyDescription]:
+        cdef:
+            LazyCall lazy_call
+            LazyMethodCall lazy_method_call
+            LazyMethodCallDependency lazy_method_dependency
+
+        if isinstance(dependency, LazyMethodCallDependency):
+            lazy_method_dependency = <LazyMethodCallDependency> dependency
+            lazy_method_call = lazy_method_dependency.lazy_method_call
+            method = getattr(lazy_method_dependency.owner,
+                             lazy_method_call._method_name,
+                             None)
+            return DependencyDescription(
+                singleton=lazy_method_call._singleton,
+                dependencies=[lazy_method_dependency.owner] + get_injected_dependencies(
+                    method,
+                    1 + len(lazy_method_call._args),
+                    lazy_method_call._kwargs
+                )
+            )
+        elif isinstance(dependency, LazyCall):
+            lazy_call = <LazyCall> dependency
+            return DependencyDescription(
+                singleton=lazy_call._singleton,
+                dependencies=get_injected_dependencies(lazy_call._func,
+                                                       len(lazy_call._args),
+                                                       lazy_call._kwargs)
+            )
+        return None
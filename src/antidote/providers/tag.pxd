@@ -10,6 +10,10 @@ cdef class Tag:
 cdef class Tagged:
     cdef:
         readonly str name
+        readonly dict where
+        readonly str order_by
+        frozenset _where
+        Py_ssize_t _hash  # Same size as Py_hash_t
 
 cdef class TaggedDependencies:
     cdef:
@@ -18,9 +22,16 @@ cdef class TaggedDependencies:
         list _dependencies
         list _tags
         list _instances
+        tuple _materialized
 
 cdef class TagProvider(DependencyProvider):
     cdef:
         dict _dependency_to_tag_by_tag_name
+        dict _described_tagged
+        dict _index
+        dict _queries
+        object _lock
 
     cpdef DependencyInstance provide(self, dependency)
+    cdef tuple _cached_query(self, Tagged tagged)
+    cdef list _query(self, Tagged tagged)
@@ -1,8 +1,12 @@
+import collections.abc as c_abc
 import threading
-from typing import (Any, Dict, Hashable, Iterable, Iterator, List, Optional, Union)
+from concurrent.futures import Executor
+from typing import (Any, Dict, Hashable, Iterable, Iterator, List, Mapping, Optional,
+                    Set, Tuple, Union)
 
 from .._internal.utils import SlotsReprMixin
-from ..core import DependencyContainer, DependencyInstance, DependencyProvider
+from ..core import (DependencyContainer, DependencyDescription, DependencyInstance,
+                    DependencyProvider)
 from ..exceptions import DuplicateTagError
 
 
@@ -61,14 +65,39 @@ class Tag(SlotsReprMixin):
 class Tagged(SlotsReprMixin):
     """
     Custom dependency used to retrieve all dependencies tagged with by with the
-    name.
+    name. Two of them are equal if they have the same name and query,
+    matching the same dependencies.
+
+    Dependencies can be restricted to those whose tag has specific attributes
+    and sorted by one of them, only those being instantiated:
+
+    .. doctest::
+
+        >>> from antidote import register, Tag, Tagged, world
+        >>> @register(tags=[Tag('handler', event='created', priority=2)])
+        ... class AuditHandler:
+        ...     pass
+        >>> @register(tags=[Tag('handler', event='created', priority=1)])
+        ... class MailHandler:
+        ...     pass
+        >>> handlers = world.get(Tagged('handler', where={'event': 'created'},
+        ...                             order_by='priority'))
+        >>> [handler.__name__ for handler in handlers.dependencies()]
+        ['MailHandler', 'AuditHandler']
+
     """
-    __slots__ = ('name',)
+    __slots__ = ('name', 'where', 'order_by', '_where', '_hash')
 
-    def __init__(self, name: str):
+    def __init__(self, name: str, where: Mapping[str, Hashable] = None,
+                 order_by: str = None):
         """
         Args:
             name: Name of the tags which shall be retrieved.
+            where: Attributes which the tags must have, with their value.
+                Values must be hashable.
+            order_by: Attribute by which the dependencies are sorted, in
+                descending order if prefixed by :code:`'-'`. Tags without it
+                come last. Defaults to the registration order.
         """
         if not isinstance(name, str):
             raise TypeError("name must be a string")
@@ -76,15 +105,40 @@ class Tagged(SlotsReprMixin):
         if len(name) == 0:
             raise ValueError("name must be a non empty string")
 
+        if where is not None and not isinstance(where, c_abc.Mapping):
+            raise TypeError("where must be a mapping, not {!r}".format(type(where)))
+
+        if not (order_by is None or isinstance(order_by, str)):
+            raise TypeError("order_by must be a string, "
+                            "not {!r}".format(type(order_by)))
+
+        if order_by is not None and len(order_by.lstrip('-')) == 0:
+            raise ValueError("order_by must be a non empty attribute name")
+
         self.name = name
+        self.where = dict(where) if where else None  # type: Optional[Dict[str, Any]]
+        self.order_by = order_by  # type: Optional[str]
+        # Raises a TypeError for unhashable values.
+        self._where = frozenset(where.items()) if where else None
+        self._hash = hash((name, self._where, order_by))
 
-    __str__ = SlotsReprMixin.__repr__
+    def __repr__(self):
+        if self.where is None and self.order_by is None:
+            return "{}(name={!r})".format(type(self).__name__, self.name)
+        return "{}(name={!r}, where={!r}, order_by={!r})".format(
+            type(self).__name__, self.name, self.where, self.order_by)
+
+    __str__ = __repr__
 
     def __hash__(self):
-        return object.__hash__(self)
+        return self._hash
 
     def __eq__(self, other):
-        return object.__eq__(self, other)
+        return (self is other
+                or (isinstance(other, Tagged)
+                    and self.name == other.name
+                    and self._where == other._where
+                    and self.order_by == other.order_by))
 
 
 class TagProvider(DependencyProvider):
@@ -97,6 +151,16 @@ class TagProvider(DependencyProvider):
     def __init__(self, container: DependencyContainer):
         super().__init__(container)
         self._dependency_to_tag_by_tag_name = {}  # type: Dict[str, Dict[Hashable, Tag]]
+        # Tagged described in the graph, updated when their tag is used.
+        self._described_tagged = {}  # type: Dict[str, Set[Tagged]]
+        # Dependencies by the value of an attribute of their tag, for each tag
+        # name and attribute, in registration order. Used to answer queries.
+        self._index = {}  # type: Dict[Tuple[str, str], Dict[Hashable, List[Hashable]]]
+        # Dependencies and tags matching each Tagged by tag name. Discarded
+        # when the tag is used again.
+        self._queries = \
+            {}  # type: Dict[str, Dict[Tagged, Tuple[List[Hashable], List[Tag]]]]
+        self._lock = threading.Lock()
 
     def __repr__(self):
         return "{}(tagged_dependencies={!r})".format(
@@ -108,7 +172,9 @@ class TagProvider(DependencyProvider):
         """
         Returns all dependencies matching the tag name specified with a
         :py:class:`~.dependency.Tagged`. For every other case, :obj:`None` is
-        returned.
+        returned. The query is only run again once a dependency is registered
+        with the tag, but each :py:class:`~.TaggedDependencies` retrieves its
+        own instances.
 
         Args:
             dependency: Only :py:class:`~.dependency.Tagged` is supported, all
@@ -119,21 +185,14 @@ class TagProvider(DependencyProvider):
             :py:class:`~..core.Instance`.
         """
         if isinstance(dependency, Tagged):
-            dependencies = []
-            tags = []
-            dependency_to_tag = self._dependency_to_tag_by_tag_name.get(dependency.name,
-                                                                        {})
-
-            for dependency_, tag in dependency_to_tag.items():
-                dependencies.append(dependency_)
-                tags.append(tag)
+            query = self._queries.get(dependency.name, {}).get(dependency)
+            if query is None:
+                query = self._cached_query(dependency)
 
             return DependencyInstance(
-                TaggedDependencies(
-                    container=self._container,
-                    dependencies=dependencies,
-                    tags=tags
-                ),
+                TaggedDependencies(container=self._container,
+                                   dependencies=query[0],
+                                   tags=query[1]),
                 # Whether the returned dependencies are singletons or not is
                 # their decision to take.
                 singleton=False
@@ -141,6 +200,72 @@ class TagProvider(DependencyProvider):
 
         return None
 
+    def _cached_query(self, tagged: Tagged) -> Tuple[List[Hashable], List[Tag]]:
+        with self._lock:
+            cache = self._queries.setdefault(tagged.name, {})
+            # Another thread may have already run it.
+            query = cache.get(tagged)
+            if query is None:
+                items = self._query(tagged)
+                query = cache[tagged] = ([dependency for dependency, _ in items],
+                                         [tag for _, tag in items])
+
+        return query
+
+    def _query(self, tagged: Tagged) -> List[Tuple[Hashable, Tag]]:
+        """
+        Returns the dependencies matching the Tagged with their tag, ordered
+        as requested.
+        """
+        dependency_to_tag = self._dependency_to_tag_by_tag_name.get(tagged.name, {})
+        if tagged.where is None:
+            items = list(dependency_to_tag.items())
+        else:
+            # Starting from the most selective attribute, the others are
+            # checked on its dependencies only.
+            candidates = min(
+                (self._index.get((tagged.name, attr), {}).get(value, [])
+                 for attr, value in tagged.where.items()),
+                key=len
+            )
+            items = [
+                (dependency, dependency_to_tag[dependency])
+                for dependency in candidates
+                if all(attr in dependency_to_tag[dependency]._attrs
+                       and dependency_to_tag[dependency]._attrs[attr] == value
+                       for attr, value in tagged.where.items())
+            ]
+
+        if tagged.order_by is not None:
+            attr = tagged.order_by.lstrip('-')
+            ordered = [item for item in items if attr in item[1]._attrs]
+            ordered.sort(key=lambda item: item[1]._attrs[attr],
+                         reverse=tagged.order_by.startswith('-'))
+            ordered.extend(item for item in items if attr not in item[1]._attrs)
+            items = ordered
+
+        return items
+
+    def registrations(self) -> List[Tuple[Hashable, Tag]]:
+        """
+        Returns all tagged dependencies, as tuples of the dependency and its
+        tag. Used by :py:mod:`~antidote.aot`.
+        """
+        return [
+            (dependency, tag)
+            for dependency_to_tag in self._dependency_to_tag_by_tag_name.values()
+            for dependency, tag in dependency_to_tag.items()
+        ]
+
+    def describe(self, dependency: Hashable) -> Optional[DependencyDescription]:
+        if isinstance(dependency, Tagged):
+            self._described_tagged.setdefault(dependency.name, set()).add(dependency)
+            return DependencyDescription(
+                singleton=False,
+                dependencies=[dependency_ for dependency_, _ in self._query(dependency)]
+            )
+        return None
+
     def register(self, dependency: Hashable, tags: Iterable[Union[str, Tag]]):
         """
         Mark a dependency with all the supplied tags. Raises
@@ -159,12 +284,22 @@ class TagProvider(DependencyProvider):
             if not isinstance(tag, Tag):
                 raise ValueError("Expecting tag of type Tag, not {}".format(type(tag)))
 
-            if tag.name not in self._dependency_to_tag_by_tag_name:
-                self._dependency_to_tag_by_tag_name[tag.name] = {dependency: tag}
-            elif dependency not in self._dependency_to_tag_by_tag_name[tag.name]:
-                self._dependency_to_tag_by_tag_name[tag.name][dependency] = tag
-            else:
-                raise DuplicateTagError(tag.name)
+            with self._container.registering(
+                    *self._described_tagged.get(tag.name, ())), self._lock:
+                if tag.name not in self._dependency_to_tag_by_tag_name:
+                    self._dependency_to_tag_by_tag_name[tag.name] = {dependency: tag}
+                elif dependency not in self._dependency_to_tag_by_tag_name[tag.name]:
+                    self._dependency_to_tag_by_tag_name[tag.name][dependency] = tag
+                else:
+                    raise DuplicateTagError(tag.name)
+
+                for attr, value in tag._attrs.items():
+                    try:
+                        self._index.setdefault((tag.name, attr), {}) \
+                            .setdefault(value, []).append(dependency)
+                    except TypeError:
+                        pass  # Unhashable values cannot be queried.
+                self._queries.pop(tag.name, None)
 
 
 class TaggedDependencies:
@@ -184,6 +319,8 @@ class TaggedDependencies:
         self._dependencies = dependencies
         self._tags = tags
         self._instances = []  # type: List[Any]
+        # All instances, once they have been retrieved.
+        self._materialized = None  # type: Optional[Tuple[Any, ...]]
 
     def __len__(self):
         return len(self._tags)
@@ -206,6 +343,49 @@ class TaggedDependencies:
         Returns the dependencies, in a stable order for multi-threaded
         environments.
         """
+        if self._materialized is not None:
+            return iter(self._materialized)
+        return self._lazy_instances()
+
+    def materialize(self, executor: Executor = None) -> Tuple[Any, ...]:
+        """
+        Instantiates all the dependencies and returns them in the same order
+        as :py:meth:`.instances`, which only iterates over them afterwards.
+
+        Args:
+            executor: :py:class:`~concurrent.futures.Executor` on which the
+                dependencies not yet instantiated are retrieved concurrently.
+                Defaults to retrieving them one after the other, which is
+                also done within the instantiation of another dependency,
+                such as in a factory, as the executor could wait on it.
+
+        Returns:
+            Tuple of all the instances.
+        """
+        if self._materialized is not None:
+            return self._materialized
+
+        if executor is None or self._container._instantiating():
+            for _ in self._lazy_instances():
+                pass
+        else:
+            start = len(self._instances)
+            futures = [executor.submit(self._container.get, dependency)
+                       for dependency in self._dependencies[start:]]
+            instances = [future.result() for future in futures]
+
+            with self._lock:
+                # Instances added by another thread in the meantime are kept.
+                self._instances.extend(instances[len(self._instances) - start:])
+
+        with self._lock:
+            materialized = self._materialized
+            if materialized is None:
+                materialized = self._materialized = tuple(self._instances)
+
+        return materialized
+
+    def _lazy_instances(self) -> Iterator:
         i = -1
         for i, instance in enumerate(self._instances):
             yield instance
@@ -223,3 +403,8 @@ class TaggedDependencies:
                         )
                 yield self._instances[i]
             i += 1
+
+        if self._materialized is None:
+            with self._lock:
+                if self._materialized is None:
+                    self._materialized = tuple(self._instances)
@@ -1,6 +1,9 @@
 # cython: language_level=3
 # cython: boundscheck=False, wraparound=False, annotation_typing=False
-from typing import Any, Dict, Iterable, Iterator, List, Union, Optional
+import collections.abc as c_abc
+from concurrent.futures import Executor
+from typing import (Any, Dict, Hashable, Iterable, Iterator, List, Mapping, Optional,
+                    Tuple, Union)
 
 # @formatter:off
 from cpython.dict cimport PyDict_GetItem
@@ -10,6 +13,7 @@ from fastrlock.rlock cimport create_fastrlock, lock_fastrlock, unlock_fastrlock
 from antidote.core.container cimport (DependencyContainer, DependencyInstance,
                                       DependencyProvider)
 # @formatter:on
+from ..core import DependencyDescription
 from ..exceptions import DuplicateTagError
 
 cdef class Tag:
@@ -56,20 +60,80 @@ cdef class Tag:
 cdef class Tagged:
     """
     Custom dependency used to retrieve all dependencies tagged with by with the
-    name.
+    name. Two of them are equal if they have the same name and query,
+    matching the same dependencies.
+
+    Dependencies can be restricted to those whose tag has specific attributes
+    and sorted by one of them, only those being instantiated:
+
+    .. doctest::
+
+        >>> from antidote import register, Tag, Tagged, world
+        >>> @register(tags=[Tag('handler', event='created', priority=2)])
+        ... class AuditHandler:
+        ...     pass
+        >>> @register(tags=[Tag('handler', event='created', priority=1)])
+        ... class MailHandler:
+        ...     pass
+        >>> handlers = world.get(Tagged('handler', where={'event': 'created'},
+        ...                             order_by='priority'))
+        >>> [handler.__name__ for handler in handlers.dependencies()]
+        ['MailHandler', 'AuditHandler']
+
     """
-    def __init__(self, str name):
+    def __init__(self, str name, where: Mapping[str, Hashable] = None,
+                 order_by: str = None):
         """
         Args:
             name: Name of the tags which shall be retrieved.
+            where: Attributes which the tags must have, with their value.
+                Values must be hashable.
+            order_by: Attribute by which the dependencies are sorted, in
+                descending order if prefixed by :code:`'-'`. Tags without it
+                come last. Defaults to the registration order.
         """
         if len(name) == 0:
             raise ValueError("name must be a non empty string")
 
+        if where is not None and not isinstance(where, c_abc.Mapping):
+            raise TypeError("where must be a mapping, not {!r}".format(type(where)))
+
+        if not (order_by is None or isinstance(order_by, str)):
+            raise TypeError("order_by must be a string, "
+                            "not {!r}".format(type(order_by)))
+
+        if order_by is not None and len(order_by.lstrip('-')) == 0:
+            raise ValueError("order_by must be a non empty attribute name")
+
         self.name = name
+        self.where = dict(where) if where else None
+        self.order_by = order_by
+        # Raises a TypeError for unhashable values.
+        self._where = frozenset(where.items()) if where else None
+        self._hash = hash((name, self._where, order_by))
 
     def __repr__(self):
-        return "{}(name={!r})".format(type(self).__name__, self.name)
+        if self.where is None and self.order_by is None:
+            return "{}(name={!r})".format(type(self).__name__, self.name)
+        return "{}(name={!r}, where={!r}, order_by={!r})".format(
+            type(self).__name__, self.name, self.where, self.order_by)
+
+    __str__ = __repr__
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        cdef Tagged tagged
+        if self is other:
+            return True
+        if not isinstance(other, Tagged):
+            return False
+        tagged = <Tagged> other
+        return self._hash == tagged._hash \
+               and self.name == tagged.name \
+               and self._where == tagged._where \
+               and self.order_by == tagged.order_by
 
 cdef class TagProvider(DependencyProvider):
     """
@@ -81,6 +145,15 @@ cdef class TagProvider(DependencyProvider):
     def __init__(self, DependencyContainer container):
         super().__init__(container)
         self._dependency_to_tag_by_tag_name = {}  # type: Dict[str, Dict[Any, Tag]]
+        # Tagged described in the graph, updated when their tag is used.
+        self._described_tagged = {}  # type: Dict[str, Set[Tagged]]
+        # Dependencies by the value of an attribute of their tag, for each tag
+        # name and attribute, in registration order. Used to answer queries.
+        self._index = {}  # type: Dict[Tuple[str, str], Dict[Hashable, List[Any]]]
+        # Dependencies and tags matching each Tagged by tag name. Discarded
+        # when the tag is used again.
+        self._queries = {}  # type: Dict[str, Dict[Tagged, Tuple[List, List]]]
+        self._lock = create_fastrlock()
 
     def __repr__(self):
         return "{}(tagged_dependencies={!r})".format(
@@ -92,7 +165,9 @@ cdef class TagProvider(DependencyProvider):
         """
         Returns all dependencies matching the tag name specified with a
         :py:class:`~.dependency.Tagged`. For every other case, :obj:`None` is
-        returned.
+        returned. The query is only run again once a dependency is registered
+        with the tag, but each :py:class:`~.TaggedDependencies` retrieves its
+        own instances.
 
         Args:
             dependency: Only :py:class:`~.dependency.Tagged` is supported, all
@@ -103,38 +178,115 @@ cdef class TagProvider(DependencyProvider):
             :py:class:`~..core.Instance`.
         """
         cdef:
-            list dependencies
-            list tags
-            object dependency_
             Tagged tagged
-            Tag tag
+            tuple query
             PyObject*ptr
 
         if isinstance(dependency, Tagged):
             tagged = <Tagged> dependency
-            dependencies = []
-            tags = []
-            ptr = PyDict_GetItem(self._dependency_to_tag_by_tag_name,
-                                 tagged.name)
-
+            ptr = PyDict_GetItem(self._queries, tagged.name)
             if ptr != NULL:
-                for dependency_, tag in (<dict> ptr).items():
-                    dependencies.append(dependency_)
-                    tags.append(tag)
-
+                ptr = PyDict_GetItem(<dict> ptr, tagged)
+            query = <tuple> ptr if ptr != NULL else self._cached_query(tagged)
             return DependencyInstance.__new__(
                 DependencyInstance,
                 TaggedDependencies.__new__(
                     TaggedDependencies,
                     container=self._container,
-                    dependencies=dependencies,
-                    tags=tags
+                    dependencies=query[0],
+                    tags=query[1]
                 ),
                 # Whether the returned dependencies are singletons or not is
                 # their decision to take.
                 singleton=False
             )
 
+    cdef tuple _cached_query(self, Tagged tagged):
+        cdef:
+            list items
+            dict cache
+            PyObject*ptr
+            tuple query
+
+        lock_fastrlock(self._lock, -1, True)
+        try:
+            cache = self._queries.setdefault(tagged.name, {})
+            # Another thread may have already run it.
+            ptr = PyDict_GetItem(cache, tagged)
+            if ptr != NULL:
+                return <tuple> ptr
+
+            items = self._query(tagged)
+            query = ([dependency for dependency, _ in items],
+                     [tag for _, tag in items])
+            cache[tagged] = query
+            return query
+        finally:
+            unlock_fastrlock(self._lock)
+
+    cdef list _query(self, Tagged tagged):
+        """
+        Returns the dependencies matching the Tagged with their tag, ordered
+        as requested.
+        """
+        cdef:
+            dict dependency_to_tag
+            list items
+            list candidates
+            list ordered
+            str attr
+
+        dependency_to_tag = self._dependency_to_tag_by_tag_name.get(tagged.name, {})
+        if tagged.where is None:
+            items = list(dependency_to_tag.items())
+        else:
+            # Starting from the most selective attribute, the others are
+            # checked on its dependencies only.
+            candidates = min(
+                (self._index.get((tagged.name, attr_), {}).get(value, [])
+                 for attr_, value in tagged.where.items()),
+                key=len
+            )
+            items = [
+                (dependency, dependency_to_tag[dependency])
+                for dependency in candidates
+                if all(attr_ in (<Tag> dependency_to_tag[dependency])._attrs
+                       and (<Tag> dependency_to_tag[dependency])._attrs[attr_] == value
+                       for attr_, value in tagged.where.items())
+            ]
+
+        if tagged.order_by is not None:
+            attr = tagged.order_by.lstrip('-')
+            ordered = [item for item in items if attr in (<Tag> item[1])._attrs]
+            ordered.sort(key=lambda item: (<Tag> item[1])._attrs[attr],
+                         reverse=tagged.order_by.startswith('-'))
+            ordered.extend(item for item in items
+                           if attr not in (<Tag> item[1])._attrs)
+            items = ordered
+
+        return items
+
+    def registrations(self) -> List[Tuple[Hashable, Tag]]:
+        """
+        Returns all tagged dependencies, as tuples of the dependency and its
+        tag. Used by :py:mod:`~antidote.aot`.
+        """
+        return [
+            (dependency, tag)
+            for dependency_to_tag in self._dependency_to_tag_by_tag_name.values()
+            for dependency, tag in dependency_to_tag.items()
+        ]
+
+    def describe(self, dependency: Hashable) -> Optional[DependencyDescription]:
+        if isinstance(dependency, Tagged):
+            self._described_tagged.setdefault(dependency.name, set()).add(dependency)
+            return DependencyDescription(
+                singleton=False,
+                dependencies=[dependency_
+                              for dependency_, _ in self._query(<Tagged> dependency)]
+            )
+        return None
+
     def register(self, dependency, tags: Iterable[Union[str, Tag]]):
         """
         Mark a dependency with all the supplied tags. Raises
@@ -153,12 +305,25 @@ cdef class TagProvider(DependencyProvider):
             if not isinstance(tag, Tag):
                 raise ValueError("Expecting tag of type Tag, not {}".format(type(tag)))
 
-            if tag.name not in self._dependency_to_tag_by_tag_name:
-                self._dependency_to_tag_by_tag_name[tag.name] = {dependency: tag}
-            elif dependency not in self._dependency_to_tag_by_tag_name[tag.name]:
-                self._dependency_to_tag_by_tag_name[tag.name][dependency] = tag
-            else:
-                raise DuplicateTagError(tag.name)
+            with self._container.registering(
+                    *self._described_tagged.get(tag.name, ())):
+                lock_fastrlock(self._lock, -1, True)
+                try:
+                    dependency_to_tag = self._dependency_to_tag_by_tag_name.setdefault(
+                        tag.name, {})
+                    if dependency in dependency_to_tag:
+                        raise DuplicateTagError(tag.name)
+                    dependency_to_tag[dependency] = tag
+
+                    for attr, value in tag._attrs.items():
+                        try:
+                            self._index.setdefault((tag.name, attr), {}) \
+                                .setdefault(value, []).append(dependency)
+                        except TypeError:
+                            pass  # Unhashable values cannot be queried.
+                    self._queries.pop(tag.name, None)
+                finally:
+                    unlock_fastrlock(self._lock)
 
 cdef class TaggedDependencies:
     """
@@ -176,6 +341,8 @@ cdef class TaggedDependencies:
         self._dependencies = dependencies  # type: List[Any]
         self._tags = tags  # type: List[Tag]
         self._instances = []  # type: List[Any]
+        # All instances, once they have been retrieved.
+        self._materialized = None  # type: Optional[Tuple[Any, ...]]
 
     def __len__(self):
         return len(self._dependencies)
@@ -198,6 +365,58 @@ cdef class TaggedDependencies:
         Returns the dependencies, in a stable order for multi-threaded
         environments.
         """
+        if self._materialized is not None:
+            return iter(self._materialized)
+        return self._lazy_instances()
+
+    def materialize(self, executor: Executor = None) -> Tuple[Any, ...]:
+        """
+        Instantiates all the dependencies and returns them in the same order
+        as :py:meth:`.instances`, which only iterates over them afterwards.
+
+        Args:
+            executor: :py:class:`~concurrent.futures.Executor` on which the
+                dependencies not yet instantiated are retrieved concurrently.
+                Defaults to retrieving them one after the other, which is
+                also done within the instantiation of another dependency,
+                such as in a factory, as the executor could wait on it.
+
+        Returns:
+            Tuple of all the instances.
+        """
+        cdef:
+            ssize_t start
+            list futures
+            list instances
+
+        if self._materialized is not None:
+            return self._materialized
+
+        if executor is None or self._container._instantiating():
+            for _ in self._lazy_instances():
+                pass
+        else:
+            start = len(self._instances)
+            futures = [executor.submit((<object> self._container).get, dependency)
+                       for dependency in self._dependencies[start:]]
+            instances = [future.result() for future in futures]
+
+            lock_fastrlock(self._lock, -1, True)
+            try:
+                # Instances added by another thread in the meantime are kept.
+                self._instances.extend(instances[len(self._instances) - start:])
+            finally:
+                unlock_fastrlock(self._lock)
+
+        lock_fastrlock(self._lock, -1, True)
+        try:
+            if self._materialized is None:
+                self._materialized = tuple(self._instances)
+            return self._materialized
+        finally:
+            unlock_fastrlock(self._lock)
+
+    def _lazy_instances(self) -> Iterator[Any]:
         cdef:
             ssize_t n = len(self._instances)
             ssize_t i = 0
@@ -222,3 +441,11 @@ cdef class TaggedDependencies:
 
                 yield instance
             i += 1
+
+        if self._materialized is None:
+            lock_fastrlock(self._lock, -1, True)
+            try:
+                if self._materialized is None:
+                    self._materialized = tuple(self._instances)
+            finally:
+                unlock_fastrlock(self._lock)
@@ -0,0 +1,364 @@
+import asyncio
+
+import pytest
+
+from antidote import factory, register
+from antidote.core import DependencyContainer, inject, ProxyContainer
+from antidote.exceptions import (AsyncDependencyError, DependencyCycleError,
+                                 DependencyInstantiationError, DependencyNotFoundError)
+from antidote.providers.cache import BuildCache
+from antidote.providers.factory import Build, FactoryProvider
+from .utils import DummyProvider
+
+
+class Service:
+    pass
+
+
+class AnotherService:
+    def __init__(self, service=None):
+        self.service = service
+
+
+def run(coroutine):
+    loop = asyncio.get_event_loop_policy().new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+@pytest.fixture()
+def container():
+    container = DependencyContainer()
+    container.register_provider(FactoryProvider(container))
+    container.register_provider(DummyProvider({'name': 'Antidote'}))
+    return container
+
+
+def test_aget(container: DependencyContainer):
+    provider = container.providers[FactoryProvider]
+
+    async def build_service():
+        await asyncio.sleep(0)
+        return Service()
+
+    provider.register_factory(Service, factory=build_service)
+    provider.register_factory(AnotherService, factory=build_service,
+                              singleton=False)
+
+    async def main():
+        service = await container.aget(Service)
+        assert isinstance(service, Service)
+        assert service is await container.aget(Service)
+        assert service is container.get(Service)
+
+        another = await container.aget(AnotherService)
+        assert another is not await container.aget(AnotherService)
+
+        assert 'Antidote' == await container.aget('name')
+        assert container is await container.aget(DependencyContainer)
+
+        with pytest.raises(DependencyNotFoundError):
+            await container.aget('unknown')
+
+    run(main())
+
+    with pytest.raises(DependencyInstantiationError) as exc_info:
+        container.get(AnotherService)
+    assert isinstance(exc_info.value.__cause__, AsyncDependencyError)
+
+
+def test_single_flight(container: DependencyContainer):
+    calls = []
+
+    async def build_service():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return Service()
+
+    container.providers[FactoryProvider].register_factory(Service,
+                                                          factory=build_service)
+
+    async def main():
+        return await asyncio.gather(*[container.aget(Service) for _ in range(10)])
+
+    services = run(main())
+    assert 1 == len(calls)
+    assert all(s is services[0] for s in services)
+
+
+def test_single_flight_error(container: DependencyContainer):
+    calls = []
+
+    async def build_service():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError()
+
+    container.providers[FactoryProvider].register_factory(Service,
+                                                          factory=build_service)
+
+    async def main():
+        return await asyncio.gather(*[container.aget(Service) for _ in range(3)],
+                                    return_exceptions=True)
+
+    errors = run(main())
+    assert 1 == len(calls)
+    assert all(isinstance(e, DependencyInstantiationError) for e in errors)
+
+
+def test_single_flight_cancelled(container: DependencyContainer):
+    calls = []
+
+    async def build_service():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return Service()
+
+    container.providers[FactoryProvider].register_factory(Service,
+                                                          factory=build_service)
+
+    async def main():
+        a = asyncio.ensure_future(container.aget(Service))
+        b = asyncio.ensure_future(container.aget(Service))
+        await asyncio.sleep(0)
+        a.cancel()
+        service = await b
+        assert a.cancelled()
+        assert not b.cancelled()
+        return service
+
+    service = run(main())
+    assert 1 == len(calls)
+    assert service is container.get(Service)
+
+    # The instantiation is not cancelled either with its only waiter.
+    container.providers[FactoryProvider].register_factory(AnotherService,
+                                                          factory=build_service)
+
+    async def cancel_only():
+        a = asyncio.ensure_future(container.aget(AnotherService))
+        await asyncio.sleep(0)
+        a.cancel()
+        await asyncio.sleep(0.02)
+        return a
+
+    assert run(cancel_only()).cancelled()
+    assert 2 == len(calls)
+    assert isinstance(container.get(AnotherService), Service)
+
+
+@pytest.mark.parametrize('is_async', [True, False])
+def test_single_flight_not_singleton(container: DependencyContainer, is_async):
+    calls = []
+
+    if is_async:
+        async def build_service():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return Service()
+    else:
+        def build_service():
+            calls.append(1)
+            return Service()
+
+    container.providers[FactoryProvider].register_factory(Service,
+                                                          factory=build_service,
+                                                          singleton=False)
+
+    async def main():
+        return await asyncio.gather(*[container.aget(Service) for _ in range(3)])
+
+    # Concurrent requests, before and after the dependency is known not to be
+    # a singleton.
+    for n in [3, 6]:
+        services = run(main())
+        assert n == len(calls)
+        assert 3 == len(set(map(id, services)))
+
+
+def test_single_flight_scoped(container: DependencyContainer):
+    calls = []
+
+    async def build_service():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return Service()
+
+    container.providers[FactoryProvider].register_factory(Service,
+                                                          factory=build_service,
+                                                          singleton=False,
+                                                          scoped=True)
+
+    async def in_scope():
+        with container.scope() as scope:
+            services = await asyncio.gather(container.aget(Service),
+                                            container.aget(Service))
+            assert services[0] is services[1]
+            assert services[0] is scope.instances[Service]
+            return services[0]
+
+    async def main():
+        return await asyncio.gather(in_scope(), in_scope(),
+                                    container.aget(Service),
+                                    container.aget(Service))
+
+    services = run(main())
+    assert 4 == len(calls)
+    assert 4 == len(set(map(id, services)))
+
+
+def test_dependency_cycle(container: DependencyContainer):
+    async def build_service():
+        return await container.aget(AnotherService)
+
+    async def build_another_service():
+        return AnotherService(await container.aget(Service))
+
+    provider = container.providers[FactoryProvider]
+    provider.register_factory(Service, factory=build_service)
+    provider.register_factory(AnotherService, factory=build_another_service)
+
+    with pytest.raises(DependencyCycleError):
+        run(container.aget(Service))
+
+
+def test_dependency_cycle_without_contextvars(container: DependencyContainer,
+                                              monkeypatch):
+    from antidote.core import container as container_module
+    monkeypatch.setattr(container_module, '_async_stack',
+                        container_module._TaskStackVar())
+
+    test_dependency_cycle(container)
+
+    class SelfDependent:
+        pass
+
+    async def build_self_dependent():
+        return await container.aget(SelfDependent)
+
+    container.providers[FactoryProvider].register_factory(
+        SelfDependent, factory=build_self_dependent)
+
+    with pytest.raises(DependencyCycleError):
+        run(container.aget(SelfDependent))
+
+
+def test_async_helpers(container: DependencyContainer):
+    @register(container=container)
+    class Config:
+        pass
+
+    @factory(container=container)
+    async def build_service(config: Config) -> Service:
+        assert isinstance(config, Config)
+        return Service()
+
+    @factory(container=container)
+    class AnotherServiceFactory:
+        async def __call__(self, config: Config) -> AnotherService:
+            return AnotherService(config)
+
+    assert isinstance(run(container.aget(Service)), Service)
+    another = run(container.aget(AnotherService))
+    assert another.service is container.get(Config)
+
+
+def test_proxy_container(container: DependencyContainer):
+    proxy_container = ProxyContainer(container, missing=['name'])
+
+    with pytest.raises(DependencyNotFoundError):
+        run(proxy_container.aget('name'))
+
+
+def test_inject(container: DependencyContainer):
+    started = []
+
+    async def wait_for_each_other(cls):
+        started.append(cls)
+        # Only possible if both are instantiated concurrently.
+        while len(started) < 2:
+            await asyncio.sleep(0)
+        return cls()
+
+    provider = container.providers[FactoryProvider]
+    provider.register_factory(Service, factory=wait_for_each_other,
+                              takes_dependency=True)
+    provider.register_factory(AnotherService, factory=wait_for_each_other,
+                              takes_dependency=True)
+
+    @inject(use_names=True, container=container)
+    async def handler(service: Service, another: AnotherService, name, x=None):
+        return service, another, name, x
+
+    async def main():
+        return await asyncio.wait_for(handler(), 1)
+
+    service, another, name, x = run(main())
+    assert service is container.get(Service)
+    assert another is container.get(AnotherService)
+    assert 'Antidote' == name
+    assert x is None
+
+    # Only singletons
+    assert (service, another, 'test', None) == run(handler(name='test'))
+    assert (1, 2, 3, 4) == run(handler(1, 2, 3, 4))
+
+
+def test_inject_method(container: DependencyContainer):
+    container.update_singletons({'x': 1})
+
+    class Dummy:
+        @inject(use_names=True, container=container)
+        async def method(self, x):
+            return self, x
+
+        @inject(use_names=True, container=container)
+        @classmethod
+        async def class_method(cls, x):
+            return cls, x
+
+    dummy = Dummy()
+    assert (dummy, 1) == run(dummy.method())
+    assert (Dummy, 1) == run(Dummy.class_method())
+    assert (dummy, 2) == run(Dummy.method(dummy, 2))
+
+
+def test_inject_not_found(container: DependencyContainer):
+    @inject(dependencies=dict(x='unknown'), container=container)
+    async def f(x):
+        return x  # pragma: no cover
+
+    with pytest.raises(DependencyNotFoundError):
+        run(f())
+
+    proxy_container = ProxyContainer(container, missing=['name'])
+
+    @inject(use_names=True, container=proxy_container)
+    async def g(name):
+        return name  # pragma: no cover
+
+    with pytest.raises(DependencyNotFoundError):
+        run(g())
+
+
+def test_build_cache(container: DependencyContainer):
+    cache = BuildCache(max_size=1)
+
+    async def build_service(service):
+        await asyncio.sleep(0)
+        return AnotherService(service)
+
+    container.providers[FactoryProvider].register_factory(
+        AnotherService, factory=build_service, build_cache=cache)
+
+    async def main():
+        a = await container.aget(Build(AnotherService, service='a'))
+        assert 'a' == a.service
+        assert a is await container.aget(Build(AnotherService, service='a'))
+        await container.aget(Build(AnotherService, service='b'))
+        assert a is not await container.aget(Build(AnotherService, service='a'))
+
+    run(main())
+    assert (1, 3, 2) == (cache.hits, cache.misses, cache.evictions)
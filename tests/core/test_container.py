@@ -1,11 +1,12 @@
+import threading
 from typing import Any
 
 import pytest
 
 from antidote.core import DependencyContainer, DependencyInstance, DependencyProvider
 from antidote.exceptions import (DependencyCycleError, DependencyInstantiationError,
-                                 DependencyNotFoundError)
-from .utils import DummyFactoryProvider, DummyProvider
+                                 DependencyNotFoundError, FrozenContainerError)
+from .utils import DummyFactoryProvider, DummyProvider, GraphProvider
 
 
 class Service:
@@ -185,3 +186,206 @@ def test_bound_dependency_types_conflict():
 
     with pytest.raises(RuntimeError):
         container.register_provider(DummyProvider2(container))
+
+
+def test_not_found_cache(container: DependencyContainer):
+    calls = []
+
+    class CountingProvider(DependencyProvider):
+        def provide(self, dependency):
+            calls.append(dependency)
+
+    container.register_provider(CountingProvider(container))
+
+    assert container.provide('unknown') is None
+    assert container.provide('unknown') is None
+    assert ['unknown'] == calls
+
+    with container.registering():
+        pass
+    assert container.provide('unknown') is None
+    assert ['unknown'] * 2 == calls
+
+    container.update_singletons({'x': 1})
+    assert container.provide('unknown') is None
+    assert ['unknown'] * 3 == calls
+
+    container.register_provider(DummyProvider({'unknown': 2}))
+    assert 2 == container.get('unknown')
+
+
+def test_dispatch_table(container: DependencyContainer):
+    container.register_provider(DummyProvider({'name': 'Antidote'}))
+    factory_provider = DummyFactoryProvider({Service: lambda: Service()})
+    factory_provider.singleton = False
+    container.register_provider(factory_provider)
+
+    assert 'Antidote' == container.get('name')
+    assert isinstance(container.get(Service), Service)
+    assert 2 == container.provider_scans
+    # Singletons are not remembered.
+    assert {Service: factory_provider} == container.dispatch_table
+
+    assert isinstance(container.get(Service), Service)
+    assert 2 == container.provider_scans
+
+    container.register_provider(DummyProvider())
+    assert {} == container.dispatch_table
+
+
+def test_freeze(container: DependencyContainer):
+    class RegistryProvider(DummyFactoryProvider):
+        singleton = False
+
+        def dependencies(self):
+            return tuple(self.data.keys())
+
+    container.register_provider(DummyProvider({'name': 'Antidote'}))
+    container.register_provider(RegistryProvider({Service: lambda: Service()}))
+    assert container.frozen is False
+
+    container.freeze()
+    assert container.frozen is True
+
+    # Registered dependencies do not need any scan.
+    assert isinstance(container.get(Service), Service)
+    assert isinstance(container.get(Service), Service)
+    assert 0 == container.provider_scans
+    assert 'Antidote' == container.get('name')
+    assert 1 == container.provider_scans
+
+    with pytest.raises(FrozenContainerError):
+        container.register_provider(DummyProvider())
+
+    with pytest.raises(FrozenContainerError):
+        with container.registering():
+            pass  # pragma: no cover
+
+    container.update_singletons({'test': 1})
+    assert 1 == container.get('test')
+
+    # Freezing again does nothing.
+    container.freeze()
+    assert container.frozen is True
+    assert isinstance(container.get(Service), Service)
+
+
+def test_frozen_dependency_cycle_error(container: DependencyContainer):
+    provider = DummyFactoryProvider({
+        Service: lambda: Service(container.get(AnotherService)),
+        AnotherService: lambda: AnotherService(container.get(Service)),
+    })
+    provider.singleton = False
+    container.register_provider(provider)
+    container.freeze()
+
+    with pytest.raises(DependencyCycleError):
+        container.get(Service)
+
+    provider.data[AnotherService] = lambda: AnotherService()
+    assert isinstance(container.get(Service), Service)
+    # Now known not to be a singleton.
+    assert isinstance(container.get(Service), Service)
+
+    provider.data[AnotherService] = lambda: AnotherService(container.get(Service))
+    with pytest.raises(DependencyCycleError):
+        container.get(Service)
+
+
+def test_get_many(container: DependencyContainer):
+    container.update_singletons({'name': 'Antidote'})
+    container.register_provider(DummyFactoryProvider({
+        Service: lambda: Service(),
+        ServiceWithNonMetDependency: lambda: ServiceWithNonMetDependency(),
+    }))
+    container.providers[DummyFactoryProvider].singleton = False
+
+    name, service, another_service = container.get_many(['name', Service, Service])
+    assert 'Antidote' == name
+    assert isinstance(service, Service)
+    assert isinstance(another_service, Service)
+    assert service is not another_service
+
+    assert [] == container.get_many([])
+    assert [None] == container.provide_many(['unknown'])
+    assert [None, None] == container.provide_many(['unknown', 'unknown'])
+
+    with pytest.raises(DependencyNotFoundError):
+        container.get_many(['name', 'unknown'])
+
+    with pytest.raises(DependencyInstantiationError):
+        container.get_many(['name', ServiceWithNonMetDependency])
+
+
+def test_warmup(container: DependencyContainer):
+    instantiated = []
+    barrier = threading.Barrier(2, timeout=5)
+
+    def factory(dependency, wait=False):
+        def f():
+            if wait:
+                # Fails unless both branches are instantiated concurrently.
+                barrier.wait()
+            instantiated.append(dependency)
+            return dependency()
+
+        return f
+
+    provider = GraphProvider(
+        data={
+            Service: factory(Service),
+            AnotherService: factory(AnotherService, wait=True),
+            YetAnotherService: factory(YetAnotherService, wait=True),
+            ServiceWithNonMetDependency: factory(ServiceWithNonMetDependency),
+            'link': lambda: container.get(YetAnotherService),
+        },
+        graph={
+            Service: (True, [AnotherService, YetAnotherService, 'unknown']),
+            AnotherService: (True, []),
+            YetAnotherService: (True, ['name']),
+            ServiceWithNonMetDependency: (False, [Service]),
+            'link': (None, [YetAnotherService, 'name']),
+        }
+    )
+    container.update_singletons({'name': 'Antidote'})
+    container.register_provider(provider)
+
+    timings = container.warmup(max_workers=2)
+    assert {Service, AnotherService, YetAnotherService, 'link'} == set(timings)
+    assert all(duration >= 0 for duration in timings.values())
+    assert Service == instantiated[-1]
+    assert ServiceWithNonMetDependency not in instantiated
+    assert container.get('link') is container.get(YetAnotherService)
+
+    # Nothing is left to instantiate
+    assert {} == container.warmup()
+    assert 3 == len(instantiated)
+
+
+def test_warmup_not_singleton_link(container: DependencyContainer):
+    provider = GraphProvider(
+        data={Service: lambda: Service(), 'link': lambda: container.get(Service)},
+        graph={Service: (False, []), 'link': (None, [Service])}
+    )
+    container.register_provider(provider)
+
+    assert {} == container.warmup()
+    assert container.peek('link') is None
+
+
+def test_warmup_dependency_cycle(container: DependencyContainer):
+    provider = GraphProvider(
+        data={
+            Service: lambda: Service(container.get(AnotherService)),
+            AnotherService: lambda: AnotherService(container.get(Service)),
+        },
+        graph={Service: (True, [AnotherService]), AnotherService: (True, [Service])}
+    )
+    container.register_provider(provider)
+
+    with pytest.raises(DependencyCycleError):
+        container.warmup()
+
+    # Cycles in the graph are not necessarily an actual one.
+    provider.data[AnotherService] = lambda: AnotherService()
+    assert {Service, AnotherService} == set(container.warmup())
@@ -0,0 +1,113 @@
+import threading
+
+import pytest
+
+from antidote.core import DependencyContainer
+from .utils import DummyFactoryProvider
+
+
+class Slow:
+    pass
+
+
+class Service:
+    pass
+
+
+@pytest.fixture()
+def started():
+    return threading.Event()
+
+
+@pytest.fixture()
+def release():
+    return threading.Event()
+
+
+@pytest.fixture()
+def container(started: threading.Event, release: threading.Event):
+    container = DependencyContainer()
+
+    def slow():
+        started.set()
+        release.wait()
+        return Slow()
+
+    container.register_provider(DummyFactoryProvider({
+        Slow: slow,
+        Service: lambda: container.get(Slow) and Service(),
+    }))
+    return container
+
+
+def test_lock_contention(container: DependencyContainer,
+                         started: threading.Event,
+                         release: threading.Event):
+    with pytest.raises(RuntimeError):
+        container.lock_contention()
+
+    container.enable_lock_metrics()
+    thread = threading.Thread(target=container.get, args=(Slow,))
+    thread.start()
+    started.wait()
+
+    other = threading.Thread(target=container.get, args=(Service,))
+    other.start()
+    other.join(0.05)
+    release.set()
+    thread.join()
+    other.join()
+
+    contention = container.lock_contention()
+    assert [Slow] == contention.worst()
+    slow = contention.dependencies[Slow]
+    # The waiting thread holds it too, to find the singleton.
+    assert 2 == slow.acquisitions
+    assert 1 == slow.waits
+    assert 0.05 <= slow.wait_time
+    assert 0.05 <= slow.max_hold_time <= slow.hold_time
+    assert slow.wait_time == slow.max_wait_time
+    assert slow.max_hold_time == slow.contended_hold_time
+    assert {Service: slow.wait_time} == slow.waiters
+
+    service = contention.dependencies[Service]
+    assert 1 == service.acquisitions
+    assert 0 == service.waits
+    assert 0 == service.contended_hold_time
+    assert 'waits=1' in repr(contention)
+
+    summary = contention.summary().splitlines()
+    assert 3 == len(summary)
+    assert summary[1].endswith('{}.{}'.format(Slow.__module__, Slow.__qualname__))
+    assert summary[2].endswith('<- {}.{}'.format(Service.__module__,
+                                                 Service.__qualname__))
+
+    # Snapshots are independent
+    container.enable_lock_metrics()  # no-op
+    container.get(Service)
+    assert 2 == contention.dependencies[Slow].acquisitions
+
+    container.disable_lock_metrics()
+    with pytest.raises(RuntimeError):
+        container.lock_contention()
+
+
+def test_direct_waiter(container: DependencyContainer,
+                       started: threading.Event,
+                       release: threading.Event):
+    container.enable_lock_metrics()
+    thread = threading.Thread(target=container.get, args=(Slow,))
+    thread.start()
+    started.wait()
+
+    other = threading.Thread(target=container.get, args=(Slow,))
+    other.start()
+    other.join(0.01)
+    release.set()
+    thread.join()
+    other.join()
+
+    contention = container.lock_contention()
+    assert [None] == list(contention.dependencies[Slow].waiters)
+    assert contention.summary().splitlines()[2].endswith('<- (direct)')
+    assert [] == contention.worst(0)
@@ -0,0 +1,149 @@
+import json
+
+import pytest
+
+from antidote.core import DependencyContainer, DependencyDescription, ProxyContainer
+from .utils import GraphProvider, DummyProvider
+
+
+class Service:
+    pass
+
+
+class AnotherService:
+    pass
+
+
+@pytest.fixture()
+def container():
+    return DependencyContainer()
+
+
+def test_description_repr():
+    description = DependencyDescription(True, [Service])
+    assert (Service,) == description.dependencies
+    assert repr(Service) in repr(description)
+
+
+def test_graph(container: DependencyContainer):
+    provider = GraphProvider(
+        data={Service: None, AnotherService: None},
+        graph={Service: (True, [AnotherService, 'name']),
+               AnotherService: (False, ['name'])}
+    )
+    container.update_singletons({'name': 'Antidote'})
+    container.register_provider(provider)
+    graph = container.graph
+
+    assert {Service, AnotherService, 'name'} == set(graph)
+    assert 3 == len(graph)
+    assert 'name' in graph
+    assert 'unknown' not in graph
+    assert repr(graph).startswith('DependencyGraph')
+
+    assert (AnotherService, 'name') == graph.dependencies(Service)
+    assert () == graph.dependencies('name')
+    assert () == graph.dependencies('unknown')
+    assert {Service, AnotherService} == set(graph.dependents('name'))
+    assert (Service,) == graph.dependents(AnotherService)
+    assert () == graph.dependents(Service)
+    assert {Service, AnotherService, 'name'} == graph.subtree(Service)
+    assert {'unknown'} == graph.subtree('unknown')
+
+    assert provider is graph.provider(Service)
+    assert graph.provider('name') is None
+    assert graph.describe('name') is None
+    assert graph.describe(AnotherService).singleton is False
+
+
+def test_incremental_update(container: DependencyContainer):
+    provider = GraphProvider(data={Service: None},
+                             graph={Service: (True, [AnotherService])})
+    container.register_provider(provider)
+    assert container.graph.describe(AnotherService) is None
+
+    calls = []
+    describe = provider.describe
+
+    def counting_describe(dependency):
+        calls.append(dependency)
+        return describe(dependency)
+
+    provider.describe = counting_describe
+    provider.graph[AnotherService] = (True, ['name'])
+    with container.registering(AnotherService):
+        provider.data[AnotherService] = None
+
+    assert ('name',) == container.graph.dependencies(AnotherService)
+    # Only the registered dependency and the new one are described.
+    assert [AnotherService, 'name'] == calls
+
+    # Edges are replaced.
+    provider.graph[Service] = (True, ['name'])
+    with container.registering(Service):
+        pass
+    assert ('name',) == container.graph.dependencies(Service)
+    assert () == container.graph.dependents(AnotherService)
+
+
+def test_new_provider(container: DependencyContainer):
+    container.register_provider(GraphProvider(data={Service: None},
+                                              graph={Service: (True, ['lazy'])}))
+    assert container.graph.provider('lazy') is None
+
+    # Bound dependencies, never returned by dependencies(), are described too.
+    provider = GraphProvider(graph={'lazy': (True, [])})
+    container.register_provider(provider)
+    assert provider is container.graph.provider('lazy')
+
+
+def test_lazy_provider_dependencies(container: DependencyContainer):
+    calls = []
+
+    class CountingProvider(GraphProvider):
+        def dependencies(self):
+            calls.append(1)
+            return super().dependencies()
+
+    container.register_provider(CountingProvider(data={Service: None},
+                                                 graph={Service: (True, [])}))
+    # Dependencies are only enumerated when the graph is queried.
+    assert [] == calls
+    assert ProxyContainer(container).providers
+    assert [] == calls
+
+    assert Service in container.graph
+    assert [1] == calls
+    assert Service in container.graph
+    assert [1] == calls
+
+
+def test_export(container: DependencyContainer):
+    container.register_provider(DummyProvider({}))
+    container.register_provider(GraphProvider(
+        data={Service: None, 'a"b': None},
+        graph={Service: (True, ['a"b', 'name']), 'a"b': (False, [])}
+    ))
+
+    data = json.loads(container.graph.to_json())
+    labels = {node['label']: node for node in data['nodes']}
+    service_label = '{}.{}'.format(Service.__module__, Service.__qualname__)
+    assert {service_label, repr('a"b'), repr('name')} == set(labels)
+    assert {'id': labels[service_label]['id'],
+            'label': service_label,
+            'provider': 'GraphProvider',
+            'singleton': True} == labels[service_label]
+    assert labels[repr('name')]['provider'] is None
+    assert labels[repr('name')]['singleton'] is None
+    assert 2 == len(data['edges'])
+    assert {'source': labels[service_label]['id'],
+            'target': labels[repr('name')]['id']} in data['edges']
+
+    dot = container.graph.to_dot()
+    assert dot.startswith('digraph antidote {\n')
+    assert dot.endswith('}\n')
+    assert '[label="{}", shape=box];'.format(service_label) in dot
+    assert '''[label="'a\\"b'", shape=box, style=dashed];''' in dot
+    assert '''[label="'name'", shape=plaintext];''' in dot
+    assert '{} -> {};'.format(labels[service_label]['id'],
+                              labels[repr('name')]['id']) in dot
@@ -1,9 +1,14 @@
-import pytest
+import threading
+import time
 import typing
 
+import pytest
+
 from antidote._internal.argspec import Arguments
-from antidote.core import DependencyContainer, inject
+from antidote.core import (DependencyContainer, DependencyListener, inject,
+                           ProxyContainer)
 from antidote.exceptions import DependencyNotFoundError
+from .utils import DummyFactoryProvider
 
 
 class Service:
@@ -328,3 +333,128 @@ def test_already_injected():
     # When the function has already its arguments injected, the same function should
     # be returned
     assert injected_f is f
+
+
+def test_cached_singletons():
+    container = DependencyContainer()
+    container.update_singletons(dict(x=1))
+    provider = DummyFactoryProvider({Service: lambda: Service()})
+    provider.singleton = False
+    container.register_provider(provider)
+
+    @inject(dependencies=('x',), container=container)
+    def f(x):
+        return x
+
+    @inject(dependencies=('x', Service), container=container)
+    def g(x, service):
+        return x, service
+
+    class A:
+        @inject(dependencies=(None, 'x'), container=container)
+        def method(self, x):
+            return x
+
+    assert 1 == f()
+    assert 1 == f()
+    assert 1 == A().method()
+    assert 1 == A().method()
+    assert g()[1] is not g()[1]
+
+    container.update_singletons(dict(x=2))
+    assert 2 == f()
+    assert 2 == A().method()
+    assert (2, 3) == (f(), f(3))
+
+    proxy = ProxyContainer(container, dependencies=dict(x=3))
+    with container.override(proxy):
+        assert 3 == f()
+        proxy.update_singletons(dict(x=4))
+        assert 4 == f()
+    assert 2 == f()
+
+    listened = []
+
+    class Listener(DependencyListener):
+        def on_singleton_hit(self, dependency, dependency_instance):
+            listened.append(dependency)
+
+    container.add_listener(Listener())
+    f()
+    f()
+    assert ['x', 'x'] == listened
+
+    container.register_provider(DummyFactoryProvider({'y': lambda: 5}))
+    assert 2 == f()
+
+
+def test_cached_singletons_bound_and_unbound():
+    container = DependencyContainer()
+    container.update_singletons(dict(x=1))
+    n = 15  # Injected argument included, fills the 16 vectorcall slots.
+
+    namespace = dict()
+    exec("def method(self, {}, x):\n    return x".format(
+        ", ".join("a{}".format(i) for i in range(n))), namespace)
+
+    class A:
+        method = inject(namespace['method'], dependencies=dict(x='x'),
+                        container=container)
+
+    a = A()
+    args = list(range(n))
+    assert 1 == a.method(*args)
+    assert 1 == a.method(*args)
+    # Same number of arguments to inject, with one more positional argument.
+    assert 1 == A.method(a, *args)
+    assert 1 == A.method(a, *args)
+
+
+def test_lazy(monkeypatch):
+    container = DependencyContainer()
+    container.update_singletons(dict(x=1))
+    from_method = Arguments.from_method
+    analyzed = []
+
+    def counting_from_method(func):
+        analyzed.append(func)
+        time.sleep(0.01)  # Let all threads wait on the first build.
+        return from_method(func)
+
+    monkeypatch.setattr(Arguments, 'from_method', counting_from_method)
+
+    @inject(dependencies=('x',), container=container, lazy=True)
+    def f(x):
+        return x
+
+    @inject(container=container, lazy=True)
+    def g(x):
+        return x
+
+    assert [] == analyzed
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(f()))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert [1] * 5 == results
+    assert [f.__wrapped__] == analyzed
+    assert (1, 2) == (f(), f(2))
+    assert 1 == len(analyzed)
+
+    # Nothing to inject, yet still wrapped.
+    assert g is not g.__wrapped__
+    assert 3 == g(3)
+    with pytest.raises(TypeError):
+        g()
+
+    @inject(dependencies=dict(unknown='x'), container=container, lazy=True)
+    def h(x):
+        return x
+
+    # Errors are only raised on first call.
+    with pytest.raises(ValueError):
+        h()
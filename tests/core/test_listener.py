@@ -0,0 +1,153 @@
+import pytest
+
+from antidote.core import DependencyContainer, DependencyListener, inject
+from antidote.exceptions import DependencyInstantiationError
+from .utils import DummyFactoryProvider, DummyProvider
+
+
+class Service:
+    pass
+
+
+class RecordingListener(DependencyListener):
+    def __init__(self):
+        self.events = []
+
+    def before_provide(self, dependency):
+        self.events.append(('before', dependency))
+
+    def after_provide(self, dependency, dependency_instance):
+        self.events.append(('after', dependency, dependency_instance is not None))
+
+    def on_singleton_hit(self, dependency, dependency_instance):
+        self.events.append(('hit', dependency))
+
+    def on_instantiation(self, dependency, dependency_instance, provider, duration):
+        assert duration >= 0
+        self.events.append(('instantiation', dependency, type(provider)))
+
+    def on_not_found(self, dependency):
+        self.events.append(('not_found', dependency))
+
+    def on_error(self, dependency, error):
+        self.events.append(('error', dependency, type(error)))
+
+
+@pytest.fixture()
+def container():
+    container = DependencyContainer()
+    container.register_provider(DummyFactoryProvider({Service: lambda: Service()}))
+    return container
+
+
+def test_events(container: DependencyContainer):
+    listener = RecordingListener()
+    container.add_listener(listener)
+    assert (listener,) == container.listeners
+
+    container.get(Service)
+    assert [('before', Service),
+            ('instantiation', Service, DummyFactoryProvider),
+            ('after', Service, True)] == listener.events
+
+    listener.events.clear()
+    container.get(Service)
+    assert [('before', Service),
+            ('hit', Service),
+            ('after', Service, True)] == listener.events
+
+    listener.events.clear()
+    assert container.provide('unknown') is None
+    assert [('before', 'unknown'),
+            ('not_found', 'unknown'),
+            ('after', 'unknown', False)] == listener.events
+
+
+def test_not_singleton(container: DependencyContainer):
+    container.providers[DummyFactoryProvider].singleton = False
+    listener = RecordingListener()
+    container.add_listener(listener)
+
+    container.get(Service)
+    container.get(Service)
+    assert 2 == listener.events.count(('instantiation', Service, DummyFactoryProvider))
+
+    listener.events.clear()
+    container.freeze()
+    container.get(Service)
+    assert ('instantiation', Service, DummyFactoryProvider) in listener.events
+
+
+def test_bound_dependency_types(container: DependencyContainer):
+    class Custom:
+        pass
+
+    class CustomProvider(DummyProvider):
+        bound_dependency_types = (Custom,)
+
+    custom = Custom()
+    container.register_provider(CustomProvider({custom: 1}))
+    listener = RecordingListener()
+    container.add_listener(listener)
+
+    assert 1 == container.get(custom)
+    assert ('instantiation', custom, CustomProvider) in listener.events
+
+
+def test_provide_many(container: DependencyContainer):
+    listener = RecordingListener()
+    container.add_listener(listener)
+    container.update_singletons({'name': 'Antidote'})
+
+    @inject(dependencies=('name', Service), container=container)
+    def f(name, service):
+        return name, service
+
+    name, service = f()
+    assert 'Antidote' == name
+    assert ('hit', 'name') in listener.events
+    assert ('instantiation', Service, DummyFactoryProvider) in listener.events
+
+
+def test_error(container: DependencyContainer):
+    def fail():
+        raise RuntimeError()
+
+    container.register_provider(DummyFactoryProvider({'fail': fail}))
+    listener = RecordingListener()
+    container.add_listener(listener)
+
+    with pytest.raises(DependencyInstantiationError):
+        container.get('fail')
+    assert [('before', 'fail'),
+            ('error', 'fail', DependencyInstantiationError)] == listener.events
+
+
+def test_remove_listener(container: DependencyContainer):
+    listener = RecordingListener()
+    other = RecordingListener()
+    container.add_listener(listener)
+    container.add_listener(other)
+
+    container.remove_listener(listener)
+    assert (other,) == container.listeners
+    container.get(Service)
+    assert [] == listener.events
+    assert other.events
+
+    container.remove_listener(other)
+    assert () == container.listeners
+    other.events.clear()
+    container.get(Service)
+    assert [] == other.events
+
+    with pytest.raises(ValueError):
+        container.remove_listener(other)
+
+
+def test_default_listener(container: DependencyContainer):
+    # Does nothing by default
+    container.add_listener(DependencyListener())
+    container.get(Service)
+    container.get(Service)
+    assert container.provide('unknown') is None
@@ -139,3 +139,56 @@ def test_context_missing():
 
     with pytest.raises(DependencyNotFoundError):
         proxy_container.get('test')
+
+
+def test_context_missing_many():
+    container = DependencyContainer()
+    container.update_singletons({'test': 1, 'name': 'Antidote'})
+
+    proxy_container = ProxyContainer(container, missing=['name'])
+
+    assert [1] == proxy_container.get_many(['test'])
+
+    with pytest.raises(DependencyNotFoundError):
+        proxy_container.get_many(['test', 'name'])
+
+
+def test_read_through():
+    container = DependencyContainer()
+    container.update_singletons({'test': 1})
+    proxy_container = ProxyContainer(container, exclude=['excluded'])
+
+    container.update_singletons({'name': 'Antidote', 'excluded': 1})
+    assert 'Antidote' == proxy_container.get('name')
+    assert ['Antidote', 1] == proxy_container.get_many(['name', 'test'])
+    assert {'name', 'test', DependencyContainer} <= set(proxy_container.singletons)
+    assert proxy_container is proxy_container.get(DependencyContainer)
+
+    with pytest.raises(DependencyNotFoundError):
+        proxy_container.get('excluded')
+
+    proxy_container.update_singletons({'name': 'proxy'})
+    assert 'proxy' == proxy_container.get('name')
+    assert 'Antidote' == container.get('name')
+
+
+def test_override():
+    container = DependencyContainer()
+    container.register_provider(DummyProvider({'name': 'Antidote'}))
+    container.update_singletons({'test': 1})
+    proxy_container = ProxyContainer(container, dependencies={'test': 2})
+
+    with container.override(proxy_container):
+        assert 2 == container.get('test')
+        assert 'Antidote' == container.get('name')
+        assert [2, 'Antidote'] == container.get_many(['test', 'name'])
+
+        with container.override(ProxyContainer(container, missing=['name'])):
+            with pytest.raises(DependencyNotFoundError):
+                container.get('name')
+
+        assert 'Antidote' == container.get('name')
+
+    assert 1 == container.get('test')
+    assert container.peek('test').instance == 1
+    assert container.peek('unknown') is None
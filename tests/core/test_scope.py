@@ -0,0 +1,80 @@
+import threading
+
+import pytest
+
+from antidote.core import DependencyContainer, DependencyInstance, DependencyProvider
+from antidote.providers.factory import FactoryProvider
+
+
+class Service:
+    pass
+
+
+class ScopedProvider(DependencyProvider):
+    def provide(self, dependency):
+        if dependency is Service:
+            return DependencyInstance(Service(), scoped=True)
+
+
+@pytest.fixture(params=[False, True], ids=['default', 'frozen'])
+def container(request):
+    container = DependencyContainer()
+    container.register_provider(ScopedProvider(container))
+    if request.param:
+        container.freeze()
+    return container
+
+
+def test_scope(container: DependencyContainer):
+    assert container.current_scope is None
+    # Without any scope, instantiated at each request.
+    assert container.get(Service) is not container.get(Service)
+
+    with container.scope() as scope:
+        assert scope is container.current_scope
+        service = container.get(Service)
+        assert service is container.get(Service)
+        assert {Service: service} == scope.instances
+
+        with container.scope() as nested_scope:
+            assert nested_scope is container.current_scope
+            assert service is not container.get(Service)
+
+        assert scope is container.current_scope
+        assert service is container.get(Service)
+
+    assert container.current_scope is None
+    assert service is not container.get(Service)
+
+    with container.scope():
+        assert service is not container.get(Service)
+
+
+def test_scope_per_thread(container: DependencyContainer):
+    services = []
+
+    def worker():
+        assert container.current_scope is None
+        with container.scope():
+            services.append(container.get(Service))
+
+    with container.scope():
+        service = container.get(Service)
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+    assert 1 == len(services)
+    assert service is not services[0]
+
+
+def test_scoped_factory():
+    container = DependencyContainer()
+    provider = FactoryProvider(container)
+    container.register_provider(provider)
+    provider.register_class(Service, scoped=True)
+
+    with container.scope():
+        assert container.get(Service) is container.get(Service)
+
+    assert Service not in container.singletons
@@ -0,0 +1,110 @@
+import pytest
+
+from antidote.core import DependencyContainer
+from antidote.core.stats import Histogram
+from .utils import DummyFactoryProvider
+
+
+class Service:
+    pass
+
+
+class Session:
+    pass
+
+
+@pytest.fixture()
+def container():
+    container = DependencyContainer()
+    container.register_provider(DummyFactoryProvider({Service: lambda: Service()}))
+    provider = DummyFactoryProvider({Session: lambda: Session()})
+    provider.singleton = False
+    container.register_provider(provider)
+    return container
+
+
+def test_histogram():
+    histogram = Histogram([0.1, 1])
+    for value in [0.05, 0.1, 0.5, 2]:
+        histogram.observe(value)
+
+    assert 4 == histogram.count
+    assert pytest.approx(2.65) == histogram.sum
+    assert [(0.1, 2), (1, 3), (float('inf'), 4)] == histogram.cumulative_counts()
+    assert 'count=4' in repr(histogram)
+
+    copy = histogram.copy()
+    copy.observe(0)
+    assert 4 == histogram.count
+    assert 5 == copy.count
+
+
+def test_stats(container: DependencyContainer):
+    with pytest.raises(RuntimeError):
+        container.stats()
+
+    container.enable_stats(buckets=[1.0, 0.5])
+    container.enable_stats()  # no-op
+    assert 1 == len(container.listeners)
+
+    for _ in range(3):
+        container.get(Service)
+        container.get(Session)
+    container.provide('unknown')
+
+    stats = container.stats()
+    assert {Service: 2} == stats.singleton_hits
+    assert {Service: 1} == stats.singleton_misses
+    assert {Session: 3} == stats.builds
+    assert {'unknown': 1} == stats.not_found
+    assert 1 == stats.latencies[Service].count
+    assert 3 == stats.latencies[Session].count
+    assert (0.5, 1.0) == stats.latencies[Session].buckets
+    assert 4 == stats.provider_latencies['DummyFactoryProvider'].count
+    assert 'builds=3' in repr(stats)
+
+    # Snapshots are independent
+    container.get(Session)
+    assert {Session: 3} == stats.builds
+    assert {Session: 4} == container.stats().builds
+
+    container.disable_stats()
+    container.disable_stats()  # no-op
+    assert () == container.listeners
+    with pytest.raises(RuntimeError):
+        container.stats()
+
+
+def test_prometheus(container: DependencyContainer):
+    container.enable_stats(buckets=[0.5, 10])
+    container.get(Service)
+    container.get(Service)
+    container.get(Session)
+    container.provide('un"known')
+
+    text = container.stats().to_prometheus()
+    service = '{}.{}'.format(Service.__module__, Service.__qualname__)
+    lines = text.splitlines()
+    assert text.endswith('\n')
+
+    assert '# TYPE antidote_singleton_hits_total counter' in lines
+    assert 'antidote_singleton_hits_total{{dependency="{}"}} 1'.format(service) \
+        in lines
+    assert 'antidote_singleton_misses_total{{dependency="{}"}} 1'.format(service) \
+        in lines
+    assert '''antidote_not_found_total{dependency="'un\\"known'"} 1''' in lines
+
+    assert '# TYPE antidote_instantiation_seconds histogram' in lines
+    bucket = 'antidote_instantiation_seconds_bucket{{dependency="{}",le="{}"}} {}'
+    assert bucket.format(service, '0.5', 1) in lines
+    assert bucket.format(service, '10.0', 1) in lines
+    assert bucket.format(service, '+Inf', 1) in lines
+    assert 'antidote_instantiation_seconds_count{{dependency="{}"}} 1'.format(service) \
+        in lines
+    assert any(line.startswith(
+        'antidote_instantiation_seconds_sum{{dependency="{}"}} '.format(service))
+        for line in lines)
+    assert 'antidote_provider_instantiation_seconds_bucket' \
+           '{provider="DummyFactoryProvider",le="10.0"} 2' in lines
+
+    assert 'custom_builds_total' in container.stats().to_prometheus(prefix='custom')
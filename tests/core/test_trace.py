@@ -0,0 +1,155 @@
+import json
+import threading
+
+import pytest
+
+from antidote.core import DependencyContainer
+from antidote.exceptions import DependencyInstantiationError
+from .utils import DummyFactoryProvider
+
+
+class Database:
+    pass
+
+
+class Repository:
+    def __init__(self, db: Database):
+        self.db = db
+
+
+@pytest.fixture()
+def container():
+    container = DependencyContainer()
+    container.register_provider(DummyFactoryProvider({
+        Database: lambda: Database(),
+        Repository: lambda: Repository(container.get(Database)),
+    }))
+    return container
+
+
+def test_trace(container: DependencyContainer):
+    with pytest.raises(RuntimeError):
+        container.trace()
+
+    container.enable_tracing()
+    container.enable_tracing()  # no-op
+    assert 1 == len(container.listeners)
+
+    container.get(Repository)
+    container.get(Repository)
+    assert container.provide('unknown') is None
+
+    trace = container.trace()
+    assert 3 == len(trace.roots)
+    assert 'roots=3' in repr(trace)
+
+    repository, hit, unknown = trace.roots
+    assert Repository == repository.dependency
+    assert 'instantiated' == repository.result
+    assert 'DummyFactoryProvider' == repository.provider
+    assert threading.get_ident() == repository.thread_id
+    assert [Database] == [child.dependency for child in repository.children]
+    db = repository.children[0]
+    assert 'instantiated' == db.result
+    assert repository.start <= db.start <= db.end <= repository.end
+    assert 0 <= db.duration <= repository.duration
+
+    assert 'singleton_hit' == hit.result
+    assert [] == hit.children
+    assert hit.provider is None
+    assert 'not_found' == unknown.result
+    assert [repository, db, hit, unknown] == list(trace)
+
+    # Snapshots are independent
+    container.get(Database)
+    assert 3 == len(trace.roots)
+    assert 4 == len(container.trace().roots)
+
+    container.disable_tracing()
+    container.disable_tracing()  # no-op
+    assert () == container.listeners
+    with pytest.raises(RuntimeError):
+        container.trace()
+
+
+def test_error(container: DependencyContainer):
+    def fail():
+        container.get(Database)
+        raise RuntimeError()
+
+    container.providers[DummyFactoryProvider].data['fail'] = fail
+    container.enable_tracing()
+
+    with pytest.raises(DependencyInstantiationError):
+        container.get('fail')
+    container.get(Database)
+
+    fail_span, db = container.trace().roots
+    assert 'error' == fail_span.result
+    assert [Database] == [child.dependency for child in fail_span.children]
+    assert 'singleton_hit' == db.result
+
+
+def test_threads(container: DependencyContainer):
+    container.enable_tracing()
+    thread = threading.Thread(target=container.get, args=(Database,))
+    thread.start()
+    thread.join()
+    container.get(Repository)
+
+    db, repository = container.trace().roots
+    assert thread.ident == db.thread_id
+    assert threading.get_ident() == repository.thread_id
+    assert 'singleton_hit' == repository.children[0].result
+
+    profiles = container.trace().to_speedscope()['profiles']
+    assert 2 == len(profiles)
+
+
+def test_chrome_trace(container: DependencyContainer):
+    container.enable_tracing()
+    container.get(Repository)
+    trace = container.trace()
+
+    data = trace.to_chrome_trace()
+    assert 2 == len(data['traceEvents'])
+    repository, db = data['traceEvents']
+    assert '{}.{}'.format(Repository.__module__,
+                          Repository.__qualname__) == repository['name']
+    assert 'X' == repository['ph']
+    assert repository['ts'] <= db['ts']
+    assert db['ts'] + db['dur'] <= repository['ts'] + repository['dur']
+    assert {'provider': 'DummyFactoryProvider',
+            'result': 'instantiated'} == repository['args']
+
+    assert data == json.loads(trace.to_json())
+
+
+def test_speedscope(container: DependencyContainer):
+    container.enable_tracing()
+    container.get(Repository)
+    container.get(Database)
+    trace = container.trace()
+
+    data = trace.to_speedscope(name='startup')
+    assert 'https://www.speedscope.app/file-format-schema.json' == data['$schema']
+    names = [frame['name'] for frame in data['shared']['frames']]
+    repository = names.index('{}.{}'.format(Repository.__module__,
+                                            Repository.__qualname__))
+    db = names.index('{}.{}'.format(Database.__module__, Database.__qualname__))
+
+    profile, = data['profiles']
+    assert 'evented' == profile['type']
+    assert profile['name'].startswith('startup')
+    assert [('O', repository), ('O', db), ('C', db), ('C', repository),
+            ('O', db), ('C', db)] == [(e['type'], e['frame'])
+                                      for e in profile['events']]
+    ats = [e['at'] for e in profile['events']]
+    assert sorted(ats) == ats
+    assert profile['startValue'] == ats[0]
+    assert profile['endValue'] == ats[-1]
+
+    assert trace.to_speedscope() == json.loads(trace.to_json(format='speedscope',
+                                                             indent=2))
+    with pytest.raises(ValueError):
+        trace.to_json(format='unknown')
@@ -1,4 +1,4 @@
-from antidote.core import DependencyInstance, DependencyProvider
+from antidote.core import DependencyDescription, DependencyInstance, DependencyProvider
 
 
 class DummyProvider(DependencyProvider):
@@ -27,3 +27,19 @@ class DummyFactoryProvider(DependencyProvider):
                                       singleton=self.singleton)
         except KeyError:
             pass
+
+
+class GraphProvider(DummyFactoryProvider):
+    def __init__(self, data=None, graph=None):
+        super().__init__(data)
+        self.graph = graph or dict()
+
+    def dependencies(self):
+        return tuple(self.data.keys())
+
+    def describe(self, dependency):
+        try:
+            singleton, dependencies = self.graph[dependency]
+        except KeyError:
+            return None
+        return DependencyDescription(singleton, dependencies)
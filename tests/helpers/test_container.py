@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+from antidote import factory, inject, new_container, register, Tagged
+from antidote.exceptions import DependencyNotFoundError
+from antidote.helpers import override
+
+
+class Service:
+    pass
+
+
+def test_override():
+    container = new_container()
+    register(Service, container=container)
+
+    @inject(container=container)
+    def f(service: Service):
+        return service
+
+    @inject(container=container)
+    async def g(service: Service):
+        return service
+
+    service = f()
+    mock = object()
+
+    with override(dependencies={Service: mock}, container=container) as proxy:
+        assert mock is proxy.get(Service)
+        assert mock is f()
+        assert mock is asyncio.get_event_loop_policy().new_event_loop() \
+            .run_until_complete(g())
+
+    assert service is f()
+
+    with override(missing=[Service], container=container):
+        with pytest.raises(DependencyNotFoundError):
+            f()
+
+
+def test_override_isolation():
+    container = new_container()
+
+    class Config:
+        pass
+
+    @factory(container=container)
+    def build_service(config: Config) -> Service:
+        return Service()
+
+    register(Config, container=container)
+
+    with override(container=container):
+        service = container.get(Service)
+        assert service is container.get(Service)
+
+    # Singletons instantiated within the override are not kept.
+    assert Service not in container.singletons
+    assert Config not in container.singletons
+
+
+def test_override_scope():
+    container = new_container()
+    register(Service, scoped=True, container=container)
+
+    with override(container=container) as proxy:
+        assert container.get(Service) is not container.get(Service)
+
+        with container.scope() as scope:
+            service = container.get(Service)
+            assert service is container.get(Service)
+            assert scope is proxy.current_scope
+            assert {Service: service} == scope.instances
+
+        with proxy.scope() as scope:
+            assert scope is container.current_scope
+            assert container.get(Service) is proxy.get(Service)
+
+    with container.scope():
+        with override(container=container):
+            assert container.get(Service) is container.get(Service)
+    assert service is not container.get(Service)
+
+
+def test_override_tagged():
+    container = new_container()
+    register(Service, tags=['tag'], container=container)
+    service = next(container.get(Tagged('tag')).instances())
+    mock = object()
+
+    with override(dependencies={Service: mock}, container=container):
+        assert [mock] == list(container.get(Tagged('tag')).instances())
+
+    assert [service] == list(container.get(Tagged('tag')).instances())
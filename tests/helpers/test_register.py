@@ -116,3 +116,24 @@ def test_invalid_factory_wiring():
         @register(factory='build', wire_super=False)
         class Dummy2(NewDummy):
             pass
+
+
+def test_warmup(container: DependencyContainer):
+    @register(container=container)
+    class Service:
+        pass
+
+    @register(container=container)
+    class Client:
+        def __init__(self, service: Service):
+            self.service = service
+
+    @register(container=container, singleton=False)
+    class Session:
+        def __init__(self, client: Client):
+            self.client = client
+
+    timings = container.warmup()
+    assert {Service, Client} == set(timings)
+    assert container.peek(Client).instance.service is container.get(Service)
+    assert container.peek(Session) is None
@@ -165,3 +165,23 @@ def test_raise_on_missing(container: DependencyContainer):
           raise_on_missing=False)
     class Dummy3(Dummy2):
         pass
+
+
+def test_lazy(container: DependencyContainer):
+    xx = container.get('x')
+    yy = container.get('y')
+
+    @wire(methods=['f', 'g'],
+          dependencies=dict(x='x', y='y'),
+          container=container,
+          lazy=True)
+    class Dummy:
+        def f(self, x):
+            return x
+
+        def g(self, y, z=None):
+            return y, z
+
+    assert xx == Dummy().f()
+    assert (yy, None) == Dummy().g()
+    assert (yy, 1) == Dummy().g(z=1)
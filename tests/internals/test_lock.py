@@ -0,0 +1,87 @@
+import threading
+
+import pytest
+
+from antidote._internal.lock import InstantiationLock
+from antidote.exceptions import DependencyCycleError
+
+
+def test_instantiating():
+    lock = InstantiationLock()
+
+    with lock.instantiating('a'):
+        with lock.instantiating('b'):
+            pass
+
+    with pytest.raises(DependencyCycleError):
+        with lock.instantiating('a'):
+            with lock.instantiating('a'):
+                pass
+
+    # Lock should be clean
+    with lock.instantiating('a'):
+        pass
+
+
+def test_single_flight():
+    lock = InstantiationLock()
+    entered = threading.Event()
+    events = []
+
+    def worker():
+        with lock.instantiating('a'):
+            events.append('worker')
+
+    with lock.instantiating('a'):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join(0.05)
+        assert thread.is_alive()
+        events.append('main')
+
+        # Independent dependencies are not blocked.
+        with lock.instantiating('b'):
+            entered.set()
+
+    thread.join()
+    assert entered.is_set()
+    assert ['main', 'worker'] == events
+
+
+class Recorder:
+    def __init__(self):
+        self.waits = []
+        self.holds = []
+
+    def record_wait(self, dependency, waiter, duration):
+        assert duration >= 0
+        self.waits.append((dependency, waiter))
+
+    def record_hold(self, dependency, duration, waiters):
+        assert duration >= 0
+        self.holds.append((dependency, waiters))
+
+
+def test_metrics():
+    lock = InstantiationLock()
+    lock.metrics = recorder = Recorder()
+
+    def worker():
+        with lock.instantiating('b'):
+            with lock.instantiating('a'):
+                pass
+
+    with lock.instantiating('a'):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join(0.05)
+
+    thread.join()
+    assert [('a', 'b')] == recorder.waits
+    assert [('a', 1), ('a', 0), ('b', 0)] == recorder.holds
+
+    lock.metrics = None
+    with lock.instantiating('a'):
+        lock.metrics = recorder
+    # Not measured as metrics were enabled while holding the lock.
+    assert 3 == len(recorder.holds)
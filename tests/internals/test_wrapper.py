@@ -6,6 +6,7 @@ from typing import Any, List, Tuple
 
 import pytest
 
+from antidote import is_compiled
 from antidote._internal.wrapper import InjectedWrapper, Injection, InjectionBlueprint
 from antidote.core import DependencyContainer
 from antidote.exceptions import DependencyNotFoundError
@@ -205,6 +206,40 @@ def test_multiple_injections():
         f(sentinel, x=sentinel)
 
 
+def test_optional_injections():
+    container = DependencyContainer()
+    xx = object()
+    container.update_singletons(dict(xx=xx))
+
+    @easy_wrap(arg_dependency=[('x', True, 'xx'),
+                               ('y', False, 'unknown'),
+                               ('z', True, None)],
+               container=container)
+    def f(x, y=None, z=None):
+        return x, y, z
+
+    assert (xx, None, None) == f()
+    assert (xx, None, sentinel) == f(z=sentinel)
+    assert (sentinel, None, sentinel_2) == f(sentinel, z=sentinel_2)
+    assert (sentinel, sentinel_2, sentinel_3) == f(sentinel, sentinel_2, sentinel_3)
+
+
+@pytest.mark.skipif(is_compiled(), reason="Injectors are only generated in Python")
+def test_injectors():
+    container = DependencyContainer()
+    container.update_singletons(dict(xx=sentinel))
+    blueprint = InjectionBlueprint((Injection('self', True, None),
+                                    Injection('x', True, 'xx')))
+
+    injector = blueprint.injector(0)
+    assert injector is blueprint.injector(0)
+    assert dict(x=sentinel) == injector(container, dict())
+    assert dict(x=sentinel_2) == injector(container, dict(x=sentinel_2))
+    assert dict(x=sentinel) == blueprint.injector(1)(container, dict())
+    assert dict() == blueprint.injector(2)(container, dict())
+    assert [0, 1, 2] == sorted(blueprint.injectors)
+
+
 def g():
     pass
 
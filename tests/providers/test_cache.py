@@ -0,0 +1,81 @@
+import threading
+
+import pytest
+
+from antidote.providers.cache import BuildCache
+
+
+def test_lru():
+    cache = BuildCache(max_size=2)
+    cache['a'] = 1
+    cache['b'] = 2
+    assert 1 == cache['a']
+    cache['c'] = 3
+
+    assert 2 == len(cache)
+    assert 'b' not in cache
+    assert ('a' in cache) and ('c' in cache)
+    with pytest.raises(KeyError):
+        cache['b']
+
+    assert (1, 1, 1) == (cache.hits, cache.misses, cache.evictions)
+    assert 0.5 == cache.hit_rate
+    assert 'evictions=1' in repr(cache)
+
+    cache['a'] = 4  # replaced, nothing evicted
+    assert 4 == cache['a']
+    assert (2, 1) == (len(cache), cache.evictions)
+
+    cache.clear()
+    assert (0, 0) == (len(cache), cache.size)
+    assert 2 == cache.hits
+
+
+def test_cost():
+    cache = BuildCache(max_size=10, cost=len)
+    cache['a'] = 'x' * 4
+    cache['b'] = 'x' * 5
+    assert 9 == cache.size
+
+    cache['c'] = 'x' * 6
+    assert ['c'] == [key for key in 'abc' if key in cache]
+    assert (6, 2) == (cache.size, cache.evictions)
+
+    # Never cached, nothing evicted
+    cache['d'] = 'x' * 11
+    assert 'd' not in cache
+    assert 'c' in cache
+
+
+@pytest.mark.parametrize('kwargs,error', [
+    (dict(max_size=0), ValueError),
+    (dict(max_size=1, cost=object()), TypeError),
+])
+def test_invalid(kwargs, error):
+    with pytest.raises(error):
+        BuildCache(**kwargs)
+
+
+def test_hit_rate():
+    assert 0 == BuildCache(max_size=1).hit_rate
+
+
+def test_threads():
+    cache = BuildCache(max_size=8)
+
+    def worker(offset):
+        for i in range(1000):
+            cache[(offset + i) % 32] = i
+            try:
+                cache[(offset + i + 1) % 32]
+            except KeyError:
+                pass
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(cache) == cache.size <= 8
+    assert 4000 == cache.hits + cache.misses
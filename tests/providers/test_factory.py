@@ -1,7 +1,8 @@
 import pytest
 
-from antidote.core import DependencyContainer
+from antidote.core import DependencyContainer, inject
 from antidote.exceptions import DuplicateDependencyError
+from antidote.providers.cache import BuildCache
 from antidote.providers.factory import Build, FactoryProvider
 
 
@@ -44,6 +45,58 @@ def test_build_eq_hash(wrapped, kwargs):
     assert repr(kwargs) in repr(b)
 
 
+@pytest.mark.parametrize(
+    'kwargs,other',
+    [
+        ({'x': {'a': 1}}, {'x': {'a': 2}}),
+        ({'x': [1, 2]}, {'x': [2, 1]}),
+        ({'x': [1, 2]}, {'x': (1, 2)}),
+        ({'x': {'a': [1]}}, {'x': {'a': [1, 2]}}),
+        ({'x': [{1}]}, {'x': [{2}]}),
+        ({'x': {'a': 1}}, {'y': {'a': 1}}),
+        ({'x': bytearray(b'a')}, {'x': bytearray(b'b')}),
+    ]
+)
+def test_build_unhashable_arguments(kwargs, other):
+    b = Build(Service, **kwargs)
+    assert b == Build(Service, **kwargs)
+    assert hash(b) == hash(Build(Service, **kwargs))
+    assert b != Build(Service, **other)
+    assert b != Build(AnotherService, **kwargs)
+
+    # Dicts and sets do not depend on their order.
+    assert Build(Service, x={'a': [1], 'b': {2, 3}}, y=1) \
+        == Build(Service, y=1, x={'b': {3, 2}, 'a': [1]})
+
+
+def test_build_unhashable_objects():
+    value = bytearray(b'a')
+    b = Build(Service, x=[value])
+    assert b == Build(Service, x=[value])
+    assert hash(b) == hash(Build(Service, x=[value]))
+    # Compared by identity, not by content.
+    assert b != Build(Service, x=[bytearray(b'a')])
+
+
+def test_build_interned():
+    b = Build.interned(Service, x={'a': [1]})
+    assert b is Build.interned(Service, x={'a': [1]})
+    assert b == Build(Service, x={'a': [1]})
+    assert b is not Build.interned(Service, x={'a': [2]})
+
+
+def test_build_unhashable_singletons():
+    container = DependencyContainer()
+    provider = FactoryProvider(container=container)
+    container.register_provider(provider)
+    provider.register_class(Service)
+
+    a = container.get(Build(Service, x=[1]))
+    assert a is container.get(Build(Service, x=[1]))
+    assert a is not container.get(Build(Service, x=[2]))
+    assert [2] == container.get(Build(Service, x=[2])).kwargs['x']
+
+
 @pytest.mark.parametrize(
     'args,kwargs',
     [
@@ -98,6 +151,39 @@ def test_build(provider: FactoryProvider):
     assert dict(val=object) == s.kwargs
 
 
+def test_build_cache(provider: FactoryProvider):
+    container = provider._container
+    cache = BuildCache(max_size=2)
+    provider.register_class(Service, build_cache=cache)
+
+    a = container.get(Build(Service, name='a'))
+    assert a is container.get(Build(Service, name='a'))
+    assert (1, 1) == (cache.hits, cache.misses)
+    assert container.provide(Build(Service, name='a')).singleton is False
+
+    b = container.get(Build(Service, name='b'))
+    container.get(Build(Service, name='a'))  # a is now the most recently used
+    container.get(Build(Service, name='c'))
+    assert 1 == cache.evictions
+    assert Build(Service, name='b') not in cache
+    assert b is not container.get(Build(Service, name='b'))
+    assert a is not container.get(Build(Service, name='a'))
+
+    assert (3, 5) == (cache.hits, cache.misses)
+
+    # Without arguments, it is a regular singleton.
+    assert container.get(Service) is container.get(Service)
+    assert (3, 5) == (cache.hits, cache.misses)
+
+    provider.register_factory('factory', factory=lambda name: name * 2,
+                              build_cache=BuildCache(max_size=1))
+    assert 'aa' == container.get(Build('factory', name='a'))
+
+    with pytest.raises(ValueError):
+        provider.register_class(AnotherService, singleton=False,
+                                build_cache=BuildCache(max_size=1))
+
+
 def test_non_singleton_factory(provider: FactoryProvider):
     def factory_builder():
         def factory(o=object()):
@@ -139,3 +225,63 @@ def test_invalid_type(provider: FactoryProvider, kwargs):
 @pytest.mark.parametrize('dependency', ['test', Service, object()])
 def test_unknown_dependency(provider: FactoryProvider, dependency):
     assert provider.provide(dependency) is None
+
+
+def test_register_after_not_found(provider: FactoryProvider):
+    container = provider._container
+    assert container.provide(Service) is None
+
+    provider.register_class(Service)
+    assert isinstance(container.get(Service), Service)
+
+
+def test_dependencies(provider: FactoryProvider):
+    provider.register_class(Service)
+    provider.register_providable_factory(AnotherService,
+                                         factory_dependency='factory')
+
+    assert {Service, AnotherService} == set(provider.dependencies())
+
+
+def test_describe(provider: FactoryProvider):
+    container = provider._container
+
+    class Factory:
+        @inject(dependencies=dict(param='factory_param', unused='unused'),
+                container=container)
+        def __call__(self, dependency, param, unused=None):
+            return dependency(param)
+
+    @inject(dependencies=dict(param='param'), container=container)
+    def build(dependency, param):
+        return dependency(param)
+
+    class WiredService(Service):
+        @inject(dependencies=dict(param='service_param'), container=container)
+        def __init__(self, param):
+            super().__init__(param)
+
+    provider.register_class(WiredService, singleton=False)
+    provider.register_factory(Service, factory=build, takes_dependency=True)
+    provider.register_class(Factory)
+    provider.register_providable_factory(AnotherService,
+                                         factory_dependency=Factory,
+                                         takes_dependency=True)
+
+    description = provider.describe(WiredService)
+    assert description.singleton is False
+    assert ('service_param',) == description.dependencies
+    assert () == provider.describe(Build(WiredService, param=1)).dependencies
+
+    assert ('param',) == provider.describe(Service).dependencies
+    assert (Factory, 'factory_param', 'unused') \
+        == provider.describe(AnotherService).dependencies
+    assert (Factory, 'unused') \
+        == provider.describe(Build(AnotherService, param=1)).dependencies
+    assert provider.describe(object()) is None
+
+    # Once retrieved, the factory instance is used directly.
+    container.update_singletons({'factory_param': 1})
+    container.get(AnotherService)
+    assert ('factory_param', 'unused') \
+        == provider.describe(AnotherService).dependencies
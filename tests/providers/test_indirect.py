@@ -163,3 +163,19 @@ def test_undefined_context(container: DependencyContainer,
 
     with pytest.raises(UndefinedContextError):
         interface_provider.provide(IService)
+
+
+def test_describe(interface_provider: IndirectProvider):
+    interface_provider.register(IService, Service)
+    interface_provider.register('profile', ServiceA, state=Profile.A)
+    interface_provider.register('profile', ServiceB, state=Profile.B)
+
+    description = interface_provider.describe(IService)
+    assert description.singleton is None
+    assert (Service,) == description.dependencies
+
+    description = interface_provider.describe('profile')
+    assert description.singleton is None
+    assert (Profile, ServiceA, ServiceB) == description.dependencies
+
+    assert interface_provider.describe(Service) is None
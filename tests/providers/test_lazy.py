@@ -1,6 +1,6 @@
 import pytest
 
-from antidote.core import DependencyContainer
+from antidote.core import DependencyContainer, inject
 from antidote.providers.lazy import LazyCall, LazyCallProvider, LazyMethodCall
 from antidote.providers.factory import FactoryProvider
 
@@ -148,3 +148,32 @@ def test_method_args_kwargs(lazy_provider: LazyCallProvider,
 
     assert (args, kwargs) == Test().A
     assert (args, kwargs) == lazy_provider.provide(Test.A).instance
+
+
+def test_describe(lazy_provider: LazyCallProvider,
+                  service_provider: FactoryProvider):
+    container = lazy_provider._container
+
+    @inject(dependencies=('x', 'y'), container=container)
+    def func(x, y=None):
+        return x, y
+
+    assert ('x', 'y') == lazy_provider.describe(LazyCall(func)).dependencies
+    description = lazy_provider.describe(LazyCall(func, singleton=False)(1))
+    assert description.singleton is False
+    assert ('y',) == description.dependencies
+
+    @service_provider.register_class
+    class Test:
+        @inject(dependencies=(None, 'x', 'y'), container=container)
+        def get(self, x, y=None):
+            return x, y
+
+        A = LazyMethodCall(get)(y=1)
+        B = LazyMethodCall(get, singleton=False)
+
+    description = lazy_provider.describe(Test.A)
+    assert description.singleton is True
+    assert (Test, 'x') == description.dependencies
+    assert (Test, 'x', 'y') == lazy_provider.describe(Test.B).dependencies
+    assert lazy_provider.describe(Test) is None
@@ -1,9 +1,14 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from hypothesis import given, strategies as st
 
 from antidote import Tag, Tagged
-from antidote.core import DependencyContainer, DependencyInstance
+from antidote.core import DependencyContainer, DependencyInstance, inject
 from antidote.exceptions import DependencyNotFoundError, DuplicateTagError
+from antidote.providers.factory import FactoryProvider
 from antidote.providers.tag import TaggedDependencies, TagProvider
 
 
@@ -47,8 +52,9 @@ def test_tagged_eq_hash(tagged):
     hash(tagged)
 
     for f in (lambda e: e, hash):
-        assert f(Tagged(tagged.name)) != f(tagged)
+        assert f(Tagged(tagged.name)) == f(tagged)
 
+    assert Tagged(tagged.name + 'x') != tagged
     assert repr(tagged.name) in repr(tagged)
 
 
@@ -59,6 +65,31 @@ def test_invalid_tagged(name, error):
         Tagged(name)
 
 
+def test_tagged_query_eq_hash():
+    tagged = Tagged('tag', where={'a': 1, 'b': 'x'}, order_by='-p')
+    assert tagged == Tagged('tag', where={'b': 'x', 'a': 1}, order_by='-p')
+    assert hash(tagged) == hash(Tagged('tag', where={'b': 'x', 'a': 1},
+                                       order_by='-p'))
+    assert tagged != Tagged('tag', where={'a': 1, 'b': 'x'})
+    assert tagged != Tagged('tag', where={'a': 2, 'b': 'x'}, order_by='-p')
+    assert tagged != Tagged('tag', order_by='-p')
+    assert Tagged('tag') == Tagged('tag', where={})
+    assert "where={'a': 1" in repr(tagged)
+    assert "order_by='-p'" in repr(tagged)
+
+
+@pytest.mark.parametrize('kwargs,error', [
+    (dict(where=[('a', 1)]), TypeError),
+    (dict(where={'a': [1]}), TypeError),
+    (dict(order_by=1), TypeError),
+    (dict(order_by=''), ValueError),
+    (dict(order_by='-'), ValueError),
+])
+def test_invalid_tagged_query(kwargs, error):
+    with pytest.raises(error):
+        Tagged('tag', **kwargs)
+
+
 def test_tagged_dependencies():
     tag1 = Tag('tag1')
     tag2 = Tag('tag2', dummy=True)
@@ -81,6 +112,92 @@ def test_tagged_dependencies():
     assert {'test', 'test2'} == set(t.instances())
 
 
+@pytest.mark.parametrize('executor', [None, ThreadPoolExecutor(max_workers=4)])
+def test_materialize(executor):
+    c = DependencyContainer()
+    c.update_singletons({'d{}'.format(i): i for i in range(10)})
+    started = []
+
+    def make():
+        started.append(threading.get_ident())
+        time.sleep(0.02)
+        return object()
+
+    factory_provider = FactoryProvider(container=c)
+    c.register_provider(factory_provider)
+    factory_provider.register_factory('slow', make)
+    factory_provider.register_factory('slow2', make)
+    dependencies = ['d{}'.format(i) for i in range(10)] + ['slow', 'slow2']
+
+    t = TaggedDependencies(
+        container=c,
+        dependencies=dependencies,
+        tags=[Tag('tag') for _ in dependencies]
+    )
+    # Instances already retrieved are kept.
+    assert 0 == next(iter(t.instances()))
+
+    instances = t.materialize(executor)
+    assert isinstance(instances, tuple)
+    assert tuple(range(10)) == instances[:10]
+    assert 12 == len(instances)
+    assert instances is t.materialize(executor)
+    assert instances == tuple(t.instances())
+    assert 2 == len(started)
+    if executor is not None:
+        assert threading.get_ident() not in started
+
+
+def test_materialize_after_instances():
+    c = DependencyContainer()
+    c.update_singletons({'d': 'test', 'd2': 'test2'})
+    t = TaggedDependencies(
+        container=c,
+        dependencies=['d', 'd2'],
+        tags=[Tag('tag1'), Tag('tag2')]
+    )
+    assert ['test', 'test2'] == list(t.instances())
+    instances = t.materialize()
+    assert ('test', 'test2') == instances
+    assert instances is t.materialize(ThreadPoolExecutor())
+
+
+def test_materialize_error():
+    c = DependencyContainer()
+    t = TaggedDependencies(
+        container=c,
+        dependencies=['d'],
+        tags=[Tag('tag')]
+    )
+    with ThreadPoolExecutor() as executor:
+        with pytest.raises(DependencyNotFoundError):
+            t.materialize(executor)
+
+    c.update_singletons({'d': 'test'})
+    assert ('test',) == t.materialize()
+
+
+def test_materialize_in_factory():
+    c = DependencyContainer()
+    factory_provider = FactoryProvider(container=c)
+    c.register_provider(factory_provider)
+    factory_provider.register_factory('a', lambda: 'a')
+    factory_provider.register_factory('b', lambda: 'b')
+    t = TaggedDependencies(
+        container=c,
+        dependencies=['a', 'b'],
+        tags=[Tag('tag'), Tag('tag')]
+    )
+    executor = ThreadPoolExecutor(max_workers=1)
+    factory_provider.register_factory(Service, lambda: t.materialize(executor))
+
+    try:
+        # The only worker of the executor is busy retrieving the service.
+        assert ('a', 'b') == executor.submit(c.get, Service).result(timeout=5)
+    finally:
+        executor.shutdown(wait=False)
+
+
 def test_tagged_dependencies_invalid_dependency():
     tag = Tag('tag1')
     c = DependencyContainer()
@@ -141,6 +258,71 @@ def test_provide_tags(provider: TagProvider):
     assert instances == set(tagged_dependencies.instances())
 
 
+def test_cached_tagged_dependencies(provider: TagProvider):
+    container = provider._container
+    container.update_singletons(dict(a=object(), b=object(), c=object()))
+    provider.register('a', ['tag1'])
+    provider.register('b', ['tag2'])
+
+    tagged_dependencies = container.get(Tagged('tag1'))
+    assert [container.get('a')] == list(tagged_dependencies.instances())
+    assert tagged_dependencies is not container.get(Tagged('tag1'))
+
+    # Only the query of the tag used again is discarded.
+    provider.register('c', ['tag1'])
+    assert ['a'] == list(tagged_dependencies.dependencies())
+    assert ['a', 'c'] == list(container.get(Tagged('tag1')).dependencies())
+    assert ['b'] == list(container.get(Tagged('tag2')).dependencies())
+
+    with pytest.raises(DuplicateTagError):
+        provider.register('c', ['tag1'])
+
+
+def test_tagged_non_singletons(provider: TagProvider):
+    container = provider._container
+    factory_provider = FactoryProvider(container=container)
+    container.register_provider(factory_provider)
+    factory_provider.register_factory(Service, factory=Service, singleton=False)
+    provider.register(Service, ['tag'])
+
+    service = next(container.get(Tagged('tag')).instances())
+    assert service is not next(container.get(Tagged('tag')).instances())
+
+
+def test_query(provider: TagProvider):
+    container = provider._container
+    container.update_singletons({name: object() for name in 'abcde'})
+    provider.register('a', [Tag('handler', event='created', priority=2)])
+    provider.register('b', [Tag('handler', event='deleted', priority=1)])
+    provider.register('c', [Tag('handler', event='created', priority=1, sync=True)])
+    provider.register('d', [Tag('handler', event='created', items=[1])])
+    provider.register('e', [Tag('other', event='created')])
+
+    def dependencies(**kwargs):
+        return list(container.get(Tagged('handler', **kwargs)).dependencies())
+
+    assert ['a', 'c', 'd'] == dependencies(where={'event': 'created'})
+    assert ['c'] == dependencies(where={'event': 'created', 'sync': True})
+    assert [] == dependencies(where={'event': 'updated'})
+    assert [] == dependencies(where={'unknown': 1})
+    assert ['b', 'c', 'a', 'd'] == dependencies(order_by='priority')
+    assert ['a', 'b', 'c', 'd'] == dependencies(order_by='-priority')
+    assert ['c', 'a', 'd'] == dependencies(where={'event': 'created'},
+                                           order_by='priority')
+
+    # Only matching dependencies are instantiated.
+    tagged = Tagged('handler', where={'event': 'deleted'})
+    assert [container.get('b')] == list(container.get(tagged).instances())
+    assert ('b',) == provider.describe(tagged).dependencies
+
+    # Queries are cached and updated with new registrations.
+    tagged_dependencies = container.get(tagged)
+    provider.register('e', [Tag('handler', event='deleted', priority=0)])
+    assert ['e', 'b'] == dependencies(where={'event': 'deleted'},
+                                      order_by='priority')
+    assert ['b'] == list(tagged_dependencies.dependencies())
+
+
 @pytest.mark.parametrize('tag', ['tag', Tag(name='tag')])
 def test_duplicate_tag_error(provider: TagProvider, tag):
     provider.register('test', [Tag(name='tag')])
@@ -169,3 +351,29 @@ def test_invalid_register(provider: TagProvider, tags):
 @pytest.mark.parametrize('dependency', ['test', Service, object()])
 def test_unknown_dependency(provider: TagProvider, dependency):
     assert provider.provide(dependency) is None
+
+
+def test_describe(provider: TagProvider):
+    class AnotherService:
+        pass
+
+    container = provider._container
+    tagged = Tagged('tag')
+    provider.register(Service, ['tag'])
+
+    description = provider.describe(tagged)
+    assert description.singleton is False
+    assert (Service,) == description.dependencies
+    assert provider.describe(Service) is None
+
+    # Tagged in the graph are updated with new registrations.
+    factory_provider = FactoryProvider(container=container)
+    container.register_provider(factory_provider)
+    factory_provider.register_factory(
+        'consumer',
+        inject(lambda services: services, dependencies=dict(services=tagged),
+               container=container)
+    )
+    assert (Service,) == container.graph.dependencies(tagged)
+    provider.register(AnotherService, ['tag'])
+    assert (Service, AnotherService) == container.graph.dependencies(tagged)
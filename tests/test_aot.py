@@ -0,0 +1,229 @@
+import importlib
+import sys
+
+import pytest
+
+from antidote._internal.argspec import Arguments
+from antidote.__main__ import main
+from antidote.aot import compile_wiring, load_wiring, unload_wiring
+from antidote.exceptions import StaleWiringError
+
+CONTAINER = """
+from antidote import new_container
+
+container = new_container()
+"""
+
+SERVICES = """
+import enum
+
+from antidote import factory, inject, register, Tag, Tagged, wire
+from antidote.providers import IndirectProvider
+from .container import container
+
+
+class Profile(enum.Enum):
+    PROD = 1
+
+
+class Database:
+    pass
+
+
+@register(tags=['repository', Tag('main', weight=2)], container=container)
+class Repository:
+    def __init__(self, db: Database):
+        self.db = db
+
+
+register(Database, container=container)
+
+
+class Config:
+    pass
+
+
+@factory(container=container)
+def build_config(db: Database) -> Config:
+    return Config()
+
+
+@inject(dependencies=dict(repository=Repository), container=container)
+def handler(repository, x=1):
+    return repository, x
+
+
+@inject(container=container)
+def plain(x):
+    return x
+
+
+@wire(methods=['get'], use_names=True, container=container)
+class Handler:
+    def get(self, db):
+        return db
+
+
+@register(tags=[Tag('handler', event='a', priority=2)], container=container)
+class HandlerA:
+    pass
+
+
+@register(tags=[Tag('handler', event='b', priority=1)], container=container)
+class HandlerB:
+    pass
+
+
+@register(tags=[Tag('handler', event='a', priority=1)], container=container)
+class HandlerC:
+    pass
+
+
+@inject(dependencies=dict(
+    handlers=Tagged('handler', where={'event': 'a'}, order_by='priority'),
+    all_handlers=Tagged('handler', order_by='-priority')
+), container=container)
+def dispatch(handlers, all_handlers):
+    return ([h.__name__ for h in handlers.dependencies()],
+            [h.__name__ for h in all_handlers.dependencies()])
+
+
+def local():
+    @inject(container=container)
+    def f(db: Database):
+        return db
+    return f
+
+
+indirect = container.providers[IndirectProvider]
+indirect.register('db', Database)
+indirect.register('profile_db', Database, state=Profile.PROD)
+"""
+
+
+@pytest.fixture()
+def app(tmp_path, monkeypatch):
+    name = 'aot_app_{}'.format(abs(hash(str(tmp_path))))
+    package = tmp_path / name
+    package.mkdir()
+    (package / '__init__.py').write_text('')
+    (package / 'container.py').write_text(CONTAINER)
+    (package / 'services.py').write_text(SERVICES)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(sys, 'dont_write_bytecode', True)
+    importlib.invalidate_caches()
+
+    yield package
+
+    unload_wiring()
+    for module in list(sys.modules):
+        if module.startswith(name):
+            del sys.modules[module]
+
+
+def compile_app(package) -> str:
+    container = importlib.import_module(package.name + '.container').container
+    source = compile_wiring(package.name + '.services', container=container)
+    (package / '_wiring.py').write_text(source)
+    return source
+
+
+def restart(package):
+    """
+    Forgets the application, as a new worker would.
+    """
+    for module in list(sys.modules):
+        if module.startswith(package.name + '.'):
+            del sys.modules[module]
+    importlib.invalidate_caches()
+
+
+def import_app(package):
+    services = importlib.import_module(package.name + '.services')
+    container = importlib.import_module(package.name + '.container').container
+    return services, container
+
+
+def test_compile(app, monkeypatch):
+    source = compile_app(app)
+    assert "'Repository.__init__': (('self', True, None), ('db', True, " in source
+    assert "'not_injected': frozenset({'plain'})" in source
+    assert "(_m0.Repository, 'main', {'weight': 2})" in source
+    assert "('profile_db', _m0.Database, _m0.Profile.PROD)" in source
+    assert 'local' not in source
+    assert "Tagged('handler', where={'event': 'a'}, order_by='priority')" in source
+    restart(app)
+
+    analyzed = []
+    from_method = Arguments.from_method
+
+    def counting_from_method(func):
+        analyzed.append(func.__qualname__)
+        return from_method(func)
+
+    monkeypatch.setattr(Arguments, 'from_method', counting_from_method)
+    wiring = load_wiring(app.name + '._wiring', strict=True)
+    services, container = import_app(app)
+    assert [] == analyzed
+
+    db = container.get(services.Database)
+    assert db is container.get(services.Repository).db
+    assert isinstance(container.get(services.Config), services.Config)
+    assert (container.get(services.Repository), 2) == services.handler(x=2)
+    assert db is services.Handler().get()
+    assert 3 == services.plain(3)
+    assert not hasattr(services.plain, '__wrapped__')
+    assert db is services.local()()
+    assert ['local.<locals>.f'] == analyzed  # Cannot be imported
+    assert (['HandlerC', 'HandlerA'],
+            ['HandlerA', 'HandlerB', 'HandlerC']) == services.dispatch()
+
+    assert set() == wiring.stale
+    assert [] == wiring.verify(container)
+
+    services.indirect.register('other_db', services.Database)
+    assert ["Link of 'other_db' is not compiled."] == wiring.verify(container)
+
+
+def test_stale(app):
+    compile_app(app)
+    restart(app)
+    with (app / 'services.py').open('a') as f:
+        f.write("\n# changed\n")
+
+    wiring = load_wiring(app.name + '._wiring')
+    services, container = import_app(app)
+    assert {app.name + '.services'} == wiring.stale
+    assert container.get(services.Database) is services.Handler().get()
+    unload_wiring()
+
+    restart(app)
+    load_wiring(app.name + '._wiring', strict=True)
+    with pytest.raises(StaleWiringError):
+        import_app(app)
+
+
+def test_invalid(app):
+    compile_app(app)
+    restart(app)
+    (app / 'old_wiring.py').write_text("FORMAT = 0\n")
+    with pytest.raises(StaleWiringError):
+        load_wiring(app.name + '.old_wiring')
+
+    load_wiring(app.name + '._wiring')
+    with pytest.raises(RuntimeError):
+        load_wiring(app.name + '._wiring')
+
+
+def test_cli(app, capsys):
+    importlib.import_module(app.name + '.container')
+    assert 0 == main(['compile', app.name + '.services',
+                      '-o', str(app / 'cli_wiring.py')])
+    assert 'MODULES = {' in (app / 'cli_wiring.py').read_text()
+
+    restart(app)
+    importlib.import_module(app.name + '.container')
+    assert 0 == main(['compile', app.name + '.services'])
+    assert 'MODULES = {' in capsys.readouterr().out
+
+    assert 2 == main([])
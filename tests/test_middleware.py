@@ -0,0 +1,107 @@
+import asyncio
+import sys
+import threading
+import urllib.request
+from wsgiref.simple_server import make_server, WSGIRequestHandler
+
+import pytest
+
+from antidote.core import DependencyContainer, DependencyInstance, DependencyProvider
+from antidote.middleware import ASGIScopeMiddleware, WSGIScopeMiddleware
+
+
+class UnitOfWork:
+    pass
+
+
+class ScopedProvider(DependencyProvider):
+    def provide(self, dependency):
+        if dependency is UnitOfWork:
+            return DependencyInstance(UnitOfWork(), scoped=True)
+
+
+@pytest.fixture()
+def container():
+    container = DependencyContainer()
+    container.register_provider(ScopedProvider(container))
+    return container
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args, **kwargs):
+        pass
+
+
+def test_wsgi(container: DependencyContainer):
+    instances = []
+
+    def app(environ, start_response):
+        unit_of_work = container.get(UnitOfWork)
+        assert unit_of_work is container.get(UnitOfWork)
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+
+        def body():
+            # Scope is still opened while the response is sent.
+            assert unit_of_work is container.get(UnitOfWork)
+            instances.append(unit_of_work)
+            yield b'ok'
+
+        return body()
+
+    server = make_server('127.0.0.1', 0, WSGIScopeMiddleware(app, container),
+                         handler_class=QuietHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        url = 'http://127.0.0.1:{}/'.format(server.server_port)
+        for _ in range(2):
+            with urllib.request.urlopen(url) as response:
+                assert b'ok' == response.read()
+    finally:
+        server.shutdown()
+        thread.join()
+        server.server_close()
+
+    assert 2 == len(instances)
+    assert instances[0] is not instances[1]
+    assert container.current_scope is None
+
+
+def test_wsgi_error(container: DependencyContainer):
+    def app(environ, start_response):
+        raise RuntimeError()
+
+    middleware = WSGIScopeMiddleware(app, container)
+    with pytest.raises(RuntimeError):
+        middleware({}, None)
+
+    assert container.current_scope is None
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="requires contextvars")
+def test_asgi(container: DependencyContainer):
+    instances = {}
+
+    async def app(scope, receive, send):
+        if scope['type'] == 'lifespan':
+            assert container.current_scope is None
+            return
+
+        unit_of_work = container.get(UnitOfWork)
+        await asyncio.sleep(0)
+        assert unit_of_work is container.get(UnitOfWork)
+        instances[scope['path']] = unit_of_work
+
+    middleware = ASGIScopeMiddleware(app, container)
+
+    async def main():
+        await middleware({'type': 'lifespan'}, None, None)
+        await asyncio.gather(*[
+            middleware({'type': 'http', 'path': path}, None, None)
+            for path in ['/a', '/b']
+        ])
+
+    asyncio.run(main())
+
+    assert instances['/a'] is not instances['/b']
+    assert container.current_scope is None
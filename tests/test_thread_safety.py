@@ -1,3 +1,4 @@
+import itertools
 import random
 import threading
 import time
@@ -6,6 +7,8 @@ import pytest
 
 from antidote import Tagged, factory, new_container
 from antidote.core import DependencyContainer
+from antidote.exceptions import DependencyCycleError
+from antidote.providers.factory import Build, FactoryProvider
 from antidote.providers.tag import TaggedDependencies
 
 
@@ -87,3 +90,107 @@ def test_tagged_dependencies_instantiation_safety(container: DependencyContainer
 
     assert n_dependencies == len(set(dependencies))
     assert set(dependencies) == set(enumerate(tagged.instances()))
+
+
+def test_factory_dependency_safety():
+    container = new_container()
+    provider = container.providers[FactoryProvider]  # type: FactoryProvider
+
+    def build_factory():
+        time.sleep(0.01)
+        return lambda **kwargs: kwargs
+
+    provider.register_factory('factory', factory=build_factory)
+    provider.register_providable_factory(Service, factory_dependency='factory')
+
+    # Each Build has its own lock but they all share, and rewrite, the same
+    # builder once the factory is retrieved.
+    counter = itertools.count()
+    results = {}
+    errors = []
+
+    def worker():
+        i = next(counter)
+        try:
+            for j in range(10):
+                results[(i, j)] = container.get(Build(Service, i=i, j=j))
+        except Exception as e:  # pragma: no cover
+            errors.append(e)
+
+    multi_thread_do(worker, 20)
+
+    assert [] == errors
+    assert 200 == len(results)
+    assert all(dict(i=i, j=j) == kwargs for (i, j), kwargs in results.items())
+
+
+def test_independent_dependencies_instantiation():
+    container = new_container()
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow() -> Service:
+        started.set()
+        release.wait(5)
+        return Service()
+
+    def fast() -> AnotherService:
+        return AnotherService()
+
+    factory(slow, container=container)
+    factory(fast, container=container)
+
+    thread = threading.Thread(target=container.get, args=(Service,))
+    thread.start()
+    assert started.wait(5)
+    try:
+        # Must not wait on the slow factory.
+        assert isinstance(container.get(AnotherService), AnotherService)
+        assert thread.is_alive()
+    finally:
+        release.set()
+        thread.join()
+
+    assert isinstance(container.get(Service), Service)
+
+
+def test_cross_thread_dependency_cycle():
+    container = new_container()
+    service_started = threading.Event()
+    another_service_started = threading.Event()
+    errors = []
+
+    def build_service() -> Service:
+        service_started.set()
+        another_service_started.wait(5)
+        container.get(AnotherService)
+        return Service()  # pragma: no cover
+
+    def build_another_service() -> AnotherService:
+        another_service_started.set()
+        service_started.wait(5)
+        container.get(Service)
+        return AnotherService()  # pragma: no cover
+
+    factory(build_service, container=container)
+    factory(build_another_service, container=container)
+
+    def worker(dependency):
+        def target():
+            try:
+                container.get(dependency)
+            except Exception as e:
+                errors.append(e)
+
+        return target
+
+    threads = [threading.Thread(target=worker(Service)),
+               threading.Thread(target=worker(AnotherService))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert not any(thread.is_alive() for thread in threads)
+    assert 2 == len(errors)
+    assert any(isinstance(e, DependencyCycleError) for e in errors)